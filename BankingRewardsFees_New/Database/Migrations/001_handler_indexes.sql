@@ -0,0 +1,25 @@
+-- File: 001_handler_indexes.sql
+-- Covering indexes for the queries the Lambda handlers run, for databases
+-- created from the original Tables/*.sql. Fresh installs get them from
+-- those files directly.
+--
+-- Customers(name, customer_id, tier): the account list, keyset pages and
+--   export read customers in (name, customer_id) order straight from this
+--   index, with no filesort; tier is included so the table is not touched.
+-- Accounts(customer_id, account_id, balance): the join from each customer
+--   to their accounts, already in account_id order and covering balance.
+--   It also serves the foreign key, so MySQL drops the implicit
+--   customer_id index it created for it.
+--
+-- Point lookups, batch id lists/ranges and balance updates use the
+-- primary keys. No handler filters on tier alone, so it gets no index
+-- of its own.
+--
+-- Online DDL: reads and writes continue while the indexes build.
+ALTER TABLE Customers
+    ADD INDEX idx_customers_name (name, customer_id, tier),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE Accounts
+    ADD INDEX idx_accounts_customer (customer_id, account_id, balance),
+    ALGORITHM=INPLACE, LOCK=NONE;
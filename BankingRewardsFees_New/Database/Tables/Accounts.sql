@@ -5,5 +5,7 @@ CREATE TABLE Accounts (
     balance DECIMAL(10,2),
     created_at DATETIME,
     updated_at DATETIME,
-    FOREIGN KEY (customer_id) REFERENCES Customers(customer_id)
+    FOREIGN KEY (customer_id) REFERENCES Customers(customer_id),
+    -- Covers the join from Customers in the list, page and export queries
+    INDEX idx_accounts_customer (customer_id, account_id, balance)
 );
\ No newline at end of file
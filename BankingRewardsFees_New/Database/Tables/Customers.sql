@@ -4,5 +4,7 @@ CREATE TABLE Customers (
     name VARCHAR(255),
     tier VARCHAR(50),
     created_at DATETIME,
-    updated_at DATETIME
+    updated_at DATETIME,
+    -- Name order of the account list; tier makes it covering
+    INDEX idx_customers_name (name, customer_id, tier)
 );
\ No newline at end of file
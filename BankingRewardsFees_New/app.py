@@ -3,15 +3,54 @@ import requests
 import pandas as pd
 import json
 import os
+import sys
 from dotenv import load_dotenv
 
+# Share the fee/reward rules with the Lambda services for the mock fallback
+sys.path.append(os.path.join(os.path.dirname(__file__), 'lambda_functions'))
+from business_rules import calculate_fee, calculate_reward
+from ttl_cache import TTLCache, MISS
+from banking_client import BankingClient, BankingAPIError
+
 # Load environment variables
 load_dotenv('aws_lambda_api.env')
 
+@st.cache_resource
+def get_client():
+    """One pooled keep-alive client per Streamlit server process"""
+    return BankingClient.from_env()
+
+client = get_client()
+
 # AWS Lambda API URLs
-ACCOUNT_SERVICE_URL = os.getenv('ACCOUNT_SERVICE_URL', 'https://ule48xqcya.execute-api.us-west-2.amazonaws.com/default/Account_Service')
-FEE_CALCULATION_URL = os.getenv('FEE_CALCULATION_URL', 'https://hsa8bd8loc.execute-api.us-west-2.amazonaws.com/default/Fee_Calculation_Service')
-REWARDS_CALCULATION_URL = os.getenv('REWARDS_CALCULATION_URL', 'https://1gqnjvxjdl.execute-api.us-west-2.amazonaws.com/default/Rewards_Calculation_Service')
+ACCOUNT_SERVICE_URL = client.urls['account']
+FEE_CALCULATION_URL = client.urls['fee']
+REWARDS_CALCULATION_URL = client.urls['rewards']
+
+# Account Service responses cached across reruns and sessions (0 disables)
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '60'))
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '512'))
+
+@st.cache_resource
+def get_response_cache():
+    """One response cache per Streamlit server process, shared by every session"""
+    return TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+
+RESPONSE_CACHE = get_response_cache()
+
+def response_key(kind, account_id=None):
+    """
+    RESPONSE_CACHE key for one Account Service response. Account ids are
+    stored as ints, so '2' from a URL and 2 from the account list match.
+    """
+    if account_id is None:
+        return (kind, ACCOUNT_SERVICE_URL)
+    return (kind, ACCOUNT_SERVICE_URL, int(account_id))
+
+def invalidate_account(account_id):
+    """Drop the cached list and every cached response for one account"""
+    account_id = int(account_id)
+    RESPONSE_CACHE.invalidate(lambda key: key[0] == 'accounts' or key[-1] == account_id)
 
 # ---- Mock Data for Testing ----
 def get_mock_accounts():
@@ -78,13 +117,7 @@ def calculate_mock_fees(account_id):
     
     customer_tier = account['customer_tier']
     balance = account['balance']
-    
-    if customer_tier == 'premium':
-        fee = 0.00
-    elif balance > 5000:
-        fee = 5.00
-    else:
-        fee = 15.00
+    fee = calculate_fee(customer_tier, balance)
     
     return {
         'account_id': account_id,
@@ -101,39 +134,49 @@ def calculate_mock_rewards(account_id):
         return None
     
     balance = account['balance']
-    
-    if balance > 10000:
-        reward_rate = 0.02
-    else:
-        reward_rate = 0.01
-    
-    calculated_reward = balance * reward_rate
+    reward_rate, calculated_reward = calculate_reward(balance)
     
     return {
         'account_id': account_id,
         'balance': balance,
         'reward_rate': reward_rate,
-        'calculated_reward': round(calculated_reward, 2),
+        'calculated_reward': calculated_reward,
         'calculation_timestamp': 'mock_calculation'
     }
 
+def get_mock_account_summary(account_id):
+    """Mock account summary (details, fee and reward) for testing"""
+    account = get_mock_account_details(account_id)
+    if not account:
+        return None
+    
+    return {
+        'account': account,
+        'fee': calculate_mock_fees(account_id),
+        'rewards': calculate_mock_rewards(account_id)
+    }
+
 # ---- API Helper Functions ----
 def get_accounts():
     """Get all accounts from Account Service Lambda"""
+    cache_key = response_key('accounts')
+    cached = RESPONSE_CACHE.get(cache_key)
+    if cached is not MISS:
+        return cached
+    generation = RESPONSE_CACHE.generation
     try:
-        response = requests.get(ACCOUNT_SERVICE_URL, timeout=10)
-        if response.status_code == 200:
-            accounts_data = response.json()
-            # Validate data structure
-            if isinstance(accounts_data, list) and len(accounts_data) > 0:
-                # Check if first account has required fields
-                if 'customer_name' in accounts_data[0] and 'account_id' in accounts_data[0]:
-                    return accounts_data
-            st.warning("Invalid data structure from Account Service. Using mock data.")
-            return get_mock_accounts()
-        else:
-            st.error(f"Failed to fetch accounts: {response.status_code}. Using mock data.")
-            return get_mock_accounts()
+        accounts_data = client.get_accounts()
+        # Validate data structure
+        if isinstance(accounts_data, list) and len(accounts_data) > 0:
+            # Check if first account has required fields
+            if 'customer_name' in accounts_data[0] and 'account_id' in accounts_data[0]:
+                RESPONSE_CACHE.set(cache_key, accounts_data, generation)
+                return accounts_data
+        st.warning("Invalid data structure from Account Service. Using mock data.")
+        return get_mock_accounts()
+    except BankingAPIError as e:
+        st.error(f"Failed to fetch accounts: {e.status_code}. Using mock data.")
+        return get_mock_accounts()
     except requests.exceptions.RequestException as e:
         st.warning(f"Cannot connect to Account Service: {str(e)}")
         st.info("Using mock data for demonstration purposes")
@@ -142,38 +185,63 @@ def get_accounts():
         st.error(f"Unexpected error: {str(e)}")
         return get_mock_accounts()
 
-def get_account_details(account_id):
-    """Get specific account details from Account Service Lambda"""
+def get_account_summary(account_id):
+    """Get account details, fee and reward in one call to the Account Service Lambda"""
+    cache_key = response_key('summary', account_id)
+    cached = RESPONSE_CACHE.get(cache_key)
+    if cached is not MISS:
+        return cached
+    generation = RESPONSE_CACHE.generation
     try:
-        response = requests.get(f"{ACCOUNT_SERVICE_URL}/{account_id}", timeout=10)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.warning(f"Failed to fetch account details: {response.status_code}. Using mock data.")
-            return get_mock_account_details(account_id)
+        summary_data = client.get_account_summary(account_id)
+        if 'account' in summary_data:
+            RESPONSE_CACHE.set(cache_key, summary_data, generation)
+            return summary_data
+        # Deployed Account Service predates the summary view
+        return load_account_view(account_id, cache_key, generation)
+    except BankingAPIError as e:
+        st.warning(f"Failed to fetch account summary: {e.status_code}. Loading details, fee and rewards separately.")
+        return load_account_view(account_id, cache_key, generation)
     except requests.exceptions.RequestException as e:
         st.warning(f"Cannot connect to Account Service: {str(e)}")
-        return get_mock_account_details(account_id)
+        return get_mock_account_summary(account_id)
     except Exception as e:
         st.error(f"Unexpected error: {str(e)}")
-        return get_mock_account_details(account_id)
+        return get_mock_account_summary(account_id)
+
+def load_account_view(account_id, cache_key=None, generation=None):
+    """Fetch details, fee and rewards concurrently, showing each as it arrives"""
+    fallbacks = {
+        'account': ("Account details", get_mock_account_details),
+        'fee': ("Fee calculation", calculate_mock_fees),
+        'rewards': ("Rewards calculation", calculate_mock_rewards)
+    }
+    view = {}
+    complete = True
+    with st.status("Loading account details, fees and rewards...") as status:
+        for part, result in client.iter_account_view(account_id):
+            label, fallback = fallbacks[part]
+            if isinstance(result, Exception):
+                status.write(f"{label} unavailable ({result}). Using mock data.")
+                result = fallback(account_id)
+                complete = False
+            else:
+                status.write(f"{label} loaded")
+            view[part] = result
+        status.update(label="Account loaded", state="complete")
+    if complete and cache_key is not None:
+        RESPONSE_CACHE.set(cache_key, view, generation)
+    return view
 
 def update_account_balance(account_id, new_balance):
     """Update account balance via Account Service Lambda"""
     try:
-        payload = {"balance": new_balance}
-        response = requests.put(
-            f"{ACCOUNT_SERVICE_URL}/{account_id}",
-            json=payload,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
-        if response.status_code == 200:
-            return True
-        else:
-            st.error(f"Failed to update balance: {response.status_code}")
-            st.info("Balance update would work with deployed Lambda functions")
-            return False
+        client.update_account_balance(account_id, new_balance)
+        return True
+    except BankingAPIError as e:
+        st.error(f"Failed to update balance: {e.status_code}")
+        st.info("Balance update would work with deployed Lambda functions")
+        return False
     except requests.exceptions.RequestException as e:
         st.warning(f"Cannot connect to Account Service: {str(e)}")
         st.info("Balance update would work with deployed Lambda functions")
@@ -181,52 +249,9 @@ def update_account_balance(account_id, new_balance):
     except Exception as e:
         st.error(f"Unexpected error: {str(e)}")
         return False
-
-def calculate_fees(account_id):
-    """Calculate fees via Fee Calculation Service Lambda"""
-    try:
-        payload = {"account_id": account_id}
-        response = requests.post(
-            f"{FEE_CALCULATION_URL}/{account_id}",
-            json=payload,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.warning(f"Failed to calculate fees: {response.status_code}. Using mock calculation.")
-            return calculate_mock_fees(account_id)
-    except requests.exceptions.RequestException as e:
-        st.warning(f"Cannot connect to Fee Calculation Service: {str(e)}")
-        st.info("Using mock calculation for demonstration")
-        return calculate_mock_fees(account_id)
-    except Exception as e:
-        st.error(f"Unexpected error: {str(e)}")
-        return calculate_mock_fees(account_id)
-
-def calculate_rewards(account_id):
-    """Calculate rewards via Rewards Calculation Service Lambda"""
-    try:
-        payload = {"account_id": account_id}
-        response = requests.post(
-            f"{REWARDS_CALCULATION_URL}/{account_id}",
-            json=payload,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.warning(f"Failed to calculate rewards: {response.status_code}. Using mock calculation.")
-            return calculate_mock_rewards(account_id)
-    except requests.exceptions.RequestException as e:
-        st.warning(f"Cannot connect to Rewards Calculation Service: {str(e)}")
-        st.info("Using mock calculation for demonstration")
-        return calculate_mock_rewards(account_id)
-    except Exception as e:
-        st.error(f"Unexpected error: {str(e)}")
-        return calculate_mock_rewards(account_id)
+    finally:
+        # Even a timed-out PUT may have been applied
+        invalidate_account(account_id)
 
 # ---- Streamlit UI ----
 st.title("Banking Rewards & Fees Demo (Microservices Version)")
@@ -239,6 +264,15 @@ with st.expander("🔧 System Status", expanded=False):
     st.code(f"Fee Calculation: {FEE_CALCULATION_URL}")
     st.code(f"Rewards Calculation: {REWARDS_CALCULATION_URL}")
     st.info("If Lambda services are not deployed, the app will use mock data for demonstration.")
+    st.write("**Response Cache:**")
+    cache_stats = RESPONSE_CACHE.stats()
+    st.caption(
+        f"{cache_stats['size']}/{cache_stats['maxsize']} entries, TTL {cache_stats['ttl_seconds']:g}s | "
+        f"{cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+        f"{cache_stats['invalidations']} invalidated, {cache_stats['expirations']} expired"
+    )
+    if st.button("Clear Response Cache"):
+        RESPONSE_CACHE.clear()
 
 # Initialize session state for calculations
 if 'fee_result' not in st.session_state:
@@ -263,24 +297,31 @@ except KeyError as e:
 selected_account_label = st.selectbox("Select an Account", options=list(account_options.keys()))
 selected_account_id = account_options[selected_account_label]
 
+# Details, fee and reward in one round trip to the Account Service
+with st.spinner("Loading account..."):
+    account_summary = get_account_summary(selected_account_id)
+
 # Action buttons in columns
-col1, col2 = st.columns(2)
+col1, col2, col3 = st.columns(3)
 
 with col1:
     if st.button("Calculate Fees", type="primary"):
-        with st.spinner("Calculating fees..."):
-            fee_result = calculate_fees(selected_account_id)
-            if fee_result:
-                st.session_state.fee_result = fee_result
-                st.success("Fees calculated successfully!")
+        if account_summary:
+            st.session_state.fee_result = account_summary['fee']
+            st.success("Fees calculated successfully!")
 
 with col2:
     if st.button("Calculate Rewards", type="primary"):
-        with st.spinner("Calculating rewards..."):
-            rewards_result = calculate_rewards(selected_account_id)
-            if rewards_result:
-                st.session_state.rewards_result = rewards_result
-                st.success("Rewards calculated successfully!")
+        if account_summary:
+            st.session_state.rewards_result = account_summary['rewards']
+            st.success("Rewards calculated successfully!")
+
+with col3:
+    if st.button("Calculate Both", type="primary"):
+        if account_summary:
+            st.session_state.fee_result = account_summary['fee']
+            st.session_state.rewards_result = account_summary['rewards']
+            st.success("Fees and rewards calculated successfully!")
 
 # Display calculation results
 if st.session_state.fee_result:
@@ -297,7 +338,7 @@ if st.session_state.rewards_result:
 
 # Account details and balance management
 st.subheader("Account Management")
-account_details = get_account_details(selected_account_id)
+account_details = account_summary['account'] if account_summary else None
 
 if account_details:
     # Balance management
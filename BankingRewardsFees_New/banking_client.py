@@ -0,0 +1,160 @@
+"""
+HTTP client for the Banking Rewards & Fees Lambda services
+
+One BankingClient holds a pooled requests.Session, so repeated calls reuse
+kept-alive connections to API Gateway instead of opening a new TCP/TLS
+connection per request. Transient failures (connection errors, 502/503/504,
+429) are retried with exponential backoff; every service route is safe to
+retry because PUT sets an absolute balance and the calculation POSTs are
+read-only.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_ACCOUNT_SERVICE_URL = 'https://ule48xqcya.execute-api.us-west-2.amazonaws.com/default/Account_Service'
+DEFAULT_FEE_CALCULATION_URL = 'https://hsa8bd8loc.execute-api.us-west-2.amazonaws.com/default/Fee_Calculation_Service'
+DEFAULT_REWARDS_CALCULATION_URL = 'https://1gqnjvxjdl.execute-api.us-west-2.amazonaws.com/default/Rewards_Calculation_Service'
+
+# (connect, read) timeouts in seconds per service
+DEFAULT_TIMEOUTS = {
+    'account': (3.05, 10),
+    'fee': (3.05, 10),
+    'rewards': (3.05, 10)
+}
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class BankingAPIError(Exception):
+    """A service answered with a non-200 status after retries"""
+
+    def __init__(self, response):
+        super().__init__(f"{response.request.method} {response.url} returned {response.status_code}")
+        self.response = response
+        self.status_code = response.status_code
+
+
+class BankingClient:
+    """Pooled, keep-alive client with one method per service call"""
+
+    def __init__(self, account_url=DEFAULT_ACCOUNT_SERVICE_URL, fee_url=DEFAULT_FEE_CALCULATION_URL,
+                 rewards_url=DEFAULT_REWARDS_CALCULATION_URL, pool_size=10, timeouts=None,
+                 retries=3, backoff_factor=0.2):
+        self.urls = {
+            'account': account_url.rstrip('/'),
+            'fee': fee_url.rstrip('/'),
+            'rewards': rewards_url.rstrip('/')
+        }
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'PUT', 'POST', 'OPTIONS']),
+            raise_on_status=False
+        )
+        # One pool per host (the three services live on separate API Gateway
+        # hosts); pool_maxsize bounds concurrent connections to each host
+        adapter = HTTPAdapter(pool_connections=len(self.urls), pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
+        self.pool_size = pool_size
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Client for the URLs in ACCOUNT_SERVICE_URL, FEE_CALCULATION_URL and REWARDS_CALCULATION_URL"""
+        return cls(
+            account_url=os.getenv('ACCOUNT_SERVICE_URL', DEFAULT_ACCOUNT_SERVICE_URL),
+            fee_url=os.getenv('FEE_CALCULATION_URL', DEFAULT_FEE_CALCULATION_URL),
+            rewards_url=os.getenv('REWARDS_CALCULATION_URL', DEFAULT_REWARDS_CALCULATION_URL),
+            **kwargs
+        )
+
+    def request(self, service, method, account_id=None, **kwargs):
+        """Send one request to a service and return the raw response"""
+        url = self.urls[service] if account_id is None else f"{self.urls[service]}/{account_id}"
+        kwargs.setdefault('timeout', self.timeouts[service])
+        return self.session.request(method, url, **kwargs)
+
+    def _json(self, service, method, account_id=None, **kwargs):
+        response = self.request(service, method, account_id, **kwargs)
+        if response.status_code != 200:
+            raise BankingAPIError(response)
+        return response.json()
+
+    def get_accounts(self):
+        """All accounts with customer information"""
+        return self._json('account', 'GET')
+
+    def get_account_details(self, account_id):
+        """One account with customer information"""
+        return self._json('account', 'GET', account_id)
+
+    def get_account_summary(self, account_id):
+        """Account details, monthly fee and monthly reward in one call"""
+        return self._json('account', 'GET', account_id, params={'view': 'summary'})
+
+    def update_account_balance(self, account_id, new_balance):
+        """Set the account balance; returns the service's confirmation"""
+        return self._json('account', 'PUT', account_id, json={'balance': new_balance})
+
+    def calculate_fees(self, account_id):
+        """Monthly fee for one account"""
+        return self._json('fee', 'POST', account_id, json={'account_id': account_id})
+
+    def calculate_rewards(self, account_id):
+        """Monthly reward for one account"""
+        return self._json('rewards', 'POST', account_id, json={'account_id': account_id})
+
+    def iter_account_view(self, account_id):
+        """
+        Fetch details, fee and reward concurrently and yield
+        ('account' | 'fee' | 'rewards', result) as each call completes.
+        A failed call yields its exception instead of raising, so callers
+        can fall back per part; the whole view costs the slowest call.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='banking-client')
+        futures = {
+            self._executor.submit(self.get_account_details, account_id): 'account',
+            self._executor.submit(self.calculate_fees, account_id): 'fee',
+            self._executor.submit(self.calculate_rewards, account_id): 'rewards'
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+    def get_account_view(self, account_id):
+        """Details, fee and reward fetched concurrently; raises a failure once all calls finish"""
+        view = dict(self.iter_account_view(account_id))
+        for result in view.values():
+            if isinstance(result, Exception):
+                raise result
+        return view
+
+    def close(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Throughput of the fee and reward rules: scalar API in a Python loop versus
+the NumPy batch API.
+
+    python benchmarks/bench_business_rules.py --accounts 5000000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+from business_rules import calculate_fee, calculate_reward, calculate_fees_array, calculate_rewards_array
+
+
+def make_book(num_accounts, seed=42):
+    rng = np.random.default_rng(seed)
+    balances = np.round(rng.uniform(0, 20000, num_accounts), 2)
+    tiers = np.where(rng.random(num_accounts) < 0.2, 'premium', 'standard')
+    return tiers, balances
+
+
+def bench_scalar(tiers, balances):
+    tiers = tiers.tolist()
+    balances = balances.tolist()
+    start = time.perf_counter()
+    for tier, balance in zip(tiers, balances):
+        calculate_fee(tier, balance)
+        calculate_reward(balance)
+    return time.perf_counter() - start
+
+
+def bench_batch(tiers, balances):
+    start = time.perf_counter()
+    calculate_fees_array(tiers, balances)
+    calculate_rewards_array(balances)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=2000000)
+    parser.add_argument('--scalar-accounts', type=int, default=200000,
+                        help='accounts for the (slow) scalar loop')
+    args = parser.parse_args()
+
+    tiers, balances = make_book(args.accounts)
+    scalar_seconds = bench_scalar(tiers[:args.scalar_accounts], balances[:args.scalar_accounts])
+    batch_seconds = bench_batch(tiers, balances)
+
+    scalar_rate = args.scalar_accounts / scalar_seconds
+    batch_rate = args.accounts / batch_seconds
+    print(json.dumps({
+        'scalar_accounts_per_second': round(scalar_rate),
+        'batch_accounts': args.accounts,
+        'batch_seconds': round(batch_seconds, 3),
+        'batch_accounts_per_second': round(batch_rate),
+        'speedup': round(batch_rate / scalar_rate, 1)
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Per-request latency of the Lambda handlers with a fresh connection per
+invocation (the old behaviour) versus the warm connection kept by
+db_connection.
+
+Both passes start with an empty account cache and must send the database
+the same number of statements, so the comparison is connection cost only.
+
+    python benchmarks/bench_connection_reuse.py
+    python benchmarks/bench_connection_reuse.py --backend mysql   # uses DB_* env vars
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+import account_service
+import db_connection
+import sqlite_backend
+from account_service import lambda_handler as account_handler
+from fee_calculation_service import lambda_handler as fee_handler
+from rewards_calculation_service import lambda_handler as rewards_handler
+
+
+# Measure the database path, not the read-through cache
+account_service.ACCOUNT_CACHE.ttl = 0
+
+
+class CountingCursor:
+    """Cursor proxy counting the statements sent to the server"""
+
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def execute(self, *args, **kwargs):
+        self._counter['statements'] += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class CountingConnection:
+    """Connection proxy whose cursors count statements into counter"""
+
+    def __init__(self, conn, counter):
+        self._conn = conn
+        self._counter = counter
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._conn.cursor(*args, **kwargs), self._counter)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def make_events(num_requests, num_accounts, seed=7):
+    """A mix of detail, fee and reward requests over random accounts."""
+    rng = random.Random(seed)
+    handlers = [account_handler, fee_handler, rewards_handler]
+    events = []
+    for i in range(num_requests):
+        account_id = str(rng.randint(1, num_accounts))
+        handler = handlers[i % len(handlers)]
+        method = 'GET' if handler is account_handler else 'POST'
+        events.append((handler, {
+            'httpMethod': method,
+            'pathParameters': {'account_id': account_id},
+            'queryStringParameters': None,
+            'body': None
+        }))
+    return events
+
+
+def run(events, reuse, connect):
+    """
+    Invoke every event with connections from connect and return the
+    per-request latencies in milliseconds and the statements executed.
+    """
+    counter = {'statements': 0}
+
+    def counting_connect(**kwargs):
+        return CountingConnection(connect(**kwargs), counter)
+
+    db_connection.reset_connection()
+    account_service.ACCOUNT_CACHE.clear()
+    latencies = []
+    with patch('mysql.connector.connect', counting_connect):
+        for handler, event in events:
+            start = time.perf_counter()
+            response = handler(event, None)
+            if not reuse:
+                # What the handlers did before: close the connection every request
+                db_connection.reset_connection()
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response['statusCode'] != 200:
+                raise RuntimeError(f"Unexpected response: {response}")
+        db_connection.reset_connection()
+    return latencies, counter['statements']
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'mean_ms': round(statistics.mean(ordered), 3),
+        'p50_ms': round(ordered[len(ordered) // 2], 3),
+        'p95_ms': round(ordered[int(len(ordered) * 0.95) - 1], 3),
+        'p99_ms': round(ordered[int(len(ordered) * 0.99) - 1], 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    parser.add_argument('--requests', type=int, default=600)
+    parser.add_argument('--accounts', type=int, default=1000)
+    parser.add_argument('--connect-latency-ms', type=float, default=20.0,
+                        help='simulated handshake cost for the sqlite backend')
+    args = parser.parse_args()
+
+    events = make_events(args.requests, args.accounts)
+
+    path = None
+    if args.backend == 'sqlite':
+        path = sqlite_backend.create_database(args.accounts)
+        connect = sqlite_backend.make_connect(path, connect_latency=args.connect_latency_ms / 1000)
+    else:
+        import mysql.connector
+        connect = mysql.connector.connect
+    try:
+        before, before_statements = run(events, False, connect)
+        after, after_statements = run(events, True, connect)
+    finally:
+        if path:
+            os.remove(path)
+    if before_statements != after_statements:
+        raise RuntimeError(f"Passes sent different work to the database: "
+                           f"{before_statements} vs {after_statements} statements")
+
+    results = {
+        'backend': args.backend,
+        'connection_per_request': {**summarize(before), 'statements': before_statements},
+        'warm_connection': {**summarize(after), 'statements': after_statements}
+    }
+    results['speedup_p50'] = round(results['connection_per_request']['p50_ms'] / results['warm_connection']['p50_ms'], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of every lambda_handler route against the SQLite stand-in
+at growing book sizes. For each size and route it reports per-invocation
+latency percentiles, throughput and the peak Python heap of one invocation
+(tracemalloc), and writes the run to JSON so runs can be compared.
+
+Routes: list (GET /), page (GET /?limit=100), detail (GET /{id}),
+put (PUT /{id}), fee (POST /{id}) and reward (POST /{id}).
+
+    python benchmarks/bench_handlers.py --sizes 10 10000 1000000 --output handlers.json
+    python benchmarks/bench_handlers.py --sizes 10000 --compare handlers.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+import account_service
+import db_connection
+import sqlite_backend
+from account_service import lambda_handler as account_handler
+from fee_calculation_service import lambda_handler as fee_handler
+from rewards_calculation_service import lambda_handler as rewards_handler
+
+ROUTES = ['list', 'page', 'detail', 'put', 'fee', 'reward']
+
+# Measure the database path, not the read-through cache
+account_service.ACCOUNT_CACHE.ttl = 0
+
+
+def make_event(route, rng, num_accounts):
+    """(handler, event) for one invocation of route on a random account"""
+    account_id = str(rng.randint(1, num_accounts))
+    event = {'httpMethod': 'GET', 'pathParameters': None, 'queryStringParameters': None, 'body': None}
+    if route == 'list':
+        return account_handler, event
+    if route == 'page':
+        return account_handler, dict(event, queryStringParameters={'limit': '100'})
+    event['pathParameters'] = {'account_id': account_id}
+    if route == 'detail':
+        return account_handler, event
+    if route == 'put':
+        return account_handler, dict(event, httpMethod='PUT', body=json.dumps({'balance': round(rng.uniform(0, 20000), 2)}))
+    return (fee_handler if route == 'fee' else rewards_handler), dict(event, httpMethod='POST')
+
+
+def invoke(handler, event):
+    response = handler(event, None)
+    if response['statusCode'] != 200:
+        raise RuntimeError(f"Unexpected response: {response}")
+    return response
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def bench_route(route, num_accounts, iterations, time_budget, seed=7):
+    rng = random.Random(seed)
+    events = [make_event(route, rng, num_accounts) for _ in range(iterations)]
+
+    # Warm the connection and the page cache
+    invoke(*events[0])
+
+    latencies = []
+    deadline = time.perf_counter() + time_budget
+    started = time.perf_counter()
+    for handler, event in events:
+        start = time.perf_counter()
+        invoke(handler, event)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if start > deadline:
+            break
+    elapsed = time.perf_counter() - started
+
+    # Heap peak of a single invocation, measured separately so tracing
+    # overhead does not skew the latencies
+    tracemalloc.start()
+    invoke(*events[-1])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    ordered = sorted(latencies)
+    return {
+        'invocations': len(ordered),
+        'mean_ms': round(statistics.mean(ordered), 3),
+        'p50_ms': round(percentile(ordered, 0.50), 3),
+        'p95_ms': round(percentile(ordered, 0.95), 3),
+        'p99_ms': round(percentile(ordered, 0.99), 3),
+        'max_ms': round(ordered[-1], 3),
+        'throughput_per_s': round(len(ordered) / elapsed, 1),
+        'peak_heap_mb': round(peak / 1024 / 1024, 3)
+    }
+
+
+def bench_size(num_accounts, routes, iterations, time_budget):
+    path = sqlite_backend.create_database(num_accounts)
+    results = {}
+    try:
+        with patch('mysql.connector.connect', sqlite_backend.make_connect(path)):
+            for route in routes:
+                results[route] = bench_route(route, num_accounts, iterations, time_budget)
+                print(f"{num_accounts:>9} {route:<7} {results[route]['p50_ms']:>10.3f} ms p50 "
+                      f"{results[route]['throughput_per_s']:>10.1f}/s", file=sys.stderr)
+    finally:
+        db_connection.reset_connection()
+        os.remove(path)
+    return results
+
+
+def compare(baseline, current):
+    """p50 and peak-heap ratios (current / baseline) for sizes and routes in both runs"""
+    ratios = {}
+    for size, routes in current['sizes'].items():
+        for route, stats in routes.items():
+            before = baseline['sizes'].get(size, {}).get(route)
+            if before:
+                ratios.setdefault(size, {})[route] = {
+                    'p50': round(stats['p50_ms'] / before['p50_ms'], 2) if before['p50_ms'] else None,
+                    'peak_heap': round(stats['peak_heap_mb'] / before['peak_heap_mb'], 2) if before['peak_heap_mb'] else None
+                }
+    return ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 10000, 1000000])
+    parser.add_argument('--routes', nargs='+', choices=ROUTES, default=ROUTES)
+    parser.add_argument('--iterations', type=int, default=1000, help='invocations per route')
+    parser.add_argument('--time-budget', type=float, default=10.0, help='seconds per route before stopping early')
+    parser.add_argument('--output', help='write the results JSON here')
+    parser.add_argument('--compare', metavar='BASELINE', help='print ratios against an earlier results JSON')
+    args = parser.parse_args()
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'iterations': args.iterations,
+        'sizes': {str(size): bench_size(size, args.routes, args.iterations, args.time_budget) for size in args.sizes}
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            results['ratio_to_baseline'] = compare(json.load(f), results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Per-call latency of the frontend's service calls: bare requests.get/post
+(a new connection per call, what app.py did before) versus the pooled
+keep-alive BankingClient, then one account view (details, fee, reward)
+fetched sequentially versus concurrently. Runs against the local stub
+server by default.
+
+    python benchmarks/bench_http_client.py --requests 600 --latency-ms 20
+    python benchmarks/bench_http_client.py --base-url https://xxxx.execute-api.us-west-2.amazonaws.com/default
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from banking_client import BankingClient
+from stub_server import start_stub_server
+
+
+def bare_calls(urls, account_id):
+    """The calls app.py made before BankingClient, one connection each"""
+    return [
+        lambda: requests.get(f"{urls['account']}/{account_id}", timeout=10),
+        lambda: requests.post(f"{urls['fee']}/{account_id}", json={'account_id': account_id}, timeout=10),
+        lambda: requests.post(f"{urls['rewards']}/{account_id}", json={'account_id': account_id}, timeout=10)
+    ]
+
+
+def client_calls(client, account_id):
+    return [
+        lambda: client.get_account_details(account_id),
+        lambda: client.calculate_fees(account_id),
+        lambda: client.calculate_rewards(account_id)
+    ]
+
+
+def run(make_calls, num_requests, num_accounts):
+    latencies = []
+    for i in range(num_requests):
+        call = make_calls(i % num_accounts + 1)[i % 3]
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run_views(client, num_views, num_accounts, concurrent):
+    latencies = []
+    for i in range(num_views):
+        account_id = i % num_accounts + 1
+        start = time.perf_counter()
+        if concurrent:
+            client.get_account_view(account_id)
+        else:
+            client.get_account_details(account_id)
+            client.calculate_fees(account_id)
+            client.calculate_rewards(account_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'mean_ms': round(statistics.mean(ordered), 3),
+        'p50_ms': round(ordered[len(ordered) // 2], 3),
+        'p95_ms': round(ordered[int(len(ordered) * 0.95) - 1], 3),
+        'p99_ms': round(ordered[int(len(ordered) * 0.99) - 1], 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=600)
+    parser.add_argument('--accounts', type=int, default=100)
+    parser.add_argument('--views', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='simulated service latency for the stub')
+    parser.add_argument('--base-url', help='deployed API base URL instead of the local stub')
+    args = parser.parse_args()
+
+    server = None
+    if args.base_url:
+        base = args.base_url.rstrip('/')
+    else:
+        server = start_stub_server(args.accounts, latency=args.latency_ms / 1000)
+        base = server.base_url
+    urls = {
+        'account': f"{base}/Account_Service",
+        'fee': f"{base}/Fee_Calculation_Service",
+        'rewards': f"{base}/Rewards_Calculation_Service"
+    }
+
+    results = {'target': base}
+    connections = server.connections if server else None
+    results['bare_requests'] = summarize(run(lambda a: bare_calls(urls, a), args.requests, args.accounts))
+    if server:
+        results['bare_requests']['connections'] = server.connections - connections
+        connections = server.connections
+    with BankingClient(urls['account'], urls['fee'], urls['rewards']) as client:
+        results['banking_client'] = summarize(run(lambda a: client_calls(client, a), args.requests, args.accounts))
+        if server:
+            results['banking_client']['connections'] = server.connections - connections
+        results['account_view_sequential'] = summarize(run_views(client, args.views, args.accounts, concurrent=False))
+        results['account_view_concurrent'] = summarize(run_views(client, args.views, args.accounts, concurrent=True))
+    if server:
+        server.shutdown()
+        server.server_close()
+
+    results['speedup_p50'] = round(results['bare_requests']['p50_ms'] / results['banking_client']['p50_ms'], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Peak memory of exporting the account list: the handler's JSON array
+(fetchall + json.dumps) versus the streaming NDJSON export. Each mode runs
+in a fresh interpreter so ru_maxrss is its own peak.
+
+    python benchmarks/bench_ndjson_export.py --accounts 1000000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import sqlite_backend
+
+
+def run_worker(mode, path):
+    """Export once in this process and print elapsed time and peak RSS."""
+    from unittest.mock import patch
+    from account_service import lambda_handler
+    from export_accounts import export_to_file
+
+    start = time.perf_counter()
+    if mode == 'array':
+        event = {'httpMethod': 'GET', 'pathParameters': None, 'queryStringParameters': None, 'body': None}
+        with patch('mysql.connector.connect', sqlite_backend.make_connect(path)):
+            size = len(lambda_handler(event, None)['body'])
+    else:
+        size = export_to_file(lambda: sqlite_backend.SQLiteConnection(path), os.devnull)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        'mode': mode,
+        'output_bytes': size,
+        'seconds': round(elapsed, 2),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=1000000)
+    parser.add_argument('--worker', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(*args.worker)
+        return
+
+    path = sqlite_backend.create_database(args.accounts)
+    results = []
+    for mode in ['ndjson', 'array']:
+        output = subprocess.run(
+            [sys.executable, __file__, '--worker', mode, path],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output))
+    os.remove(path)
+    print(json.dumps({'accounts': args.accounts, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Latency of account_service list pages at increasing depth: keyset cursor
+versus the equivalent LIMIT/OFFSET query, on the SQLite stand-in (which
+has the Database/Tables indexes the keyset query relies on).
+
+    python benchmarks/bench_pagination.py --accounts 200000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+import account_service
+import db_connection
+import sqlite_backend
+from account_service import lambda_handler, encode_cursor
+
+OFFSET_QUERY = """
+    SELECT a.account_id, a.balance, c.customer_id, c.name as customer_name, c.tier as customer_tier
+    FROM Accounts a
+    JOIN Customers c ON a.customer_id = c.customer_id
+    ORDER BY c.name, c.customer_id, a.account_id
+    LIMIT %s OFFSET %s
+"""
+
+
+# Measure the database path, not the read-through cache
+account_service.ACCOUNT_CACHE.ttl = 0
+
+
+def time_call(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=200000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = sqlite_backend.create_database(args.accounts)
+    conn = sqlite_backend.SQLiteConnection(path)
+    cursor = conn.cursor(dictionary=True)
+
+    results = []
+    with patch('mysql.connector.connect', sqlite_backend.make_connect(path)):
+        for depth in [0, args.accounts // 100, args.accounts // 10, args.accounts // 2, args.accounts - args.limit]:
+            event = {'httpMethod': 'GET', 'pathParameters': None, 'queryStringParameters': {'limit': str(args.limit)}, 'body': None}
+            if depth:
+                # Key of the row just before this page
+                cursor.execute(OFFSET_QUERY, (1, depth - 1))
+                event['queryStringParameters']['cursor'] = encode_cursor(cursor.fetchone())
+            keyset_ms = time_call(lambda: lambda_handler(event, None), args.repeat)
+            offset_ms = time_call(lambda: (cursor.execute(OFFSET_QUERY, (args.limit, depth)), cursor.fetchall()), args.repeat)
+            results.append({'depth': depth, 'keyset_ms': keyset_ms, 'offset_ms': offset_ms})
+
+    db_connection.reset_connection()
+    conn.close()
+    os.remove(path)
+    print(json.dumps({'accounts': args.accounts, 'limit': args.limit, 'pages': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Time to serialise the full account list (GET /) as the handler returns it,
+from rows shaped like the MySQL driver's: Decimal balances and, with
+--timestamps, datetime created_at/updated_at columns.
+
+- prepass: the previous handler code, a per-row loop converting Decimal
+  (and datetime) values followed by json.dumps
+- json: serialization.dumps with the stdlib fallback backend
+- orjson: serialization.dumps with orjson (skipped when not installed)
+
+    python benchmarks/bench_serialization.py --accounts 100000
+    python benchmarks/bench_serialization.py --accounts 100000 --timestamps
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+import serialization
+
+
+def make_rows(num_accounts, timestamps, seed=7):
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    rows = []
+    for account_id in range(1, num_accounts + 1):
+        row = {
+            'account_id': account_id,
+            'balance': Decimal(rng.randint(0, 2000000)) / 100,
+            'customer_name': f"Customer {rng.randint(1, num_accounts):07d}",
+            'customer_tier': rng.choice(['standard', 'premium'])
+        }
+        if timestamps:
+            row['created_at'] = start + timedelta(seconds=rng.randint(0, 10 ** 7))
+            row['updated_at'] = row['created_at'] + timedelta(seconds=rng.randint(0, 10 ** 6))
+        rows.append(row)
+    return rows
+
+
+def prepass_dumps(accounts):
+    """What the handlers did before serialization.py"""
+    for account in accounts:
+        if account['balance']:
+            account['balance'] = float(account['balance'])
+        for column in ('created_at', 'updated_at'):
+            if account.get(column):
+                account[column] = account[column].isoformat()
+    return json.dumps(accounts)
+
+
+def stdlib_backend():
+    spec = importlib.util.spec_from_file_location('serialization_stdlib', serialization.__file__)
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, {'orjson': None}):
+        spec.loader.exec_module(module)
+    return module
+
+
+def bench(name, dumps, rows, repeats, mutates=False):
+    timings = []
+    for _ in range(repeats):
+        # The pre-pass rewrites rows in place, so it gets a fresh copy each run
+        accounts = [dict(row) for row in rows] if mutates else rows
+        start = time.perf_counter()
+        body = dumps(accounts)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'mode': name,
+        'median_ms': round(statistics.median(timings), 1),
+        'min_ms': round(min(timings), 1),
+        'output_bytes': len(body)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=100000)
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--timestamps', action='store_true', help='include datetime created_at/updated_at columns')
+    args = parser.parse_args()
+
+    rows = make_rows(args.accounts, args.timestamps)
+    results = [
+        bench('prepass', prepass_dumps, rows, args.repeats, mutates=True),
+        bench('json', stdlib_backend().dumps, rows, args.repeats)
+    ]
+    if serialization.BACKEND == 'orjson':
+        results.append(bench('orjson', serialization.dumps, rows, args.repeats))
+
+    baseline = results[0]['median_ms']
+    for result in results:
+        result['speedup'] = round(baseline / result['median_ms'], 2)
+    print(json.dumps({'accounts': args.accounts, 'timestamps': args.timestamps, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
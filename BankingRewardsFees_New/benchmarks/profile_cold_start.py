@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Cold-start profile of the Lambda handler modules. Each handler is loaded
+in a fresh interpreter, as in a new Lambda container, and the script reports:
+
+- the `python -X importtime` breakdown of the handler's import tree
+  (the slowest modules by cumulative time)
+- time to import the handler, to serve the first invocation (which opens
+  the database connection) and to serve a second, warm invocation, run
+  against the SQLite stand-in
+- whether mysql.connector was loaded by the import alone
+
+    python benchmarks/profile_cold_start.py
+    python benchmarks/profile_cold_start.py --top 15 --output cold_start.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+LAMBDA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+
+HANDLERS = {
+    'account_service': {'httpMethod': 'GET', 'pathParameters': {'account_id': '1'}, 'queryStringParameters': None, 'body': None},
+    'fee_calculation_service': {'httpMethod': 'POST', 'pathParameters': {'account_id': '1'}, 'queryStringParameters': None, 'body': None},
+    'rewards_calculation_service': {'httpMethod': 'POST', 'pathParameters': {'account_id': '1'}, 'queryStringParameters': None, 'body': None}
+}
+
+# Runs in the fresh interpreter: argv = module, event JSON, SQLite path
+COLD_START_SCRIPT = """
+import json, sys, time
+sys.path[:0] = [{lambda_dir!r}, {bench_dir!r}]
+module_name, event, db_path = sys.argv[1], json.loads(sys.argv[2]), sys.argv[3]
+# Harness imports first so they are not charged to the handler
+from unittest.mock import patch
+from sqlite_backend import make_connect
+
+start = time.perf_counter()
+module = __import__(module_name)
+imported = time.perf_counter()
+mysql_loaded = 'mysql.connector' in sys.modules
+
+with patch('mysql.connector.connect', make_connect(db_path)):
+    first = module.lambda_handler(event, None)
+    first_done = time.perf_counter()
+    second = module.lambda_handler(event, None)
+    second_done = time.perf_counter()
+
+print(json.dumps({{
+    'import_ms': round((imported - start) * 1000, 2),
+    'first_invocation_ms': round((first_done - imported) * 1000, 2),
+    'warm_invocation_ms': round((second_done - first_done) * 1000, 2),
+    'mysql_loaded_at_import': mysql_loaded,
+    'status_codes': [first['statusCode'], second['statusCode']]
+}}))
+""".format(lambda_dir=LAMBDA_DIR, bench_dir=BENCH_DIR)
+
+
+def parse_importtime(stderr, module_name):
+    """(name, self_us, cumulative_us) for each module in module_name's import tree"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+
+    # Children are printed before their parent, so the tree is the indented
+    # block directly above the module's own top-level line
+    end = max(i for i, row in enumerate(rows) if row[0].strip() == module_name and not row[0].startswith('  '))
+    start = end
+    while start > 0 and rows[start - 1][0].startswith('  '):
+        start -= 1
+    return [(name.strip(), self_us, cumulative_us) for name, self_us, cumulative_us in rows[start:end + 1]]
+
+
+def profile_imports(module_name, top=10):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module_name}"],
+        cwd=LAMBDA_DIR, capture_output=True, text=True, check=True
+    )
+    tree = parse_importtime(result.stderr, module_name)
+    total_us = tree[-1][2]
+    slowest = sorted(tree[:-1], key=lambda row: row[2], reverse=True)[:top]
+    return {
+        'total_ms': round(total_us / 1000, 2),
+        'slowest_modules': [
+            {'module': name, 'self_ms': round(self_us / 1000, 2), 'cumulative_ms': round(cumulative_us / 1000, 2)}
+            for name, self_us, cumulative_us in slowest
+        ]
+    }
+
+
+def cold_start(module_name, db_path, event=None):
+    """Import and invoke one handler in a fresh interpreter; returns its timings"""
+    event = event or HANDLERS[module_name]
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', COLD_START_SCRIPT, module_name, json.dumps(event), db_path],
+        capture_output=True, text=True, check=True
+    )
+    timings = json.loads(result.stdout)
+    timings['process_wall_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=10, help='slowest modules to list per handler')
+    parser.add_argument('--accounts', type=int, default=1000)
+    parser.add_argument('--output', help='write the profile JSON here')
+    args = parser.parse_args()
+
+    sys.path.append(BENCH_DIR)
+    import sqlite_backend
+
+    path = sqlite_backend.create_database(args.accounts)
+    try:
+        results = {
+            module_name: {'imports': profile_imports(module_name, args.top), 'cold_start': cold_start(module_name, path)}
+            for module_name in HANDLERS
+        }
+    finally:
+        os.remove(path)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+SQLite stand-in for the BankingRewardsFees_New MySQL database.
+
+Implements the slice of the mysql.connector API the Lambda handlers use
+(dictionary cursors, %s placeholders, NOW(), ping) so handlers can be
+benchmarked on one box without a MySQL server.
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+SCHEMA = """
+    CREATE TABLE Customers (
+        customer_id INTEGER PRIMARY KEY,
+        name VARCHAR(255),
+        tier VARCHAR(50),
+        created_at DATETIME,
+        updated_at DATETIME
+    );
+    CREATE TABLE Accounts (
+        account_id INTEGER PRIMARY KEY,
+        customer_id INT,
+        balance DECIMAL(10,2),
+        created_at DATETIME,
+        updated_at DATETIME,
+        FOREIGN KEY (customer_id) REFERENCES Customers(customer_id)
+    );
+"""
+
+# Database/Tables: the covering indexes the handler queries rely on
+INDEXES = """
+    CREATE INDEX idx_customers_name ON Customers (name, customer_id, tier);
+    CREATE INDEX idx_accounts_customer ON Accounts (customer_id, account_id, balance);
+"""
+
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'David', 'Erin', 'Frank', 'Grace', 'Heidi', 'Ivan', 'Judy']
+LAST_NAMES = ['Johnson', 'Smith', 'Davis', 'Miller', 'Garcia', 'Wilson', 'Moore', 'Taylor', 'Clark', 'Lewis']
+
+
+def _translate(query):
+    """Rewrite MySQL paramstyle to SQLite's."""
+    return query.replace('%s', '?')
+
+
+def _now():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class SQLiteCursor:
+    """Cursor returning dicts (dictionary=True) or tuples, like mysql.connector."""
+
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+        self.rowcount = -1
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def _convert(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip([col[0] for col in self._cursor.description], row))
+
+    def execute(self, query, params=()):
+        self._cursor.execute(_translate(query), tuple(params or ()))
+        self.rowcount = self._cursor.rowcount
+
+    def executemany(self, query, seq_params):
+        self._cursor.executemany(_translate(query), seq_params)
+        self.rowcount = self._cursor.rowcount
+
+    def fetchone(self):
+        return self._convert(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._convert(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._convert(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """
+    Connection wrapper with the mysql.connector methods the handlers call.
+    connect_latency simulates the TCP/TLS/auth handshake of a real server.
+    """
+
+    def __init__(self, database, connect_latency=0.0):
+        if connect_latency:
+            time.sleep(connect_latency)
+        self._conn = sqlite3.connect(database, check_same_thread=False, isolation_level=None)
+        self._conn.create_function('NOW', 0, _now)
+        self._open = True
+
+    def cursor(self, dictionary=False, buffered=False, **kwargs):
+        return SQLiteCursor(self._conn, dictionary=dictionary)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        if not self._open:
+            raise sqlite3.InterfaceError('Connection is closed')
+
+    def is_connected(self):
+        return self._open
+
+    def close(self):
+        self._open = False
+        self._conn.close()
+
+
+def make_connect(database, connect_latency=0.0):
+    """Return a drop-in replacement for mysql.connector.connect."""
+    def connect(**kwargs):
+        return SQLiteConnection(database, connect_latency=connect_latency)
+    return connect
+
+
+def create_database(num_accounts, path=None, seed=42, batch_size=10000, indexes=True):
+    """
+    Create and seed a database file with num_accounts accounts.
+    Roughly one customer per two accounts, 20% of customers premium.
+    indexes=False leaves out INDEXES, as before the index migration.
+    Returns the database path.
+    """
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix='.db', prefix='banking_')
+        os.close(fd)
+        os.remove(path)
+
+    rng = random.Random(seed)
+    num_customers = max(1, num_accounts // 2)
+    timestamp = '2023-01-01 00:00:00'
+
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+
+    customers = (
+        (customer_id,
+         f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {customer_id}",
+         'premium' if rng.random() < 0.2 else 'standard',
+         timestamp, timestamp)
+        for customer_id in range(1, num_customers + 1)
+    )
+    _insert_batches(conn, "INSERT INTO Customers VALUES (?, ?, ?, ?, ?)", customers, batch_size)
+
+    accounts = (
+        (account_id, rng.randint(1, num_customers), round(rng.uniform(0, 20000), 2), timestamp, timestamp)
+        for account_id in range(1, num_accounts + 1)
+    )
+    _insert_batches(conn, "INSERT INTO Accounts VALUES (?, ?, ?, ?, ?)", accounts, batch_size)
+    if indexes:
+        conn.executescript(INDEXES)
+
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _insert_batches(conn, query, rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            conn.executemany(query, batch)
+            batch = []
+    if batch:
+        conn.executemany(query, batch)
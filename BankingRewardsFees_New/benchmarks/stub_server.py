@@ -0,0 +1,178 @@
+"""
+Local HTTP stub of the three API Gateway services.
+
+Answers /Account_Service[/id], /Fee_Calculation_Service/id and
+/Rewards_Calculation_Service/id with responses shaped like the Lambda
+handlers', from an in-memory book, so HTTP clients can be measured on one
+box. Speaks HTTP/1.1 keep-alive and counts the TCP connections it accepts.
+
+    python benchmarks/stub_server.py --port 8090 --latency-ms 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+from business_rules import calculate_fee, calculate_reward
+
+SERVICES = ('Account_Service', 'Fee_Calculation_Service', 'Rewards_Calculation_Service')
+
+
+def make_accounts(num_accounts):
+    return {
+        account_id: {
+            'account_id': account_id,
+            'balance': float(account_id * 37 % 20000),
+            'customer_id': (account_id + 1) // 2,
+            'customer_name': f"Customer {(account_id + 1) // 2:07d}",
+            'customer_tier': 'premium' if account_id % 5 == 0 else 'standard'
+        }
+        for account_id in range(1, num_accounts + 1)
+    }
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, num_accounts=100, latency=0.0):
+        super().__init__(address, StubHandler)
+        self.accounts = make_accounts(num_accounts)
+        self.latency = latency
+        # Respond 503 to this many requests before answering normally
+        self.fail_next = 0
+        self.connections = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, service):
+        return f"{self.base_url}/{service}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY a
+    # kept-alive connection stalls on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def send_json(self, status_code, body):
+        data = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def handle_request(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'null')
+
+        with self.server.lock:
+            self.server.requests += 1
+            fail = self.server.fail_next > 0
+            if fail:
+                self.server.fail_next -= 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if fail:
+            self.send_json(503, {'error': 'Service unavailable'})
+            return
+
+        path, _, query = self.path.partition('?')
+        parts = path.strip('/').split('/')
+        service = parts[-2] if len(parts) >= 2 and parts[-2] in SERVICES else parts[-1]
+        account_id = parts[-1] if service != parts[-1] else None
+        if service not in SERVICES:
+            self.send_json(404, {'error': 'Not found'})
+            return
+        if self.command == 'OPTIONS':
+            self.send_json(200, {})
+            return
+
+        account = self.server.accounts.get(int(account_id)) if account_id and account_id.isdigit() else None
+        if account_id is not None and account is None:
+            self.send_json(404, {'error': 'Account not found'})
+            return
+
+        if service == 'Account_Service':
+            if self.command == 'GET' and account is None:
+                self.send_json(200, list(self.server.accounts.values()))
+            elif self.command == 'GET' and 'view=summary' in query:
+                self.send_json(200, {'account': account, 'fee': self.fee(account), 'rewards': self.rewards(account)})
+            elif self.command == 'GET':
+                self.send_json(200, account)
+            elif self.command == 'PUT' and account is not None:
+                account['balance'] = float(body['balance'])
+                self.send_json(200, {'message': 'Balance updated successfully', 'account_id': account['account_id'],
+                                     'new_balance': account['balance']})
+            else:
+                self.send_json(405, {'error': 'Method not allowed'})
+        elif self.command == 'POST' and account is not None:
+            self.send_json(200, self.fee(account) if service == 'Fee_Calculation_Service' else self.rewards(account))
+        else:
+            self.send_json(400, {'error': 'Account ID is required'})
+
+    def fee(self, account):
+        return {
+            'account_id': account['account_id'],
+            'customer_tier': account['customer_tier'],
+            'balance': account['balance'],
+            'calculated_fee': calculate_fee(account['customer_tier'], account['balance']),
+            'calculation_timestamp': 'stub'
+        }
+
+    def rewards(self, account):
+        reward_rate, calculated_reward = calculate_reward(account['balance'])
+        return {
+            'account_id': account['account_id'],
+            'balance': account['balance'],
+            'reward_rate': reward_rate,
+            'calculated_reward': calculated_reward,
+            'calculation_timestamp': 'stub'
+        }
+
+    do_GET = do_PUT = do_POST = do_OPTIONS = handle_request
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(num_accounts=100, latency=0.0, port=0, host='127.0.0.1'):
+    """Serve the stub on a background thread; call shutdown() when done."""
+    server = StubServer((host, port), num_accounts, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--accounts', type=int, default=100)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubServer(('127.0.0.1', args.port), args.accounts, args.latency_ms / 1000)
+    print(f"Serving {', '.join(server.url(s) for s in SERVICES)}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,32 @@
 #!/usr/bin/env python3
 """
 Debug script to test Lambda API endpoints
+
+    python debug_api.py                     # one request per endpoint, raw responses
+    python debug_api.py --load --base-url http://127.0.0.1:8000 --concurrency 32 --duration 30
+
+The load mode drives a weighted mix of list, detail, put, fee and reward
+requests from --concurrency threads and reports p50/p95/p99 latency, error
+rate and throughput per endpoint. PUT writes random balances, so it is off
+in the default mix; enable it with e.g. --mix detail=10,put=1.
 """
 
-import requests
+import argparse
 import json
+import random
+import threading
+import time
+
+from banking_client import BankingClient, BankingAPIError
+
+# Shared keep-alive client; URLs come from the *_URL environment variables.
+# No retries, so a transient 5xx shows up instead of being retried away.
+client = BankingClient.from_env(retries=0)
 
 # API URLs
-ACCOUNT_SERVICE_URL = "https://ule48xqcya.execute-api.us-west-2.amazonaws.com/default/Account_Service"
-FEE_CALCULATION_URL = "https://hsa8bd8loc.execute-api.us-west-2.amazonaws.com/default/Fee_Calculation_Service"
-REWARDS_CALCULATION_URL = "https://1gqnjvxjdl.execute-api.us-west-2.amazonaws.com/default/Rewards_Calculation_Service"
+ACCOUNT_SERVICE_URL = client.urls['account']
+FEE_CALCULATION_URL = client.urls['fee']
+REWARDS_CALCULATION_URL = client.urls['rewards']
 
 def test_account_service():
     """Test Account Service endpoints"""
@@ -21,7 +38,7 @@ def test_account_service():
     print("\n1. Testing GET all accounts:")
     print(f"URL: {ACCOUNT_SERVICE_URL}")
     try:
-        response = requests.get(ACCOUNT_SERVICE_URL, timeout=10)
+        response = client.request('account', 'GET')
         print(f"Status Code: {response.status_code}")
         print(f"Response Headers: {dict(response.headers)}")
         if response.status_code == 200:
@@ -36,7 +53,7 @@ def test_account_service():
     print("\n2. Testing GET specific account (ID: 1):")
     print(f"URL: {ACCOUNT_SERVICE_URL}/1")
     try:
-        response = requests.get(f"{ACCOUNT_SERVICE_URL}/1", timeout=10)
+        response = client.request('account', 'GET', 1)
         print(f"Status Code: {response.status_code}")
         print(f"Response Headers: {dict(response.headers)}")
         if response.status_code == 200:
@@ -57,12 +74,7 @@ def test_fee_calculation_service():
     print(f"URL: {FEE_CALCULATION_URL}/1")
     try:
         payload = {"account_id": 1}
-        response = requests.post(
-            f"{FEE_CALCULATION_URL}/1",
-            json=payload,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
+        response = client.request('fee', 'POST', 1, json=payload)
         print(f"Status Code: {response.status_code}")
         print(f"Response Headers: {dict(response.headers)}")
         if response.status_code == 200:
@@ -83,12 +95,7 @@ def test_rewards_calculation_service():
     print(f"URL: {REWARDS_CALCULATION_URL}/1")
     try:
         payload = {"account_id": 1}
-        response = requests.post(
-            f"{REWARDS_CALCULATION_URL}/1",
-            json=payload,
-            headers={'Content-Type': 'application/json'},
-            timeout=10
-        )
+        response = client.request('rewards', 'POST', 1, json=payload)
         print(f"Status Code: {response.status_code}")
         print(f"Response Headers: {dict(response.headers)}")
         if response.status_code == 200:
@@ -105,20 +112,169 @@ def test_api_gateway_options():
     print("TESTING API GATEWAY CORS")
     print("=" * 60)
     
-    for service_name, url in [
-        ("Account Service", ACCOUNT_SERVICE_URL),
-        ("Fee Calculation", FEE_CALCULATION_URL),
-        ("Rewards Calculation", REWARDS_CALCULATION_URL)
+    for service_name, service in [
+        ("Account Service", 'account'),
+        ("Fee Calculation", 'fee'),
+        ("Rewards Calculation", 'rewards')
     ]:
         print(f"\nTesting OPTIONS for {service_name}:")
         try:
-            response = requests.options(url, timeout=10)
+            response = client.request(service, 'OPTIONS')
             print(f"Status Code: {response.status_code}")
             print(f"CORS Headers: {dict(response.headers)}")
         except Exception as e:
             print(f"Exception: {str(e)}")
 
+# ---- Load Testing ----
+DEFAULT_MIX = 'list=1,detail=10,fee=5,reward=5'
+
+LOAD_ENDPOINTS = {
+    'list': lambda client, account_id, rng: client.get_accounts(),
+    'detail': lambda client, account_id, rng: client.get_account_details(account_id),
+    'put': lambda client, account_id, rng: client.update_account_balance(account_id, round(rng.uniform(0, 20000), 2)),
+    'fee': lambda client, account_id, rng: client.calculate_fees(account_id),
+    'reward': lambda client, account_id, rng: client.calculate_rewards(account_id)
+}
+
+def parse_mix(text):
+    """'detail=10,fee=5' -> {'detail': 10.0, 'fee': 5.0}"""
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in LOAD_ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(LOAD_ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("Request mix needs at least one positive weight")
+    return mix
+
+def summarize_load(samples, elapsed):
+    """Latency percentiles, error rate and throughput for (latency_ms, ok) samples"""
+    latencies = sorted(latency for latency, ok in samples)
+    errors = sum(1 for latency, ok in samples if not ok)
+    percentile = lambda fraction: round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))], 3)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4),
+        'throughput_per_s': round(len(samples) / elapsed, 1),
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'max_ms': round(latencies[-1], 3)
+    }
+
+def run_load(client, mix, concurrency=8, duration=None, total_requests=None, num_accounts=100,
+             ramp_up=0.0, seed=7):
+    """
+    Drive the request mix from `concurrency` threads until `duration`
+    seconds pass or `total_requests` are sent. With `ramp_up` the threads
+    start evenly spread over that many seconds. Failed requests (non-200,
+    transport errors or any other exception) count as errors and are timed
+    like the rest.
+    """
+    if duration is None and total_requests is None:
+        raise ValueError("Set a duration or a total number of requests")
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = {name: [] for name in names}
+    status_codes = {}
+    lock = threading.Lock()
+    sent = [0]
+    started = time.perf_counter()
+    deadline = started + duration if duration is not None else None
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        if ramp_up:
+            time.sleep(ramp_up * index / concurrency)
+        while True:
+            with lock:
+                if total_requests is not None and sent[0] >= total_requests:
+                    return
+                sent[0] += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            name = rng.choices(names, weights)[0]
+            account_id = rng.randint(1, num_accounts)
+            start = time.perf_counter()
+            try:
+                LOAD_ENDPOINTS[name](client, account_id, rng)
+                ok, status = True, 200
+            except BankingAPIError as e:
+                ok, status = False, e.status_code
+            except Exception as e:
+                # Transport errors, bad JSON, ...: recorded, and the worker keeps going
+                ok, status = False, type(e).__name__
+            latency = (time.perf_counter() - start) * 1000
+            with lock:
+                samples[name].append((latency, ok))
+                status_codes[status] = status_codes.get(status, 0) + 1
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    all_samples = [sample for name in names for sample in samples[name]]
+    if not all_samples:
+        raise RuntimeError("No requests were sent")
+    return {
+        'concurrency': concurrency,
+        'ramp_up_seconds': ramp_up,
+        'elapsed_seconds': round(elapsed, 2),
+        'status_codes': {str(code): count for code, count in status_codes.items()},
+        'overall': summarize_load(all_samples, elapsed),
+        'endpoints': {name: summarize_load(samples[name], elapsed) for name in names if samples[name]}
+    }
+
+def print_load_report(results):
+    print(f"{'endpoint':<10}{'requests':>10}{'errors':>8}{'err %':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(results['endpoints'].items()) + [('overall', results['overall'])]
+    for name, stats in rows:
+        print(f"{name:<10}{stats['requests']:>10}{stats['errors']:>8}{stats['error_rate'] * 100:>8.2f}"
+              f"{stats['throughput_per_s']:>10.1f}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+    print(f"status codes: {results['status_codes']}  elapsed: {results['elapsed_seconds']}s")
+
+def main_load(args):
+    if args.base_url:
+        base = args.base_url.rstrip('/')
+        urls = [f"{base}/Account_Service", f"{base}/Fee_Calculation_Service", f"{base}/Rewards_Calculation_Service"]
+    else:
+        urls = [ACCOUNT_SERVICE_URL, FEE_CALCULATION_URL, REWARDS_CALCULATION_URL]
+    # No retries: the load test should see every failure
+    with BankingClient(*urls, pool_size=args.concurrency, retries=0) as load_client:
+        results = run_load(
+            load_client, parse_mix(args.mix), concurrency=args.concurrency,
+            duration=args.duration if args.requests is None else None, total_requests=args.requests,
+            num_accounts=args.accounts, ramp_up=args.ramp_up
+        )
+    results['target'] = urls[0].rsplit('/', 1)[0]
+    print_load_report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--load', action='store_true', help='run the load generator instead of the debug requests')
+    parser.add_argument('--base-url', help='API base URL, e.g. a local gateway or stub (default: *_URL env vars)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds to run')
+    parser.add_argument('--requests', type=int, help='stop after this many requests instead of --duration')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"endpoint weights (default {DEFAULT_MIX})")
+    parser.add_argument('--accounts', type=int, default=100, help='pick account ids from 1..N')
+    parser.add_argument('--ramp-up', type=float, default=0.0, help='seconds over which the threads start')
+    parser.add_argument('--output', help='write the load results JSON here')
+    args = parser.parse_args()
+
+    if args.load:
+        main_load(args)
+        raise SystemExit(0)
+
     print("LAMBDA API DEBUGGING TOOL")
     print("=" * 60)
     
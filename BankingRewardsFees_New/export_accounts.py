@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Streaming NDJSON export of the full account list
+
+Writes one JSON object per account, chunk by chunk, either to a file or
+to HTTP clients of a small local server using chunked transfer encoding.
+Peak memory is one fetchmany() chunk regardless of the number of accounts.
+
+    python export_accounts.py --output accounts.ndjson
+    python export_accounts.py --serve 8081     # GET http://localhost:8081/accounts.ndjson
+"""
+
+import argparse
+import os
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'lambda_functions'))
+
+from account_service import EXPORT_CHUNK_SIZE, iter_accounts_ndjson
+
+
+def export_to_file(connect, path, chunk_size=EXPORT_CHUNK_SIZE):
+    """Write the NDJSON export to path ('-' for stdout); returns bytes written."""
+    conn = connect()
+    out = sys.stdout.buffer if path == '-' else open(path, 'wb')
+    written = 0
+    try:
+        for chunk in iter_accounts_ndjson(conn, chunk_size):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        conn.close()
+    return written
+
+
+def make_server(connect, port, chunk_size=EXPORT_CHUNK_SIZE, host='127.0.0.1'):
+    """HTTP server streaming the export at /accounts.ndjson, one connection per request."""
+
+    class ExportHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.path.split('?')[0] != '/accounts.ndjson':
+                self.send_error(404)
+                return
+
+            conn = connect()
+            try:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for chunk in iter_accounts_ndjson(conn, chunk_size):
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                self.wfile.write(b'0\r\n\r\n')
+            finally:
+                conn.close()
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), ExportHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--output', help="NDJSON file to write, '-' for stdout")
+    target.add_argument('--serve', type=int, metavar='PORT', help='serve the export over HTTP')
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+    parser.add_argument('--sqlite', help='read from a local SQLite stand-in instead of MySQL')
+    args = parser.parse_args()
+
+    if args.sqlite:
+        sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+        from sqlite_backend import SQLiteConnection
+        connect = lambda: SQLiteConnection(args.sqlite)
+    else:
+        import mysql.connector
+        from db_connection import get_db_config
+        connect = lambda: mysql.connector.connect(**get_db_config())
+
+    if args.output:
+        written = export_to_file(connect, args.output, args.chunk_size)
+        print(f"Wrote {written} bytes to {args.output}", file=sys.stderr)
+    else:
+        server = make_server(connect, args.serve, args.chunk_size)
+        print(f"Serving http://127.0.0.1:{args.serve}/accounts.ndjson", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()
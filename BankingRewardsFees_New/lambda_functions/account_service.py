@@ -1,22 +1,269 @@
+import base64
+import binascii
 import json
-import mysql.connector
 import os
-from decimal import Decimal
+from db_connection import get_connection, reset_connection
+from business_rules import calculate_fee, calculate_reward
+from ttl_cache import TTLCache, MISS
+from metrics import instrumented, mark
+from serialization import dumps_bytes, json_response, loads
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Rows per fetchmany() when streaming the full account list
+EXPORT_CHUNK_SIZE = 5000
+
+# Read-through cache for account details, the list and list pages. It lives
+# as long as the container; a PUT evicts what it changed in this container,
+# other containers see the new balance once their entries expire.
+ACCOUNT_CACHE = TTLCache(
+    maxsize=int(os.environ.get('ACCOUNT_CACHE_SIZE', '1024')),
+    ttl=float(os.environ.get('ACCOUNT_CACHE_TTL', '30'))
+)
+
+# Keyset pagination walks (name, customer_id, account_id): the order an index
+# scan of Customers(name) joined to Accounts(customer_id) produces, so every
+# page is an index range read that stops after LIMIT rows.
+PAGE_QUERY = """
+    SELECT a.account_id, a.balance, c.customer_id, c.name as customer_name, c.tier as customer_tier
+    FROM Accounts a
+    JOIN Customers c ON a.customer_id = c.customer_id
+    {where}
+    ORDER BY c.name, c.customer_id, a.account_id
+    LIMIT %s
+"""
+
+# The leading c.name >= %s gives the optimizer an index range to start from
+PAGE_AFTER = """
+    WHERE c.name >= %s
+      AND (c.name > %s OR c.customer_id > %s OR (c.customer_id = %s AND a.account_id > %s))
+"""
+
+# Customers.name is nullable and NULLs sort first in MySQL (and SQLite), so a
+# page that ends on a NULL name continues through the rest of the NULL names
+# and then every named customer; c.name >= %s never matches a NULL.
+PAGE_AFTER_NULL_NAME = """
+    WHERE c.name IS NOT NULL
+       OR (c.name IS NULL AND (c.customer_id > %s OR (c.customer_id = %s AND a.account_id > %s)))
+"""
+
+DETAIL_QUERY = """
+    SELECT a.account_id, a.balance, a.created_at, a.updated_at,
+           c.customer_id, c.name as customer_name, c.tier as customer_tier
+    FROM Accounts a
+    JOIN Customers c ON a.customer_id = c.customer_id
+    WHERE a.account_id = %s
+"""
+
+LIST_QUERY = """
+    SELECT a.account_id, a.balance, c.name as customer_name, c.tier as customer_tier
+    FROM Accounts a
+    JOIN Customers c ON a.customer_id = c.customer_id
+    ORDER BY c.name
+"""
+
+# Same order as the pages, so the export needs no sort either
+EXPORT_QUERY = """
+    SELECT a.account_id, a.balance, c.customer_id, c.name as customer_name, c.tier as customer_tier
+    FROM Accounts a
+    JOIN Customers c ON a.customer_id = c.customer_id
+    ORDER BY c.name, c.customer_id, a.account_id
+"""
+
+def encode_cursor(account):
+    """Opaque next-page token for the last account on a page"""
+    key = [account['customer_name'], account['customer_id'], account['account_id']]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def decode_cursor(token):
+    """
+    Inverse of encode_cursor; raises ValueError for a malformed token.
+    The name stays None for a customer without one.
+    """
+    try:
+        name, customer_id, account_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+        if name is not None and not isinstance(name, str):
+            raise ValueError('Invalid cursor')
+        return name, int(customer_id), int(account_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError('Invalid cursor')
+
+def parse_page_parameters(query_parameters):
+    """Return (limit, after_key) from the limit/cursor query parameters"""
+    try:
+        limit = int(query_parameters.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_PAGE_SIZE}')
+    
+    token = query_parameters.get('cursor')
+    return limit, decode_cursor(token) if token else None
+
+def fetch_accounts_page(cursor, limit, after=None):
+    """
+    Fetch one page of the account list in name order.
+    Returns (accounts, next_cursor); next_cursor is None on the last page.
+    """
+    if after:
+        name, customer_id, account_id = after
+        if name is None:
+            cursor.execute(
+                PAGE_QUERY.format(where=PAGE_AFTER_NULL_NAME),
+                (customer_id, customer_id, account_id, limit + 1)
+            )
+        else:
+            cursor.execute(
+                PAGE_QUERY.format(where=PAGE_AFTER),
+                (name, name, customer_id, customer_id, account_id, limit + 1)
+            )
+    else:
+        cursor.execute(PAGE_QUERY.format(where=''), (limit + 1,))
+    accounts = cursor.fetchall()
+    mark('query')
+    
+    # One extra row tells us whether another page exists
+    next_cursor = None
+    if len(accounts) > limit:
+        accounts = accounts[:limit]
+        next_cursor = encode_cursor(accounts[-1])
+    
+    return accounts, next_cursor
+
+def query_account(account_id):
+    """Account details with customer info, or None"""
+    conn = get_connection()
+    mark('connect')
+    cursor = conn.cursor(dictionary=True, buffered=True)
+    try:
+        cursor.execute(DETAIL_QUERY, (account_id,))
+        account = cursor.fetchone()
+    finally:
+        cursor.close()
+    mark('query')
+    return account
+
+def query_all_accounts():
+    """Every account with customer info, in name order"""
+    conn = get_connection()
+    mark('connect')
+    cursor = conn.cursor(dictionary=True, buffered=True)
+    try:
+        cursor.execute(LIST_QUERY)
+        accounts = cursor.fetchall()
+    finally:
+        cursor.close()
+    mark('query')
+    return accounts
+
+def query_accounts_page(limit, after):
+    conn = get_connection()
+    mark('connect')
+    cursor = conn.cursor(dictionary=True, buffered=True)
+    try:
+        return fetch_accounts_page(cursor, limit, after)
+    finally:
+        cursor.close()
+
+def cache_key(account_id):
+    """Normalise an account id so '7' and 7 share a cache entry"""
+    try:
+        return int(account_id)
+    except (TypeError, ValueError):
+        return str(account_id)
+
+def cached_read(key, load):
+    """
+    Read-through lookup in ACCOUNT_CACHE; load() runs on a miss.
+    Returns (value, cache_hit). Empty results (unknown accounts) are not cached.
+    """
+    value = ACCOUNT_CACHE.get(key)
+    mark('cache')
+    if value is not MISS:
+        return value, True
+    
+    generation = ACCOUNT_CACHE.generation
+    value = load()
+    if value:
+        ACCOUNT_CACHE.set(key, value, generation)
+    return value, False
+
+def invalidate_account(account_id):
+    """Evict an updated account and every cached list or page that may show it"""
+    account_key = cache_key(account_id)
+    ACCOUNT_CACHE.invalidate(lambda key: key[0] != 'account' or key[1] == account_key)
+
+def build_account_summary(account, context):
+    """
+    Account details plus the monthly fee and reward, in the same shapes the
+    Fee and Rewards Calculation Services return, from one account row.
+    """
+    # Rows keep the driver's Decimal; the rules work in float
+    balance = float(account['balance'] or 0)
+    reward_rate, calculated_reward = calculate_reward(balance)
+    calculation_timestamp = str(context.aws_request_id) if context else 'local'
+    return {
+        'account': account,
+        'fee': {
+            'account_id': account['account_id'],
+            'customer_tier': account['customer_tier'],
+            'balance': balance,
+            'calculated_fee': calculate_fee(account['customer_tier'], balance),
+            'calculation_timestamp': calculation_timestamp
+        },
+        'rewards': {
+            'account_id': account['account_id'],
+            'balance': balance,
+            'reward_rate': reward_rate,
+            'calculated_reward': calculated_reward,
+            'calculation_timestamp': calculation_timestamp
+        }
+    }
+
+def iter_accounts_ndjson(conn, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream the full account list as newline-delimited JSON.
+    Rows are read from an unbuffered cursor with fetchmany() and yielded as
+    one bytes chunk per fetch, so memory use does not grow with the book.
+    Use a dedicated connection: the cursor must be drained before the
+    connection can run another query.
+    """
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(EXPORT_QUERY)
+        columns = [column[0] for column in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            lines = [dumps_bytes(dict(zip(columns, row))) for row in rows]
+            lines.append(b'')
+            yield b'\n'.join(lines)
+    finally:
+        cursor.close()
+
+@instrumented('account_service')
 def lambda_handler(event, context):
     """
     Account Service Lambda Function
     Handles account operations: get accounts, get account details, update balance
-    """
     
-    # Database connection
-    def get_connection():
-        return mysql.connector.connect(
-            host=os.environ.get('DB_HOST', 'database-2.crq7shsasjo0.us-west-2.rds.amazonaws.com'),
-            user=os.environ.get('DB_USER', 'admin'),
-            password=os.environ.get('DB_PASSWORD', 'demo1234!'),
-            database=os.environ.get('DB_NAME', 'BankingRewardsFees_New')
-        )
+    GET without an account_id returns every account as a JSON array. Passing
+    "limit" and/or "cursor" query parameters returns one page instead:
+    {"accounts": [...], "next_cursor": "..."}; pass next_cursor back as
+    "cursor" to get the following page (null on the last page).
+    
+    GET /{account_id}?view=summary returns {"account", "fee", "rewards"}:
+    details, fee and reward from a single query.
+    
+    GET reads go through ACCOUNT_CACHE (X-Cache: HIT/MISS header); a PUT
+    evicts the account and all cached lists. GET /?view=cache_stats returns
+    the cache counters.
+    
+    With HANDLER_METRICS set, each invocation prints one EMF metrics line
+    with the time spent parsing, connecting, querying and serialising.
+    """
     
     try:
         # Parse the request
@@ -26,71 +273,53 @@ def lambda_handler(event, context):
         body = event.get('body')
         
         if body:
-            body = json.loads(body)
-        
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
+            body = loads(body)
+        mark('parse')
         
         if http_method == 'GET':
             if 'account_id' in path_parameters:
                 # Get specific account details with customer info
                 account_id = path_parameters['account_id']
-                query = """
-                    SELECT a.account_id, a.balance, a.created_at, a.updated_at,
-                           c.customer_id, c.name as customer_name, c.tier as customer_tier
-                    FROM Accounts a
-                    JOIN Customers c ON a.customer_id = c.customer_id
-                    WHERE a.account_id = %s
-                """
-                cursor.execute(query, (account_id,))
-                account = cursor.fetchone()
+                account, cache_hit = cached_read(
+                    ('account', cache_key(account_id)),
+                    lambda: query_account(account_id)
+                )
                 
                 if account:
-                    # Convert Decimal to float for JSON serialization
-                    if account['balance']:
-                        account['balance'] = float(account['balance'])
+                    if query_parameters.get('view') == 'summary':
+                        result = build_account_summary(account, context)
+                        mark('compute')
+                    else:
+                        result = account
                     
-                    response = {
-                        'statusCode': 200,
-                        'headers': {
-                            'Content-Type': 'application/json',
-                            'Access-Control-Allow-Origin': '*'
-                        },
-                        'body': json.dumps(account)
-                    }
+                    response = json_response(200, result)
+                else:
+                    response = json_response(404, {'error': 'Account not found'})
+            elif query_parameters.get('view') == 'cache_stats':
+                # Hit/miss/eviction counters of this container's cache
+                cache_hit = None
+                response = json_response(200, ACCOUNT_CACHE.stats())
+            elif 'limit' in query_parameters or 'cursor' in query_parameters:
+                # Get one keyset-paginated page of accounts
+                try:
+                    limit, after = parse_page_parameters(query_parameters)
+                except ValueError as e:
+                    cache_hit = None
+                    response = json_response(400, {'error': str(e)})
                 else:
-                    response = {
-                        'statusCode': 404,
-                        'headers': {
-                            'Content-Type': 'application/json',
-                            'Access-Control-Allow-Origin': '*'
-                        },
-                        'body': json.dumps({'error': 'Account not found'})
-                    }
+                    (accounts, next_cursor), cache_hit = cached_read(
+                        ('page', limit, after),
+                        lambda: query_accounts_page(limit, after)
+                    )
+                    response = json_response(200, {'accounts': accounts, 'next_cursor': next_cursor})
             else:
                 # Get all accounts with customer info
-                query = """
-                    SELECT a.account_id, a.balance, c.name as customer_name, c.tier as customer_tier
-                    FROM Accounts a
-                    JOIN Customers c ON a.customer_id = c.customer_id
-                    ORDER BY c.name
-                """
-                cursor.execute(query)
-                accounts = cursor.fetchall()
+                accounts, cache_hit = cached_read(('list',), query_all_accounts)
                 
-                # Convert Decimal to float for JSON serialization
-                for account in accounts:
-                    if account['balance']:
-                        account['balance'] = float(account['balance'])
-                
-                response = {
-                    'statusCode': 200,
-                    'headers': {
-                        'Content-Type': 'application/json',
-                        'Access-Control-Allow-Origin': '*'
-                    },
-                    'body': json.dumps(accounts)
-                }
+                response = json_response(200, accounts)
+            
+            if cache_hit is not None:
+                response['headers']['X-Cache'] = 'HIT' if cache_hit else 'MISS'
         
         elif http_method == 'PUT':
             # Update account balance
@@ -98,64 +327,35 @@ def lambda_handler(event, context):
             new_balance = body.get('balance')
             
             if not account_id or new_balance is None:
-                response = {
-                    'statusCode': 400,
-                    'headers': {
-                        'Content-Type': 'application/json',
-                        'Access-Control-Allow-Origin': '*'
-                    },
-                    'body': json.dumps({'error': 'Missing account_id or balance'})
-                }
+                response = json_response(400, {'error': 'Missing account_id or balance'})
             else:
+                conn = get_connection()
+                mark('connect')
+                cursor = conn.cursor(dictionary=True, buffered=True)
                 cursor.execute(
                     "UPDATE Accounts SET balance = %s, updated_at = NOW() WHERE account_id = %s",
                     (new_balance, account_id)
                 )
                 conn.commit()
+                mark('query')
+                invalidate_account(account_id)
+                mark('cache')
                 
                 if cursor.rowcount > 0:
-                    response = {
-                        'statusCode': 200,
-                        'headers': {
-                            'Content-Type': 'application/json',
-                            'Access-Control-Allow-Origin': '*'
-                        },
-                        'body': json.dumps({'message': 'Balance updated successfully'})
-                    }
+                    response = json_response(200, {'message': 'Balance updated successfully'})
                 else:
-                    response = {
-                        'statusCode': 404,
-                        'headers': {
-                            'Content-Type': 'application/json',
-                            'Access-Control-Allow-Origin': '*'
-                        },
-                        'body': json.dumps({'error': 'Account not found'})
-                    }
+                    response = json_response(404, {'error': 'Account not found'})
         
         else:
-            response = {
-                'statusCode': 405,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({'error': 'Method not allowed'})
-            }
+            response = json_response(405, {'error': 'Method not allowed'})
     
     except Exception as e:
-        response = {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        # The session may be mid-statement or broken; reconnect next time
+        reset_connection()
+        response = json_response(500, {'error': str(e)})
     
     finally:
         if 'cursor' in locals():
             cursor.close()
-        if 'conn' in locals():
-            conn.close()
     
     return response
\ No newline at end of file
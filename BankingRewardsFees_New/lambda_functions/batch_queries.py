@@ -0,0 +1,87 @@
+import os
+
+# Upper bound on accounts per batch request, keeps responses under the 6 MB Lambda limit
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', '5000'))
+
+# Account ids per IN (...) query
+QUERY_CHUNK_SIZE = int(os.environ.get('QUERY_CHUNK_SIZE', '1000'))
+
+
+def is_batch_request(body):
+    """True if the request body selects several accounts."""
+    return isinstance(body, dict) and ('account_ids' in body or 'account_id_range' in body)
+
+
+def _account_id(value):
+    """
+    An id from a JSON body: an integer, or a string of one. int() alone
+    would also take 1.5 (truncated) and true (as 1).
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f'{value!r} is not an integer')
+    return int(value)
+
+
+def parse_account_selection(body):
+    """
+    Read the accounts a batch request targets.
+    Accepts {"account_ids": [1, 2, 3]} or {"account_id_range": {"start": 1, "end": 500}}
+    (inclusive). Returns (account_ids, id_range); exactly one of them is set.
+    Raises ValueError with a client-facing message for invalid input.
+    """
+    if 'account_ids' in body:
+        account_ids = body['account_ids']
+        if not isinstance(account_ids, list) or not account_ids:
+            raise ValueError('account_ids must be a non-empty list')
+        try:
+            # Keep request order, drop duplicates
+            account_ids = list(dict.fromkeys(_account_id(account_id) for account_id in account_ids))
+        except ValueError:
+            raise ValueError('account_ids must contain integers')
+        if len(account_ids) > MAX_BATCH_SIZE:
+            raise ValueError(f'At most {MAX_BATCH_SIZE} accounts per request')
+        return account_ids, None
+
+    id_range = body['account_id_range']
+    try:
+        start = _account_id(id_range['start'])
+        end = _account_id(id_range['end'])
+    except (TypeError, KeyError, ValueError):
+        raise ValueError('account_id_range must have integer start and end')
+    if end < start:
+        raise ValueError('account_id_range end must not be before start')
+    if end - start + 1 > MAX_BATCH_SIZE:
+        raise ValueError(f'At most {MAX_BATCH_SIZE} accounts per request')
+    return None, (start, end)
+
+
+def missing_account_ids(found_ids, account_ids=None, id_range=None):
+    """Requested ids with no account, in request order (id order for a range)"""
+    found_ids = set(found_ids)
+    requested = account_ids if id_range is None else range(id_range[0], id_range[1] + 1)
+    return [account_id for account_id in requested if account_id not in found_ids]
+
+
+def requested_count(account_ids=None, id_range=None):
+    """Number of ids a batch selection names"""
+    return len(account_ids) if id_range is None else id_range[1] - id_range[0] + 1
+
+
+def fetch_accounts(cursor, base_query, account_ids=None, id_range=None, chunk_size=None):
+    """
+    Yield the rows of base_query for a set of accounts with set-based queries.
+    base_query is a SELECT over `Accounts a` without a WHERE clause. Id lists
+    are sent as IN (...) queries of at most chunk_size ids (default
+    QUERY_CHUNK_SIZE), ranges as one BETWEEN query.
+    """
+    chunk_size = chunk_size or QUERY_CHUNK_SIZE
+    if id_range is not None:
+        cursor.execute(base_query + " WHERE a.account_id BETWEEN %s AND %s ORDER BY a.account_id", id_range)
+        yield from cursor.fetchall()
+        return
+
+    for i in range(0, len(account_ids), chunk_size):
+        chunk = account_ids[i:i + chunk_size]
+        placeholders = ', '.join(['%s'] * len(chunk))
+        cursor.execute(base_query + f" WHERE a.account_id IN ({placeholders})", tuple(chunk))
+        yield from cursor.fetchall()
@@ -0,0 +1,120 @@
+"""
+Fee and reward business rules shared by the Lambda services, the Streamlit
+mock fallbacks and the statement run.
+
+Fee Rules:
+- Premium tier customers: $0.00 monthly fee
+- Standard tier customers with balance > $5,000: $5.00 monthly fee
+- Standard tier customers with balance ≤ $5,000: $15.00 monthly fee
+
+Reward Rules:
+- Accounts with balance > $10,000: 2% of balance as rewards
+- Accounts with balance ≤ $10,000: 1% of balance as rewards
+
+The rules are decision tables: per tier, a list of balance bands compiled
+once at import into sorted breakpoints. Single lookups use bisect, batch
+lookups np.searchsorted, so adding bands or tiers only means editing the
+tables below.
+
+The scalar functions are plain Python. The *_array functions take NumPy
+arrays for bulk jobs; NumPy is imported on first use so the Lambda
+packages do not need it.
+"""
+
+from bisect import bisect_left
+
+# (threshold, value) bands in ascending threshold order. A band applies to
+# balances strictly above its threshold; the first band uses None and covers
+# everything up to the next threshold.
+FEE_SCHEDULES = {
+    'premium': [(None, 0.00)],
+    'standard': [(None, 15.00), (5000, 5.00)]
+}
+
+# Tiers missing from FEE_SCHEDULES are charged as this tier
+DEFAULT_FEE_TIER = 'standard'
+
+REWARD_SCHEDULE = [(None, 0.01), (10000, 0.02)]
+
+
+class DecisionTable:
+    """A compiled band schedule: sorted breakpoints and one value per band."""
+
+    def __init__(self, bands):
+        if not bands or bands[0][0] is not None:
+            raise ValueError('First band must have threshold None')
+        self.breakpoints = [threshold for threshold, _ in bands[1:]]
+        self.values = [value for _, value in bands]
+        if any(a >= b for a, b in zip(self.breakpoints, self.breakpoints[1:])):
+            raise ValueError('Band thresholds must be strictly ascending')
+        self._arrays = None
+
+    def lookup(self, balance):
+        """Value of the band containing balance, in O(log n)"""
+        # bisect_left puts a balance equal to a threshold in the band below it
+        return self.values[bisect_left(self.breakpoints, balance)]
+
+    def lookup_array(self, balances):
+        """Vectorised lookup over an array of balances"""
+        import numpy as np
+        if self._arrays is None:
+            self._arrays = (np.asarray(self.breakpoints, dtype=np.float64), np.asarray(self.values, dtype=np.float64))
+        breakpoints, values = self._arrays
+        return values[np.searchsorted(breakpoints, balances, side='left')]
+
+
+def compile_fee_tables(schedules):
+    """Compile {tier: bands} into {tier: DecisionTable}"""
+    return {tier: DecisionTable(bands) for tier, bands in schedules.items()}
+
+
+FEE_TABLES = compile_fee_tables(FEE_SCHEDULES)
+REWARD_TABLE = DecisionTable(REWARD_SCHEDULE)
+
+
+def calculate_fee(customer_tier, balance):
+    """Monthly fee for a customer tier and balance"""
+    table = FEE_TABLES.get(customer_tier) or FEE_TABLES[DEFAULT_FEE_TIER]
+    return table.lookup(balance)
+
+
+def get_reward_rate(balance):
+    """Monthly reward rate for a balance"""
+    return REWARD_TABLE.lookup(balance)
+
+
+def calculate_reward(balance):
+    """Return (reward_rate, calculated_reward) for a balance, reward rounded to cents"""
+    reward_rate = get_reward_rate(balance)
+    return reward_rate, round(balance * reward_rate, 2)
+
+
+def calculate_fees_array(customer_tiers, balances):
+    """Vectorised calculate_fee over arrays of tiers and balances"""
+    import numpy as np
+    customer_tiers = np.asarray(customer_tiers)
+    balances = np.asarray(balances, dtype=np.float64)
+    fees = FEE_TABLES[DEFAULT_FEE_TIER].lookup_array(balances)
+    for tier, table in FEE_TABLES.items():
+        if tier == DEFAULT_FEE_TIER:
+            continue
+        mask = customer_tiers == tier
+        if mask.any():
+            fees[mask] = table.lookup_array(balances[mask])
+    return fees
+
+
+def calculate_rewards_array(balances):
+    """Vectorised calculate_reward: returns (reward_rates, calculated_rewards) arrays"""
+    import numpy as np
+    balances = np.asarray(balances, dtype=np.float64)
+    reward_rates = REWARD_TABLE.lookup_array(balances)
+    rewards = balances * reward_rates
+    rounded = np.round(rewards, 2)
+    # np.round scales by 100 before rounding, which can push a half-cent to the
+    # other side of Python's round(); redo those ties so both APIs agree
+    scaled = rewards * 100
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [round(reward, 2) for reward in rewards[ties].tolist()]
+    return reward_rates, rounded
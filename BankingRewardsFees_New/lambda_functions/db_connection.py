@@ -0,0 +1,64 @@
+import os
+import threading
+import time
+
+# A cached connection idle for longer than this (seconds) is pinged before reuse
+HEALTHCHECK_INTERVAL = float(os.environ.get('DB_HEALTHCHECK_INTERVAL', '30'))
+
+# One connection per thread: a Lambda container serves one request at a time,
+# so this is a single warm connection there, and a small pool when the
+# handlers are driven from a threaded server.
+_local = threading.local()
+
+
+def get_db_config():
+    """
+    Connection settings for the BankingRewardsFees_New database.
+    autocommit keeps a reused connection from pinning an old REPEATABLE READ
+    snapshot between invocations.
+    """
+    return {
+        'host': os.environ.get('DB_HOST', 'database-2.crq7shsasjo0.us-west-2.rds.amazonaws.com'),
+        'user': os.environ.get('DB_USER', 'admin'),
+        'password': os.environ.get('DB_PASSWORD', 'demo1234!'),
+        'database': os.environ.get('DB_NAME', 'BankingRewardsFees_New'),
+        'autocommit': True
+    }
+
+
+def get_connection():
+    """
+    Return the warm connection for this thread, opening one if needed.
+    Connections idle longer than HEALTHCHECK_INTERVAL are pinged first and
+    replaced if the server has dropped them.
+    """
+    conn = getattr(_local, 'connection', None)
+    now = time.monotonic()
+
+    if conn is not None and now - _local.last_used > HEALTHCHECK_INTERVAL:
+        try:
+            conn.ping(reconnect=False)
+        except Exception:
+            reset_connection()
+            conn = None
+
+    if conn is None:
+        # Imported on first connect: mysql.connector is most of a handler's
+        # import time, and requests that never reach the database skip it
+        import mysql.connector
+        conn = mysql.connector.connect(**get_db_config())
+        _local.connection = conn
+
+    _local.last_used = now
+    return conn
+
+
+def reset_connection():
+    """Close and forget this thread's connection so the next call reconnects."""
+    conn = getattr(_local, 'connection', None)
+    _local.connection = None
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
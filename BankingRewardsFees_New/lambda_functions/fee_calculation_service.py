@@ -1,8 +1,42 @@
-import json
-import mysql.connector
-import os
-from decimal import Decimal
+from db_connection import get_connection, reset_connection
+from batch_queries import is_batch_request, parse_account_selection, fetch_accounts, missing_account_ids, requested_count
+from business_rules import calculate_fee
+from metrics import instrumented, mark
+from serialization import json_response, loads
 
+BATCH_QUERY = """
+    SELECT a.account_id, a.balance, c.tier as customer_tier
+    FROM Accounts a
+    JOIN Customers c ON a.customer_id = c.customer_id
+"""
+
+def calculate_fees_batch(cursor, account_ids=None, id_range=None):
+    """
+    Calculate fees for many accounts with set-based queries.
+    Returns one result per account; requested ids that do not exist are
+    reported with an error instead of failing the whole batch.
+    """
+    results = {}
+    accounts = list(fetch_accounts(cursor, BATCH_QUERY, account_ids, id_range))
+    mark('query')
+    for account in accounts:
+        balance = float(account['balance']) if account['balance'] else 0.0
+        results[account['account_id']] = {
+            'account_id': account['account_id'],
+            'customer_tier': account['customer_tier'],
+            'balance': balance,
+            'calculated_fee': calculate_fee(account['customer_tier'], balance)
+        }
+    mark('compute')
+    
+    if account_ids is None:
+        return list(results.values())
+    return [
+        results.get(account_id, {'account_id': account_id, 'error': 'Account not found'})
+        for account_id in account_ids
+    ]
+
+@instrumented('fee_calculation_service')
 def lambda_handler(event, context):
     """
     Fee Calculation Service Lambda Function
@@ -11,16 +45,12 @@ def lambda_handler(event, context):
     - Premium tier customers: $0.00 monthly fee
     - Standard tier customers with balance > $5,000: $5.00 monthly fee
     - Standard tier customers with balance ≤ $5,000: $15.00 monthly fee
-    """
     
-    # Database connection
-    def get_connection():
-        return mysql.connector.connect(
-            host=os.environ.get('DB_HOST', 'database-2.crq7shsasjo0.us-west-2.rds.amazonaws.com'),
-            user=os.environ.get('DB_USER', 'admin'),
-            password=os.environ.get('DB_PASSWORD', 'demo1234!'),
-            database=os.environ.get('DB_NAME', 'BankingRewardsFees_New')
-        )
+    Batch mode: POST a body with "account_ids" (list) or "account_id_range"
+    ({"start": ..., "end": ...}) and no path account_id to get every fee in
+    one response. Either way "missing" lists the requested ids with no
+    account.
+    """
     
     try:
         # Parse the request
@@ -29,22 +59,38 @@ def lambda_handler(event, context):
         body = event.get('body')
         
         if body:
-            body = json.loads(body)
+            body = loads(body)
+        mark('parse')
+        
+        if not path_parameters.get('account_id') and is_batch_request(body):
+            try:
+                account_ids, id_range = parse_account_selection(body)
+            except ValueError as e:
+                return json_response(400, {'error': str(e)})
+            
+            conn = get_connection()
+            mark('connect')
+            cursor = conn.cursor(dictionary=True, buffered=True)
+            results = calculate_fees_batch(cursor, account_ids, id_range)
+            found = [result for result in results if 'error' not in result]
+            
+            return json_response(200, {
+                'results': results,
+                'requested': requested_count(account_ids, id_range),
+                'found': len(found),
+                'missing': missing_account_ids((result['account_id'] for result in found), account_ids, id_range),
+                'total_fees': round(sum(result['calculated_fee'] for result in found), 2),
+                'calculation_timestamp': str(context.aws_request_id) if context else 'local'
+            })
         
         account_id = path_parameters.get('account_id') or (body.get('account_id') if body else None)
         
         if not account_id:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({'error': 'Missing account_id'})
-            }
+            return json_response(400, {'error': 'Missing account_id'})
         
         conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
+        mark('connect')
+        cursor = conn.cursor(dictionary=True, buffered=True)
         
         # Get account and customer information
         query = """
@@ -55,58 +101,34 @@ def lambda_handler(event, context):
         """
         cursor.execute(query, (account_id,))
         account = cursor.fetchone()
+        mark('query')
         
         if not account:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({'error': 'Account not found'})
-            }
+            return json_response(404, {'error': 'Account not found'})
         
         # Calculate fee based on business rules
         customer_tier = account['customer_tier']
         balance = float(account['balance']) if account['balance'] else 0.0
         
-        if customer_tier == 'premium':
-            fee = 0.00
-        elif balance > 5000:
-            fee = 5.00
-        else:
-            fee = 15.00
+        fee = calculate_fee(customer_tier, balance)
+        mark('compute')
         
         # Return the calculated fee (no longer storing in database)
-        response = {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'account_id': account_id,
-                'customer_tier': customer_tier,
-                'balance': balance,
-                'calculated_fee': fee,
-                'calculation_timestamp': str(context.aws_request_id) if context else 'local'
-            })
-        }
+        response = json_response(200, {
+            'account_id': account_id,
+            'customer_tier': customer_tier,
+            'balance': balance,
+            'calculated_fee': fee,
+            'calculation_timestamp': str(context.aws_request_id) if context else 'local'
+        })
     
     except Exception as e:
-        response = {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        # The session may be mid-statement or broken; reconnect next time
+        reset_connection()
+        response = json_response(500, {'error': str(e)})
     
     finally:
         if 'cursor' in locals():
             cursor.close()
-        if 'conn' in locals():
-            conn.close()
     
     return response
\ No newline at end of file
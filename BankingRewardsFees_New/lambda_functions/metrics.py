@@ -0,0 +1,88 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# Per-phase timings are emitted only when HANDLER_METRICS is set; otherwise
+# each mark() is a flag check and the handler wrapper adds one call
+METRICS_ENABLED = os.environ.get('HANDLER_METRICS', '').lower() in ('1', 'true', 'yes', 'on')
+METRICS_NAMESPACE = os.environ.get('HANDLER_METRICS_NAMESPACE', 'BankingRewardsFees')
+
+_local = threading.local()
+
+
+class InvocationTimer:
+    """
+    Lap timer for one invocation. mark(phase) charges the time since the
+    previous mark to that phase, so handlers only mark phase boundaries.
+    """
+
+    def __init__(self, service, route, request_id):
+        self.service = service
+        self.route = route
+        self.request_id = request_id
+        self.started = self.last = time.perf_counter()
+        self.phases = {}
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self.last)
+        self.last = now
+
+    def record(self, status_code):
+        """CloudWatch Embedded Metric Format record with one metric per phase"""
+        # Whatever follows the last mark is building and serialising the response
+        self.mark('serialize')
+        values = {f"{phase}_ms": round(seconds * 1000, 3) for phase, seconds in self.phases.items()}
+        values['total_ms'] = round((self.last - self.started) * 1000, 3)
+        return {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': METRICS_NAMESPACE,
+                    'Dimensions': [['Service'], ['Service', 'Route']],
+                    'Metrics': [{'Name': name, 'Unit': 'Milliseconds'} for name in values]
+                }]
+            },
+            'Service': self.service,
+            'Route': self.route,
+            'StatusCode': status_code,
+            'RequestId': self.request_id,
+            **values
+        }
+
+
+def mark(phase):
+    """End the current phase of this thread's invocation (no-op when metrics are off)"""
+    if METRICS_ENABLED:
+        timer = getattr(_local, 'timer', None)
+        if timer is not None:
+            timer.mark(phase)
+
+
+def route_of(event):
+    """API Gateway style route, e.g. 'GET /{account_id}' or 'POST /'"""
+    path_parameters = (event or {}).get('pathParameters') or {}
+    return f"{(event or {}).get('httpMethod', '')} {'/{account_id}' if path_parameters.get('account_id') else '/'}"
+
+
+def instrumented(service):
+    """Time each invocation of a lambda_handler and print one EMF line for it"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            if not METRICS_ENABLED:
+                return handler(event, context)
+
+            request_id = getattr(context, 'aws_request_id', None)
+            _local.timer = InvocationTimer(service, route_of(event), request_id)
+            try:
+                response = handler(event, context)
+                sys.stdout.write(json.dumps(_local.timer.record(response.get('statusCode'))) + '\n')
+                return response
+            finally:
+                _local.timer = None
+        return wrapper
+    return decorator
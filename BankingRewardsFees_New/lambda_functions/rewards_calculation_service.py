@@ -1,8 +1,59 @@
-import json
-import mysql.connector
-import os
-from decimal import Decimal
+from db_connection import get_connection, reset_connection
+from batch_queries import is_batch_request, parse_account_selection, fetch_accounts, missing_account_ids, requested_count
+from business_rules import calculate_reward
+from metrics import instrumented, mark
+from serialization import json_response, loads
 
+BATCH_QUERY = """
+    SELECT a.account_id, a.balance
+    FROM Accounts a
+"""
+
+def calculate_rewards_batch(cursor, account_ids=None, id_range=None):
+    """
+    Calculate rewards for many accounts in a single pass over chunked,
+    set-based balance queries.
+    Returns (results, totals). Requested ids that do not exist are reported
+    with an error instead of failing the whole batch.
+    """
+    results = {}
+    total_balance = 0.0
+    total_rewards = 0.0
+    accounts = list(fetch_accounts(cursor, BATCH_QUERY, account_ids, id_range))
+    mark('query')
+    for account in accounts:
+        balance = float(account['balance']) if account['balance'] else 0.0
+        reward_rate, calculated_reward = calculate_reward(balance)
+        total_balance += balance
+        total_rewards += calculated_reward
+        results[account['account_id']] = {
+            'account_id': account['account_id'],
+            'balance': balance,
+            'reward_rate': reward_rate,
+            'calculated_reward': calculated_reward
+        }
+    mark('compute')
+    
+    missing = missing_account_ids(results, account_ids, id_range)
+    if account_ids is not None:
+        results = [
+            results.get(account_id, {'account_id': account_id, 'error': 'Account not found'})
+            for account_id in account_ids
+        ]
+    else:
+        results = list(results.values())
+    
+    found = sum(1 for result in results if 'error' not in result)
+    totals = {
+        'requested': requested_count(account_ids, id_range),
+        'found': found,
+        'missing': missing,
+        'total_balance': round(total_balance, 2),
+        'total_rewards': round(total_rewards, 2)
+    }
+    return results, totals
+
+@instrumented('rewards_calculation_service')
 def lambda_handler(event, context):
     """
     Rewards Calculation Service Lambda Function
@@ -10,16 +61,12 @@ def lambda_handler(event, context):
     Business Rules:
     - Accounts with balance > $10,000: 2% of balance as rewards
     - Accounts with balance ≤ $10,000: 1% of balance as rewards
-    """
     
-    # Database connection
-    def get_connection():
-        return mysql.connector.connect(
-            host=os.environ.get('DB_HOST', 'database-2.crq7shsasjo0.us-west-2.rds.amazonaws.com'),
-            user=os.environ.get('DB_USER', 'admin'),
-            password=os.environ.get('DB_PASSWORD', 'demo1234!'),
-            database=os.environ.get('DB_NAME', 'BankingRewardsFees_New')
-        )
+    Batch mode: POST a body with "account_ids" (list) or "account_id_range"
+    ({"start": ..., "end": ...}) and no path account_id to get every reward
+    plus totals in one response. Either way "missing" lists the requested
+    ids with no account.
+    """
     
     try:
         # Parse the request
@@ -28,22 +75,34 @@ def lambda_handler(event, context):
         body = event.get('body')
         
         if body:
-            body = json.loads(body)
+            body = loads(body)
+        mark('parse')
+        
+        if not path_parameters.get('account_id') and is_batch_request(body):
+            try:
+                account_ids, id_range = parse_account_selection(body)
+            except ValueError as e:
+                return json_response(400, {'error': str(e)})
+            
+            conn = get_connection()
+            mark('connect')
+            cursor = conn.cursor(dictionary=True, buffered=True)
+            results, totals = calculate_rewards_batch(cursor, account_ids, id_range)
+            
+            return json_response(200, {
+                'results': results,
+                **totals,
+                'calculation_timestamp': str(context.aws_request_id) if context else 'local'
+            })
         
         account_id = path_parameters.get('account_id') or (body.get('account_id') if body else None)
         
         if not account_id:
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({'error': 'Missing account_id'})
-            }
+            return json_response(400, {'error': 'Missing account_id'})
         
         conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
+        mark('connect')
+        cursor = conn.cursor(dictionary=True, buffered=True)
         
         # Get account balance
         query = """
@@ -53,57 +112,33 @@ def lambda_handler(event, context):
         """
         cursor.execute(query, (account_id,))
         account = cursor.fetchone()
+        mark('query')
         
         if not account:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({'error': 'Account not found'})
-            }
+            return json_response(404, {'error': 'Account not found'})
         
         # Calculate rewards based on business rules
         balance = float(account['balance']) if account['balance'] else 0.0
         
-        if balance > 10000:
-            reward_rate = 0.02  # 2%
-        else:
-            reward_rate = 0.01  # 1%
-        
-        calculated_reward = balance * reward_rate
+        reward_rate, calculated_reward = calculate_reward(balance)
+        mark('compute')
         
         # Return the calculated reward (no longer storing in database)
-        response = {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'account_id': account_id,
-                'balance': balance,
-                'reward_rate': reward_rate,
-                'calculated_reward': round(calculated_reward, 2),
-                'calculation_timestamp': str(context.aws_request_id) if context else 'local'
-            })
-        }
+        response = json_response(200, {
+            'account_id': account_id,
+            'balance': balance,
+            'reward_rate': reward_rate,
+            'calculated_reward': calculated_reward,
+            'calculation_timestamp': str(context.aws_request_id) if context else 'local'
+        })
     
     except Exception as e:
-        response = {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({'error': str(e)})
-        }
+        # The session may be mid-statement or broken; reconnect next time
+        reset_connection()
+        response = json_response(500, {'error': str(e)})
     
     finally:
         if 'cursor' in locals():
             cursor.close()
-        if 'conn' in locals():
-            conn.close()
     
     return response
\ No newline at end of file
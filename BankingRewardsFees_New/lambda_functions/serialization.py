@@ -0,0 +1,58 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+# orjson when it is packaged with the function, the stdlib C encoder otherwise.
+# Both encode Decimal (as float), datetime and date (ISO 8601) straight from
+# the database rows, so handlers need no conversion pass before dumping.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+
+
+def _default(value):
+    """Encode the column types the JSON encoders do not know"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    BACKEND = 'orjson'
+
+    def dumps_bytes(obj):
+        # orjson handles datetime and date itself and calls _default for Decimal
+        return orjson.dumps(obj, default=_default)
+
+    def dumps(obj):
+        return orjson.dumps(obj, default=_default).decode('utf-8')
+
+    loads = orjson.loads
+else:
+    BACKEND = 'json'
+    _encoder = json.JSONEncoder(default=_default, separators=(',', ':'))
+
+    def dumps(obj):
+        return _encoder.encode(obj)
+
+    def dumps_bytes(obj):
+        return _encoder.encode(obj).encode('utf-8')
+
+    loads = json.loads
+
+
+def json_response(status_code, body, headers=None):
+    """API Gateway proxy response with a JSON body and the CORS headers"""
+    return {
+        'statusCode': status_code,
+        'headers': dict(RESPONSE_HEADERS, **headers) if headers else dict(RESPONSE_HEADERS),
+        'body': dumps(body)
+    }
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Local API gateway for the three Lambda handlers
+
+Serves the same routes as API Gateway and turns each HTTP request into the
+proxy-integration event the handlers expect:
+
+    /Account_Service[/{id}]              GET, PUT
+    /Fee_Calculation_Service[/{id}]      POST
+    /Rewards_Calculation_Service[/{id}]  POST
+
+A stage prefix such as /default/Account_Service is accepted too, so
+deployed URLs only need their host swapped. Connections are HTTP/1.1
+keep-alive on an asyncio server; handlers run on a fixed thread pool whose
+threads act like warm Lambda containers, each keeping its own database
+connection through db_connection.
+
+    python local_gateway.py --port 8000
+    python local_gateway.py --port 8000 --sqlite /tmp/book.db --workers 16
+
+Point app.py at it through aws_lambda_api.env:
+
+    ACCOUNT_SERVICE_URL = "http://127.0.0.1:8000/Account_Service"
+    FEE_CALCULATION_URL = "http://127.0.0.1:8000/Fee_Calculation_Service"
+    REWARDS_CALCULATION_URL = "http://127.0.0.1:8000/Rewards_Calculation_Service"
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'lambda_functions'))
+
+import account_service
+import fee_calculation_service
+import rewards_calculation_service
+
+ROUTES = {
+    'Account_Service': account_service.lambda_handler,
+    'Fee_Calculation_Service': fee_calculation_service.lambda_handler,
+    'Rewards_Calculation_Service': rewards_calculation_service.lambda_handler
+}
+
+MAX_BODY_SIZE = 1024 * 1024
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+class LambdaContext:
+    """The attributes of the Lambda context object the handlers read"""
+
+    def __init__(self, function_name):
+        self.function_name = function_name
+        self.aws_request_id = str(uuid.uuid4())
+
+
+def build_event(method, target, headers, body):
+    """
+    API Gateway proxy event for one request, or None if no route matches.
+    Raises UnicodeDecodeError for a body that is not UTF-8.
+    """
+    url = urlsplit(target)
+    parts = [unquote(part) for part in url.path.split('/') if part]
+    for index, part in enumerate(parts):
+        if part in ROUTES:
+            break
+    else:
+        return None, None
+    rest = parts[index + 1:]
+    if len(rest) > 1:
+        return None, None
+
+    query = dict(parse_qsl(url.query, keep_blank_values=True))
+    event = {
+        'httpMethod': method,
+        'path': url.path,
+        'resource': f"/{part}/{{account_id}}" if rest else f"/{part}",
+        'headers': headers,
+        'pathParameters': {'account_id': rest[0]} if rest else None,
+        'queryStringParameters': query or None,
+        'body': body.decode('utf-8') if body else None,
+        'isBase64Encoded': False
+    }
+    return part, event
+
+
+def reason_phrase(status):
+    """Standard reason phrase, or a generic one for codes http.HTTPStatus does not know"""
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return 'Unknown Status'
+
+
+class LocalGateway:
+    """asyncio HTTP/1.1 front end dispatching to the Lambda handlers on a thread pool"""
+
+    def __init__(self, workers=8):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='lambda')
+        self.requests = 0
+
+    async def invoke(self, method, target, headers, body):
+        try:
+            route, event = build_event(method, target, headers, body)
+        except UnicodeDecodeError:
+            return 400, JSON_HEADERS, json.dumps({'error': 'Request body must be UTF-8'})
+        if route is None:
+            return 404, JSON_HEADERS, json.dumps({'error': 'Not found'})
+        handler = ROUTES[route]
+        loop = asyncio.get_running_loop()
+        try:
+            response = await loop.run_in_executor(self.executor, handler, event, LambdaContext(route))
+            return int(response['statusCode']), response.get('headers') or {}, response.get('body') or ''
+        except Exception as e:
+            # What API Gateway answers when the function raises or returns a malformed response
+            print(f"{route} failed: {e!r}", file=sys.stderr)
+            return 502, JSON_HEADERS, json.dumps({'message': 'Internal server error'})
+
+    async def write_response(self, writer, status, headers, body, keep_alive):
+        payload = body.encode('utf-8') if isinstance(body, str) else body
+        head = [f"HTTP/1.1 {status} {reason_phrase(status)}"]
+        head += [f"{name}: {value}" for name, value in headers.items()
+                 if name.lower() not in ('content-length', 'connection')]
+        head.append(f"Content-Length: {len(payload)}")
+        head.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload)
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    # Nothing after a garbled request line can be framed
+                    body = json.dumps({'error': 'Malformed request line'})
+                    await self.write_response(writer, 400, JSON_HEADERS, body, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip()] = value.strip()
+                lowered = {name.lower(): value.lower() for name, value in headers.items()}
+
+                if version == 'HTTP/1.1':
+                    keep_alive = lowered.get('connection') != 'close'
+                else:
+                    keep_alive = lowered.get('connection') == 'keep-alive'
+
+                try:
+                    length = int(lowered.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    status, response_headers, body = 400, JSON_HEADERS, json.dumps({'error': 'Invalid Content-Length'})
+                    keep_alive = False
+                elif length > MAX_BODY_SIZE:
+                    # The unread body would be parsed as the next request
+                    status, response_headers, body = 413, {}, ''
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    self.requests += 1
+                    status, response_headers, body = await self.invoke(method, target, headers, body)
+
+                await self.write_response(writer, status, response_headers, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8000):
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def start_in_thread(self, host='127.0.0.1', port=0):
+        """Serve on a background event loop; returns the base URL"""
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self._server = asyncio.run_coroutine_threadsafe(self.start(host, port), self._loop).result()
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        """Stop a gateway started with start_in_thread()"""
+        async def shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.close()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+async def serve(host, port, workers):
+    gateway = LocalGateway(workers)
+    server = await gateway.start(host, port)
+    print(f"Serving {', '.join(f'http://{host}:{port}/{route}' for route in ROUTES)}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        gateway.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=8, help='handler threads (warm containers)')
+    parser.add_argument('--sqlite', help='serve a local SQLite stand-in instead of MySQL')
+    args = parser.parse_args()
+
+    try:
+        if args.sqlite:
+            from unittest.mock import patch
+            sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+            from sqlite_backend import make_connect
+            with patch('mysql.connector.connect', make_connect(args.sqlite)):
+                asyncio.run(serve(args.host, args.port, args.workers))
+        else:
+            asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Month-end statement run
+
+Computes the monthly fee and reward for every account in the book and
+writes one statement row per account. Rows are streamed from
+Accounts JOIN Customers with an unbuffered (server-side) cursor in
+fetchmany chunks, chunks are processed on a process pool and written in
+account_id order, so memory stays bounded by the number of chunks in flight.
+
+    python statement_run.py --output statements.csv
+    python statement_run.py --output statements.parquet --format parquet --workers 4
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'lambda_functions'))
+
+import numpy as np
+from business_rules import calculate_fees_array, calculate_rewards_array
+
+STATEMENT_QUERY = """
+    SELECT a.account_id, c.customer_id, c.name, c.tier, a.balance
+    FROM Accounts a
+    JOIN Customers c ON a.customer_id = c.customer_id
+    ORDER BY a.account_id
+"""
+
+STATEMENT_COLUMNS = [
+    'statement_period', 'account_id', 'customer_id', 'customer_name', 'customer_tier',
+    'balance', 'monthly_fee', 'reward_rate', 'monthly_reward'
+]
+
+
+def process_chunk(rows, statement_period):
+    """
+    Apply the fee and reward rules to a chunk of
+    (account_id, customer_id, name, tier, balance) rows.
+    Returns the statement as a dict of column lists.
+    """
+    account_ids, customer_ids, names, tiers, balances = zip(*rows)
+    balances = np.fromiter((float(b) if b else 0.0 for b in balances), dtype=np.float64, count=len(rows))
+    fees = calculate_fees_array(np.array(tiers, dtype=object), balances)
+    reward_rates, rewards = calculate_rewards_array(balances)
+    return {
+        'statement_period': [statement_period] * len(rows),
+        'account_id': list(account_ids),
+        'customer_id': list(customer_ids),
+        'customer_name': list(names),
+        'customer_tier': list(tiers),
+        'balance': balances.tolist(),
+        'monthly_fee': fees.tolist(),
+        'reward_rate': reward_rates.tolist(),
+        'monthly_reward': rewards.tolist()
+    }
+
+
+class CsvStatementWriter:
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(STATEMENT_COLUMNS)
+
+    def write(self, statements):
+        self._writer.writerows(zip(*(statements[column] for column in STATEMENT_COLUMNS)))
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetStatementWriter:
+    """Writes one row group per chunk. Requires pyarrow."""
+
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self._schema = pa.schema([
+            ('statement_period', pa.string()), ('account_id', pa.int64()), ('customer_id', pa.int64()),
+            ('customer_name', pa.string()), ('customer_tier', pa.string()), ('balance', pa.float64()),
+            ('monthly_fee', pa.float64()), ('reward_rate', pa.float64()), ('monthly_reward', pa.float64())
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, statements):
+        self._writer.write_table(self._pa.Table.from_pydict(statements, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def open_writer(path, fmt):
+    if fmt == 'parquet':
+        return ParquetStatementWriter(path)
+    return CsvStatementWriter(path)
+
+
+def iter_chunks(conn, chunk_size):
+    """Stream the statement query from an unbuffered cursor in fetchmany chunks."""
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(STATEMENT_QUERY)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+    finally:
+        cursor.close()
+
+
+def run_statement(conn, output_path, statement_period=None, chunk_size=10000, workers=None, fmt='csv'):
+    """
+    Run the statement job over every account and write output_path.
+    workers=0 processes chunks in-process; otherwise a process pool with
+    `workers` processes (default: CPU count) is used and at most two chunks
+    per worker are in flight at once.
+    Returns a summary dict with row count, elapsed seconds and rows per second.
+    """
+    statement_period = statement_period or date.today().strftime('%Y-%m')
+    start = time.perf_counter()
+    rows_written = 0
+    writer = open_writer(output_path, fmt)
+
+    try:
+        if workers == 0:
+            for rows in iter_chunks(conn, chunk_size):
+                statements = process_chunk(rows, statement_period)
+                writer.write(statements)
+                rows_written += len(statements['account_id'])
+        else:
+            workers = workers or os.cpu_count() or 1
+            max_in_flight = workers * 2
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+                for rows in iter_chunks(conn, chunk_size):
+                    pending.append(executor.submit(process_chunk, rows, statement_period))
+                    if len(pending) >= max_in_flight:
+                        statements = pending.popleft().result()
+                        writer.write(statements)
+                        rows_written += len(statements['account_id'])
+                while pending:
+                    statements = pending.popleft().result()
+                    writer.write(statements)
+                    rows_written += len(statements['account_id'])
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows_written,
+        'elapsed_seconds': round(elapsed, 3),
+        'rows_per_second': round(rows_written / elapsed) if elapsed > 0 else rows_written
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', required=True, help='statement file to write')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--period', help='statement period label, default current YYYY-MM')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None, help='process pool size, 0 to run in-process')
+    parser.add_argument('--sqlite', help='read from a local SQLite stand-in instead of MySQL')
+    args = parser.parse_args()
+
+    if args.sqlite:
+        sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+        from sqlite_backend import SQLiteConnection
+        conn = SQLiteConnection(args.sqlite)
+    else:
+        import mysql.connector
+        from db_connection import get_db_config
+        conn = mysql.connector.connect(**get_db_config())
+
+    try:
+        summary = run_statement(conn, args.output, args.period, args.chunk_size, args.workers, args.format)
+    finally:
+        conn.close()
+
+    print(f"Wrote {summary['rows']} statements to {args.output} "
+          f"in {summary['elapsed_seconds']}s ({summary['rows_per_second']} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,11 +3,17 @@ from unittest.mock import Mock, patch, MagicMock
 import json
 import sys
 import os
+import sqlite3
+from datetime import datetime
+from decimal import Decimal
 
-# Add the lambda_functions directory to the path
+# Add the lambda_functions and benchmarks directories to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
 
-from account_service import lambda_handler
+from account_service import lambda_handler, encode_cursor, decode_cursor, ACCOUNT_CACHE
+from sqlite_backend import create_database, make_connect
+from db_connection import reset_connection
 
 class TestAccountService(unittest.TestCase):
     
@@ -15,6 +21,8 @@ class TestAccountService(unittest.TestCase):
         """Set up test fixtures before each test method."""
         self.mock_context = Mock()
         self.mock_context.aws_request_id = 'test-request-id'
+        reset_connection()
+        ACCOUNT_CACHE.clear()
         
         # Sample account data
         self.sample_account = {
@@ -42,7 +50,7 @@ class TestAccountService(unittest.TestCase):
             }
         ]
     
-    @patch('account_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_get_all_accounts_success(self, mock_connect):
         """Test successful retrieval of all accounts."""
         # Mock database connection and cursor
@@ -77,9 +85,10 @@ class TestAccountService(unittest.TestCase):
         # Verify database calls
         mock_cursor.execute.assert_called_once()
         mock_cursor.close.assert_called_once()
-        mock_conn.close.assert_called_once()
+        # Connection is kept warm for the next invocation
+        mock_conn.close.assert_not_called()
     
-    @patch('account_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_get_specific_account_success(self, mock_connect):
         """Test successful retrieval of a specific account."""
         # Mock database connection and cursor
@@ -107,7 +116,40 @@ class TestAccountService(unittest.TestCase):
         self.assertEqual(response_data['customer_name'], 'John Doe')
         self.assertEqual(response_data['balance'], 1500.00)
     
-    @patch('account_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
+    def test_get_specific_account_mysql_types(self, mock_connect):
+        """Test that Decimal balances and datetime columns from MySQL serialize."""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = dict(
+            self.sample_account,
+            balance=Decimal('1500.25'),
+            created_at=datetime(2023, 1, 1, 9, 30),
+            updated_at=datetime(2023, 6, 30, 17, 0, 5)
+        )
+        
+        for view in (None, {'view': 'summary'}):
+            ACCOUNT_CACHE.clear()
+            event = {
+                'httpMethod': 'GET',
+                'pathParameters': {'account_id': '1'},
+                'queryStringParameters': view,
+                'body': None
+            }
+        
+            response = lambda_handler(event, self.mock_context)
+        
+            self.assertEqual(response['statusCode'], 200)
+            response_data = json.loads(response['body'])
+            account = response_data['account'] if view else response_data
+            self.assertEqual(account['balance'], 1500.25)
+            self.assertEqual(account['created_at'], '2023-01-01T09:30:00')
+            self.assertEqual(account['updated_at'], '2023-06-30T17:00:05')
+        self.assertEqual(response_data['fee']['calculated_fee'], 15.00)
+    
+    @patch('mysql.connector.connect')
     def test_get_specific_account_not_found(self, mock_connect):
         """Test retrieval of non-existent account."""
         # Mock database connection and cursor
@@ -134,7 +176,7 @@ class TestAccountService(unittest.TestCase):
         self.assertIn('error', response_data)
         self.assertEqual(response_data['error'], 'Account not found')
     
-    @patch('account_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_update_balance_success(self, mock_connect):
         """Test successful balance update."""
         # Mock database connection and cursor
@@ -165,7 +207,7 @@ class TestAccountService(unittest.TestCase):
         mock_cursor.execute.assert_called_once()
         mock_conn.commit.assert_called_once()
     
-    @patch('account_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_update_balance_account_not_found(self, mock_connect):
         """Test balance update for non-existent account."""
         # Mock database connection and cursor
@@ -230,7 +272,7 @@ class TestAccountService(unittest.TestCase):
         self.assertIn('error', response_data)
         self.assertEqual(response_data['error'], 'Method not allowed')
     
-    @patch('account_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_database_connection_error(self, mock_connect):
         """Test database connection error handling."""
         # Mock database connection to raise an exception
@@ -253,5 +295,380 @@ class TestAccountService(unittest.TestCase):
         self.assertIn('error', response_data)
         self.assertIn('Database connection failed', response_data['error'])
 
+    @patch('mysql.connector.connect')
+    def test_connection_reused_across_invocations(self, mock_connect):
+        """Test that warm invocations reuse the same database connection."""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = self.sample_account
+        
+        event = {
+            'httpMethod': 'GET',
+            'pathParameters': {'account_id': '1'},
+            'queryStringParameters': None,
+            'body': None
+        }
+        
+        # Call the lambda handler twice, as a warm container would
+        lambda_handler(event, self.mock_context)
+        event['pathParameters'] = {'account_id': '2'}
+        response = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(response['statusCode'], 200)
+        mock_connect.assert_called_once()
+        self.assertEqual(mock_cursor.close.call_count, 2)
+        mock_conn.close.assert_not_called()
+    
+    @patch('mysql.connector.connect')
+    def test_database_error_drops_connection(self, mock_connect):
+        """Test that a failed query forces a reconnect on the next invocation."""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.execute.side_effect = [Exception('Lost connection'), None]
+        mock_cursor.fetchone.return_value = self.sample_account
+        
+        event = {
+            'httpMethod': 'GET',
+            'pathParameters': {'account_id': '1'},
+            'queryStringParameters': None,
+            'body': None
+        }
+        
+        # First call fails, second call must reconnect
+        response = lambda_handler(event, self.mock_context)
+        self.assertEqual(response['statusCode'], 500)
+        mock_conn.close.assert_called_once()
+        
+        response = lambda_handler(event, self.mock_context)
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(mock_connect.call_count, 2)
+
+    @patch('mysql.connector.connect')
+    def test_get_accounts_first_page(self, mock_connect):
+        """Test a limited account list returns a page and a next cursor."""
+        # Mock database connection and cursor
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            {'account_id': 2, 'balance': 15000.00, 'customer_id': 2, 'customer_name': 'Jane Smith', 'customer_tier': 'premium'},
+            {'account_id': 1, 'balance': 1500.00, 'customer_id': 1, 'customer_name': 'John Doe', 'customer_tier': 'standard'}
+        ]
+        
+        # Create test event
+        event = {
+            'httpMethod': 'GET',
+            'pathParameters': None,
+            'queryStringParameters': {'limit': '1'},
+            'body': None
+        }
+        
+        # Call the lambda handler
+        response = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(response['statusCode'], 200)
+        response_data = json.loads(response['body'])
+        self.assertEqual(len(response_data['accounts']), 1)
+        self.assertEqual(response_data['accounts'][0]['account_id'], 2)
+        self.assertEqual(decode_cursor(response_data['next_cursor']), ('Jane Smith', 2, 2))
+        
+        # Fetches one extra row to detect the next page
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('LIMIT %s', query)
+        self.assertEqual(params, (2,))
+    
+    @patch('mysql.connector.connect')
+    def test_get_accounts_with_cursor(self, mock_connect):
+        """Test that a cursor continues after the encoded key."""
+        # Mock database connection and cursor
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = []
+        
+        token = encode_cursor({'customer_name': 'Jane Smith', 'customer_id': 2, 'account_id': 2})
+        event = {
+            'httpMethod': 'GET',
+            'pathParameters': None,
+            'queryStringParameters': {'cursor': token},
+            'body': None
+        }
+        
+        # Call the lambda handler
+        response = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(response['statusCode'], 200)
+        response_data = json.loads(response['body'])
+        self.assertEqual(response_data, {'accounts': [], 'next_cursor': None})
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('c.name >= %s', query)
+        self.assertEqual(params, ('Jane Smith', 'Jane Smith', 2, 2, 2, 101))
+    
+    @patch('mysql.connector.connect')
+    def test_get_accounts_invalid_page_parameters(self, mock_connect):
+        """Test that bad limit or cursor values are rejected."""
+        mock_connect.return_value = Mock()
+        
+        for query_parameters in [{'limit': '0'}, {'limit': 'ten'}, {'limit': '100000'}, {'cursor': 'not-a-cursor'}]:
+            event = {
+                'httpMethod': 'GET',
+                'pathParameters': None,
+                'queryStringParameters': query_parameters,
+                'body': None
+            }
+            
+            response = lambda_handler(event, self.mock_context)
+            
+            self.assertEqual(response['statusCode'], 400)
+            self.assertIn('error', json.loads(response['body']))
+    
+    def test_pagination_walks_every_account_once(self):
+        """Test paging through a SQLite book returns every account in name order."""
+        db_path = create_database(57)
+        self.addCleanup(os.remove, db_path)
+        
+        seen = []
+        query_parameters = {'limit': '10'}
+        with patch('mysql.connector.connect', make_connect(db_path)):
+            while True:
+                event = {
+                    'httpMethod': 'GET',
+                    'pathParameters': None,
+                    'queryStringParameters': query_parameters,
+                    'body': None
+                }
+                response = lambda_handler(event, self.mock_context)
+                self.assertEqual(response['statusCode'], 200)
+                page = json.loads(response['body'])
+                seen.extend(page['accounts'])
+                if not page['next_cursor']:
+                    break
+                query_parameters = {'limit': '10', 'cursor': page['next_cursor']}
+        reset_connection()
+        
+        self.assertEqual(sorted(a['account_id'] for a in seen), list(range(1, 58)))
+        keys = [(a['customer_name'], a['customer_id'], a['account_id']) for a in seen]
+        self.assertEqual(keys, sorted(keys))
+    
+    def test_pagination_walks_customers_without_a_name(self):
+        """Test pages ending on a NULL customer name continue through the rest of the book."""
+        db_path = create_database(20)
+        self.addCleanup(os.remove, db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE Customers SET name = NULL WHERE customer_id IN (2, 5, 7)")
+        conn.commit()
+        conn.close()
+        
+        seen = []
+        query_parameters = {'limit': '2'}
+        with patch('mysql.connector.connect', make_connect(db_path)):
+            while True:
+                event = {
+                    'httpMethod': 'GET',
+                    'pathParameters': None,
+                    'queryStringParameters': query_parameters,
+                    'body': None
+                }
+                response = lambda_handler(event, self.mock_context)
+                self.assertEqual(response['statusCode'], 200)
+                page = json.loads(response['body'])
+                seen.extend(page['accounts'])
+                if not page['next_cursor']:
+                    break
+                query_parameters = {'limit': '2', 'cursor': page['next_cursor']}
+        reset_connection()
+        
+        self.assertIn(None, [a['customer_name'] for a in seen])
+        self.assertEqual(sorted(a['account_id'] for a in seen), list(range(1, 21)))
+        # NULL names first, as ORDER BY c.name puts them
+        keys = [(a['customer_name'] is not None, a['customer_name'] or '', a['customer_id'], a['account_id']) for a in seen]
+        self.assertEqual(keys, sorted(keys))
+    
+    def test_cursor_keeps_a_null_name(self):
+        """Test a cursor for a customer without a name decodes to None, not 'None'."""
+        token = encode_cursor({'customer_name': None, 'customer_id': 5, 'account_id': 9})
+        
+        self.assertEqual(decode_cursor(token), (None, 5, 9))
+        with self.assertRaises(ValueError):
+            decode_cursor(encode_cursor({'customer_name': 7, 'customer_id': 5, 'account_id': 9}))
+
+    @patch('mysql.connector.connect')
+    def test_get_account_summary(self, mock_connect):
+        """Test the summary view returns details, fee and reward from one query."""
+        # Mock database connection and cursor
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = dict(self.sample_account, balance=7500.00)
+        
+        # Create test event
+        event = {
+            'httpMethod': 'GET',
+            'pathParameters': {'account_id': '1'},
+            'queryStringParameters': {'view': 'summary'},
+            'body': None
+        }
+        
+        # Call the lambda handler
+        response = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(response['statusCode'], 200)
+        response_data = json.loads(response['body'])
+        self.assertEqual(response_data['account']['customer_name'], 'John Doe')
+        self.assertEqual(response_data['account']['balance'], 7500.00)
+        self.assertEqual(response_data['fee']['calculated_fee'], 5.00)
+        self.assertEqual(response_data['fee']['customer_tier'], 'standard')
+        self.assertEqual(response_data['rewards']['reward_rate'], 0.01)
+        self.assertEqual(response_data['rewards']['calculated_reward'], 75.00)
+        self.assertEqual(response_data['rewards']['calculation_timestamp'], 'test-request-id')
+        mock_cursor.execute.assert_called_once()
+    
+    @patch('mysql.connector.connect')
+    def test_get_account_summary_null_balance(self, mock_connect):
+        """Test the summary view treats a null balance as zero."""
+        # Mock database connection and cursor
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = dict(self.sample_account, balance=None, customer_tier='premium')
+        
+        # Create test event
+        event = {
+            'httpMethod': 'GET',
+            'pathParameters': {'account_id': '1'},
+            'queryStringParameters': {'view': 'summary'},
+            'body': None
+        }
+        
+        # Call the lambda handler
+        response = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(response['statusCode'], 200)
+        response_data = json.loads(response['body'])
+        self.assertIsNone(response_data['account']['balance'])
+        self.assertEqual(response_data['fee']['calculated_fee'], 0.00)
+        self.assertEqual(response_data['rewards']['calculated_reward'], 0.00)
+
+    @patch('mysql.connector.connect')
+    def test_get_account_served_from_cache(self, mock_connect):
+        """Test that a repeated detail read is a cache hit with no query."""
+        # Mock database connection and cursor
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = self.sample_account
+        
+        event = {
+            'httpMethod': 'GET',
+            'pathParameters': {'account_id': '1'},
+            'queryStringParameters': None,
+            'body': None
+        }
+        
+        first = lambda_handler(event, self.mock_context)
+        second = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(first['headers']['X-Cache'], 'MISS')
+        self.assertEqual(second['headers']['X-Cache'], 'HIT')
+        self.assertEqual(first['body'], second['body'])
+        mock_cursor.execute.assert_called_once()
+    
+    @patch('mysql.connector.connect')
+    def test_update_balance_never_serves_stale_balance(self, mock_connect):
+        """Test that detail, list and page reads after a PUT show the new balance."""
+        # Mock database connection and a cursor backed by a mutable balance
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.rowcount = 1
+        state = {'balance': 1500.00}
+        mock_cursor.fetchone.side_effect = lambda: dict(self.sample_account, balance=state['balance'])
+        mock_cursor.fetchall.side_effect = lambda: [
+            dict(self.sample_accounts[0], customer_id=1, balance=state['balance'])
+        ]
+        
+        def update(query, params=None):
+            if query.startswith('UPDATE'):
+                state['balance'] = params[0]
+        mock_cursor.execute.side_effect = update
+        
+        detail = {'httpMethod': 'GET', 'pathParameters': {'account_id': '1'}, 'queryStringParameters': None, 'body': None}
+        listing = {'httpMethod': 'GET', 'pathParameters': None, 'queryStringParameters': None, 'body': None}
+        page = {'httpMethod': 'GET', 'pathParameters': None, 'queryStringParameters': {'limit': '10'}, 'body': None}
+        put = {'httpMethod': 'PUT', 'pathParameters': {'account_id': '1'}, 'queryStringParameters': None,
+               'body': json.dumps({'balance': 2500.00})}
+        
+        # Warm the cache
+        for event in (detail, listing, page, detail, listing, page):
+            lambda_handler(event, self.mock_context)
+        self.assertEqual(lambda_handler(detail, self.mock_context)['headers']['X-Cache'], 'HIT')
+        
+        # Update, then every read must see the new balance
+        self.assertEqual(lambda_handler(put, self.mock_context)['statusCode'], 200)
+        self.assertEqual(json.loads(lambda_handler(detail, self.mock_context)['body'])['balance'], 2500.00)
+        self.assertEqual(json.loads(lambda_handler(listing, self.mock_context)['body'])[0]['balance'], 2500.00)
+        self.assertEqual(json.loads(lambda_handler(page, self.mock_context)['body'])['accounts'][0]['balance'], 2500.00)
+    
+    @patch('mysql.connector.connect')
+    def test_update_balance_keeps_other_accounts_cached(self, mock_connect):
+        """Test that a PUT only evicts the updated account's detail entry."""
+        # Mock database connection and cursor
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.rowcount = 1
+        mock_cursor.fetchone.return_value = self.sample_account
+        
+        other = {'httpMethod': 'GET', 'pathParameters': {'account_id': '2'}, 'queryStringParameters': None, 'body': None}
+        put = {'httpMethod': 'PUT', 'pathParameters': {'account_id': '1'}, 'queryStringParameters': None,
+               'body': json.dumps({'balance': 2500.00})}
+        
+        lambda_handler(other, self.mock_context)
+        lambda_handler(put, self.mock_context)
+        response = lambda_handler(other, self.mock_context)
+        
+        self.assertEqual(response['headers']['X-Cache'], 'HIT')
+    
+    @patch('mysql.connector.connect')
+    def test_cache_stats_view(self, mock_connect):
+        """Test that cache counters are exposed without a database query."""
+        # Mock database connection and cursor
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = self.sample_account
+        
+        detail = {'httpMethod': 'GET', 'pathParameters': {'account_id': '1'}, 'queryStringParameters': None, 'body': None}
+        lambda_handler(detail, self.mock_context)
+        lambda_handler(detail, self.mock_context)
+        
+        event = {'httpMethod': 'GET', 'pathParameters': None, 'queryStringParameters': {'view': 'cache_stats'}, 'body': None}
+        response = lambda_handler(event, self.mock_context)
+        
+        self.assertEqual(response['statusCode'], 200)
+        stats = json.loads(response['body'])
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertIn('evictions', stats)
+        mock_cursor.execute.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+import importlib
+import logging
+import os
+import sys
+
+# Add the project root, lambda_functions and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from ttl_cache import MISS
+from stub_server import start_stub_server
+
+class TestAppResponseCache(unittest.TestCase):
+    """app.py's RESPONSE_CACHE, with the script run bare (no Streamlit server) against the stub services"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.server = start_stub_server(num_accounts=10)
+        urls = {
+            'ACCOUNT_SERVICE_URL': cls.server.url('Account_Service'),
+            'FEE_CALCULATION_URL': cls.server.url('Fee_Calculation_Service'),
+            'REWARDS_CALCULATION_URL': cls.server.url('Rewards_Calculation_Service')
+        }
+        # Outside `streamlit run` every st.* call logs a missing-context warning
+        logging.getLogger('streamlit').setLevel(logging.CRITICAL)
+        with patch.dict(os.environ, urls):
+            sys.modules.pop('app', None)
+            cls.app = importlib.import_module('app')
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.app.client.close()
+        sys.modules.pop('app', None)
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.cache = self.app.RESPONSE_CACHE
+        self.cache.clear()
+    
+    def test_summary_is_served_from_cache(self):
+        """Test a second summary read does not go back to the Account Service."""
+        first = self.app.get_account_summary(2)
+        requests_before = self.server.requests
+        
+        self.assertEqual(self.app.get_account_summary(2), first)
+        self.assertEqual(self.server.requests, requests_before)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+    
+    def test_entries_expire_after_ttl(self):
+        """Test a summary older than RESPONSE_CACHE_TTL is fetched again."""
+        with patch('ttl_cache.time.monotonic', return_value=1000.0):
+            self.app.get_account_summary(3)
+        requests_before = self.server.requests
+        
+        with patch('ttl_cache.time.monotonic', return_value=1000.0 + self.cache.ttl + 1):
+            self.app.get_account_summary(3)
+        
+        self.assertEqual(self.server.requests, requests_before + 1)
+        self.assertEqual(self.cache.stats()['expirations'], 1)
+    
+    def test_balance_update_invalidates_account_and_list(self):
+        """Test a balance update drops the cached list and that account's summary only."""
+        self.app.get_accounts()
+        self.app.get_account_summary(4)
+        self.app.get_account_summary(5)
+        
+        self.assertTrue(self.app.update_account_balance(4, 4321.0))
+        
+        self.assertIs(self.cache.get(self.app.response_key('accounts')), MISS)
+        self.assertIs(self.cache.get(self.app.response_key('summary', 4)), MISS)
+        self.assertIsNot(self.cache.get(self.app.response_key('summary', 5)), MISS)
+        self.assertEqual(self.app.get_account_summary(4)['account']['balance'], 4321.0)
+    
+    def test_mixed_str_and_int_ids(self):
+        """Test ids given as str in one place and int in another share entries and invalidation."""
+        self.app.get_account_summary('6')
+        requests_before = self.server.requests
+        self.app.get_account_summary(6)
+        self.assertEqual(self.server.requests, requests_before)
+        
+        self.app.get_account_summary(7)
+        self.app.invalidate_account('7')
+        self.assertIs(self.cache.get(self.app.response_key('summary', 7)), MISS)
+        
+        self.app.get_account_summary('8')
+        self.app.update_account_balance(8, 10.0)
+        self.assertIs(self.cache.get(self.app.response_key('summary', '8')), MISS)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import time
+
+# Add the project root and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from banking_client import BankingClient, BankingAPIError, DEFAULT_TIMEOUTS
+from stub_server import start_stub_server
+
+class TestBankingClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Start one local stub of the three services for all tests."""
+        cls.server = start_stub_server(num_accounts=10)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = BankingClient(
+            self.server.url('Account_Service'),
+            self.server.url('Fee_Calculation_Service'),
+            self.server.url('Rewards_Calculation_Service'),
+            backoff_factor=0
+        )
+
+    def tearDown(self):
+        self.client.close()
+        self.server.fail_next = 0
+
+    def test_service_methods(self):
+        """Test every helper method returns the parsed service response."""
+        accounts = self.client.get_accounts()
+        self.assertEqual(len(accounts), 10)
+
+        self.assertEqual(self.client.get_account_details(2)['account_id'], 2)
+
+        summary = self.client.get_account_summary(3)
+        self.assertEqual(set(summary), {'account', 'fee', 'rewards'})
+
+        self.assertEqual(self.client.update_account_balance(4, 2500.0)['new_balance'], 2500.0)
+        self.assertEqual(self.client.get_account_details(4)['balance'], 2500.0)
+
+        self.assertEqual(self.client.calculate_fees(4)['calculated_fee'], 15.00)
+        self.assertEqual(self.client.calculate_rewards(4)['calculated_reward'], 25.00)
+
+    def test_connections_are_reused(self):
+        """Test that sequential calls share one kept-alive connection per host."""
+        connections = self.server.connections
+        for account_id in range(1, 6):
+            self.client.get_account_details(account_id)
+            self.client.calculate_fees(account_id)
+            self.client.calculate_rewards(account_id)
+
+        self.assertEqual(self.server.connections - connections, 1)
+
+    def test_transient_errors_are_retried(self):
+        """Test that 503 responses are retried until the service answers."""
+        self.server.fail_next = 2
+
+        result = self.client.calculate_fees(1)
+
+        self.assertEqual(result['account_id'], 1)
+        self.assertEqual(self.server.fail_next, 0)
+
+    def test_error_status_raises_after_retries(self):
+        """Test that a persistent failure raises BankingAPIError with the status code."""
+        self.server.fail_next = 10
+
+        with self.assertRaises(BankingAPIError) as context:
+            self.client.get_accounts()
+
+        self.assertEqual(context.exception.status_code, 503)
+        self.assertEqual(self.server.fail_next, 6)
+
+    def test_not_found_is_not_retried(self):
+        """Test that client errors surface immediately."""
+        requests_before = self.server.requests
+
+        with self.assertRaises(BankingAPIError) as context:
+            self.client.get_account_details(999)
+
+        self.assertEqual(context.exception.status_code, 404)
+        self.assertEqual(self.server.requests - requests_before, 1)
+
+    def test_per_service_timeouts(self):
+        """Test that each service call uses its own timeout."""
+        client = BankingClient('http://a/Account_Service', 'http://b/Fee_Calculation_Service',
+                               'http://c/Rewards_Calculation_Service', timeouts={'fee': (1, 2)})
+
+        with patch.object(client.session, 'request') as mock_request:
+            mock_request.return_value.status_code = 200
+            client.calculate_fees(1)
+            client.get_accounts()
+
+        self.assertEqual(mock_request.call_args_list[0].kwargs['timeout'], (1, 2))
+        self.assertEqual(mock_request.call_args_list[1].kwargs['timeout'], DEFAULT_TIMEOUTS['account'])
+
+    def test_account_view_calls_run_concurrently(self):
+        """Test that details, fee and reward cost one round trip, not three."""
+        self.server.latency = 0.2
+        try:
+            start = time.perf_counter()
+            view = self.client.get_account_view(5)
+            elapsed = time.perf_counter() - start
+        finally:
+            self.server.latency = 0.0
+
+        self.assertEqual(set(view), {'account', 'fee', 'rewards'})
+        self.assertEqual(view['fee']['account_id'], 5)
+        self.assertLess(elapsed, 0.5)
+
+    def test_account_view_yields_failures_per_part(self):
+        """Test that a missing account yields an error for every part instead of raising."""
+        parts = dict(self.client.iter_account_view(999))
+
+        self.assertEqual(set(parts), {'account', 'fee', 'rewards'})
+        self.assertTrue(all(isinstance(result, BankingAPIError) for result in parts.values()))
+
+        with self.assertRaises(BankingAPIError):
+            self.client.get_account_view(999)
+
+    @patch.dict(os.environ, {'ACCOUNT_SERVICE_URL': 'http://localhost:8080/Account_Service/'})
+    def test_from_env(self):
+        """Test URLs are read from the environment."""
+        client = BankingClient.from_env()
+
+        self.assertEqual(client.urls['account'], 'http://localhost:8080/Account_Service')
+        self.assertIn('Fee_Calculation_Service', client.urls['fee'])
+
+if __name__ == '__main__':
+    unittest.main()
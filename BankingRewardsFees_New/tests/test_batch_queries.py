@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add the lambda_functions directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+from batch_queries import is_batch_request, parse_account_selection, fetch_accounts, missing_account_ids
+
+class TestBatchQueries(unittest.TestCase):
+    
+    def test_is_batch_request(self):
+        """Test detection of batch request bodies."""
+        self.assertTrue(is_batch_request({'account_ids': [1]}))
+        self.assertTrue(is_batch_request({'account_id_range': {'start': 1, 'end': 2}}))
+        self.assertFalse(is_batch_request({'account_id': 1}))
+        self.assertFalse(is_batch_request(None))
+    
+    def test_parse_account_ids_dedupes_in_order(self):
+        """Test that ids are converted to int and de-duplicated in request order."""
+        account_ids, id_range = parse_account_selection({'account_ids': ['3', 1, 3, 2]})
+        self.assertEqual(account_ids, [3, 1, 2])
+        self.assertIsNone(id_range)
+    
+    def test_parse_account_id_range(self):
+        """Test parsing of an inclusive id range."""
+        account_ids, id_range = parse_account_selection({'account_id_range': {'start': '5', 'end': 9}})
+        self.assertIsNone(account_ids)
+        self.assertEqual(id_range, (5, 9))
+    
+    def test_parse_rejects_invalid_selection(self):
+        """Test that malformed selections raise ValueError."""
+        for body in [
+            {'account_ids': []},
+            {'account_ids': 'all'},
+            {'account_ids': [None]},
+            {'account_id_range': {'start': 1}},
+            {'account_id_range': {'start': 9, 'end': 5}}
+        ]:
+            with self.assertRaises(ValueError):
+                parse_account_selection(body)
+    
+    def test_parse_rejects_non_integer_ids(self):
+        """Test that floats, booleans and non-numeric strings are not coerced to ids."""
+        for value in [1.5, 2.0, True, False, '1.5', 'abc', {'id': 1}]:
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    parse_account_selection({'account_ids': [1, value]})
+                with self.assertRaises(ValueError):
+                    parse_account_selection({'account_id_range': {'start': value, 'end': 10}})
+                with self.assertRaises(ValueError):
+                    parse_account_selection({'account_id_range': {'start': 0, 'end': value}})
+    
+    def test_missing_account_ids(self):
+        """Test missing ids keep request order for lists and id order for ranges."""
+        self.assertEqual(missing_account_ids([1, 3], account_ids=[3, 7, 1, 5]), [7, 5])
+        self.assertEqual(missing_account_ids([11, 13], id_range=(10, 14)), [10, 12, 14])
+        self.assertEqual(missing_account_ids([], id_range=(4, 4)), [4])
+    
+    @patch('batch_queries.MAX_BATCH_SIZE', 10)
+    def test_parse_rejects_oversized_batch(self):
+        """Test that batches above MAX_BATCH_SIZE are rejected."""
+        with self.assertRaises(ValueError):
+            parse_account_selection({'account_ids': list(range(11))})
+        with self.assertRaises(ValueError):
+            parse_account_selection({'account_id_range': {'start': 1, 'end': 11}})
+    
+    def test_fetch_accounts_chunks_id_lists(self):
+        """Test that long id lists are fetched in chunked IN queries."""
+        mock_cursor = Mock()
+        mock_cursor.fetchall.side_effect = [[{'account_id': 1}], [{'account_id': 5}]]
+        
+        rows = list(fetch_accounts(mock_cursor, 'SELECT * FROM Accounts a', [1, 2, 3, 4, 5], chunk_size=4))
+        
+        self.assertEqual(rows, [{'account_id': 1}, {'account_id': 5}])
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        self.assertEqual(mock_cursor.execute.call_args_list[0][0][1], (1, 2, 3, 4))
+        self.assertEqual(mock_cursor.execute.call_args_list[1][0][1], (5,))
+
+if __name__ == '__main__':
+    unittest.main()
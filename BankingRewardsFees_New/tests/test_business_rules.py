@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import patch
+import random
+import sys
+import os
+
+import numpy as np
+
+# Add the lambda_functions directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+import business_rules
+from business_rules import (
+    DecisionTable, compile_fee_tables,
+    calculate_fee, get_reward_rate, calculate_reward,
+    calculate_fees_array, calculate_rewards_array
+)
+
+class TestBusinessRules(unittest.TestCase):
+    
+    def test_calculate_fee(self):
+        """Test the scalar fee rule including the $5,000 boundary."""
+        self.assertEqual(calculate_fee('premium', 100.00), 0.00)
+        self.assertEqual(calculate_fee('premium', 50000.00), 0.00)
+        self.assertEqual(calculate_fee('standard', 5000.00), 15.00)
+        self.assertEqual(calculate_fee('standard', 5000.01), 5.00)
+        self.assertEqual(calculate_fee('standard', 0.00), 15.00)
+        self.assertEqual(calculate_fee(None, 100.00), 15.00)  # Unknown tier charged as standard
+    
+    def test_calculate_reward(self):
+        """Test the scalar reward rule including the $10,000 boundary."""
+        self.assertEqual(get_reward_rate(10000.00), 0.01)
+        self.assertEqual(get_reward_rate(10000.01), 0.02)
+        self.assertEqual(calculate_reward(15000.00), (0.02, 300.00))
+        self.assertEqual(calculate_reward(10000.00), (0.01, 100.00))
+        self.assertEqual(calculate_reward(1234.56), (0.01, 12.35))
+    
+    def test_fee_array_boundaries(self):
+        """Test the vectorised fee rule on boundary values."""
+        tiers = np.array(['premium', 'standard', 'standard', 'standard'])
+        balances = np.array([100.00, 5000.00, 5000.01, 0.00])
+        
+        fees = calculate_fees_array(tiers, balances)
+        
+        self.assertEqual(fees.tolist(), [0.00, 15.00, 5.00, 15.00])
+    
+    def test_reward_array_half_cent_ties(self):
+        """Test that half-cent rewards round the same way as the scalar API."""
+        balances = np.array([14493.25, 17733.25, 19611.25, 1234.50])
+        
+        rates, rewards = calculate_rewards_array(balances)
+        
+        expected = [calculate_reward(balance) for balance in balances.tolist()]
+        self.assertEqual(rates.tolist(), [rate for rate, _ in expected])
+        self.assertEqual(rewards.tolist(), [reward for _, reward in expected])
+    
+    def test_batch_matches_scalar(self):
+        """Test that the batch API matches the scalar API on random accounts."""
+        rng = random.Random(3)
+        balances = [round(rng.uniform(0, 25000), 2) for _ in range(20000)]
+        tiers = [rng.choice(['premium', 'standard']) for _ in range(20000)]
+        
+        fees = calculate_fees_array(np.array(tiers), np.array(balances))
+        rates, rewards = calculate_rewards_array(np.array(balances))
+        
+        self.assertEqual(fees.tolist(), [calculate_fee(t, b) for t, b in zip(tiers, balances)])
+        expected = [calculate_reward(balance) for balance in balances]
+        self.assertEqual(rates.tolist(), [rate for rate, _ in expected])
+        self.assertEqual(rewards.tolist(), [reward for _, reward in expected])
+
+    def test_decision_table_lookup(self):
+        """Test band lookup with several breakpoints, scalar and batch."""
+        table = DecisionTable([(None, 'a'), (100, 'b'), (1000, 'c'), (5000, 'd')])
+        balances = [0, 100, 100.01, 1000, 4999.99, 5000, 5000.01, 1e9]
+        expected = ['a', 'a', 'b', 'b', 'c', 'c', 'd', 'd']
+        
+        self.assertEqual([table.lookup(b) for b in balances], expected)
+        
+        numeric = DecisionTable([(None, 1.0), (100, 2.0), (1000, 3.0), (5000, 4.0)])
+        self.assertEqual(
+            numeric.lookup_array(np.array(balances)).tolist(),
+            [numeric.lookup(b) for b in balances]
+        )
+    
+    def test_decision_table_rejects_unsorted_bands(self):
+        """Test that bands must start with None and ascend strictly."""
+        with self.assertRaises(ValueError):
+            DecisionTable([(0, 1.0)])
+        with self.assertRaises(ValueError):
+            DecisionTable([(None, 1.0), (500, 2.0), (500, 3.0)])
+        with self.assertRaises(ValueError):
+            DecisionTable([])
+    
+    def test_multi_tier_fee_schedule(self):
+        """Test fee lookup with additional tiers and bands."""
+        tables = compile_fee_tables({
+            'premium': [(None, 0.00)],
+            'gold': [(None, 5.00), (2500, 0.00)],
+            'standard': [(None, 20.00), (1000, 15.00), (5000, 5.00)]
+        })
+        tiers = np.array(['gold', 'gold', 'standard', 'standard', 'standard', 'unknown'], dtype=object)
+        balances = np.array([2500.00, 2500.01, 999.00, 1000.01, 7000.00, 10.00])
+        
+        with patch.object(business_rules, 'FEE_TABLES', tables):
+            scalar = [calculate_fee(t, b) for t, b in zip(tiers, balances.tolist())]
+            batch = calculate_fees_array(tiers, balances).tolist()
+        
+        self.assertEqual(scalar, [5.00, 0.00, 20.00, 15.00, 5.00, 20.00])
+        self.assertEqual(batch, scalar)
+
+if __name__ == '__main__':
+    unittest.main()
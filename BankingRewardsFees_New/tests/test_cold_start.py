@@ -0,0 +1,44 @@
+import unittest
+import os
+import sys
+
+# Add the benchmarks directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from profile_cold_start import HANDLERS, cold_start, profile_imports
+from sqlite_backend import create_database
+
+class TestColdStart(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.db_path = create_database(20)
+    
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.db_path)
+    
+    def test_handlers_cold_start_without_mysql_import(self):
+        """Test each handler in a fresh interpreter: the driver loads on first connect, not at import."""
+        for module_name in HANDLERS:
+            with self.subTest(handler=module_name):
+                timings = cold_start(module_name, self.db_path)
+                
+                self.assertFalse(timings['mysql_loaded_at_import'])
+                self.assertEqual(timings['status_codes'], [200, 200])
+                sys.stderr.write(
+                    f"\n{module_name}: import {timings['import_ms']} ms, first invocation "
+                    f"{timings['first_invocation_ms']} ms, warm {timings['warm_invocation_ms']} ms"
+                )
+    
+    def test_import_profile_excludes_mysql(self):
+        """Test the importtime breakdown covers the handler's own tree."""
+        profile = profile_imports('account_service', top=50)
+        modules = [row['module'] for row in profile['slowest_modules']]
+        
+        self.assertIn('db_connection', modules)
+        self.assertFalse(any(module.startswith('mysql') for module in modules))
+        self.assertGreater(profile['total_ms'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add the lambda_functions directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+import db_connection
+from db_connection import get_connection, reset_connection
+
+class TestDbConnection(unittest.TestCase):
+    
+    def setUp(self):
+        """Start every test without a cached connection."""
+        reset_connection()
+    
+    def tearDown(self):
+        reset_connection()
+    
+    @patch('mysql.connector.connect')
+    def test_connection_is_cached(self, mock_connect):
+        """Test that repeated calls return the same connection."""
+        mock_connect.return_value = Mock()
+        
+        first = get_connection()
+        second = get_connection()
+        
+        self.assertIs(first, second)
+        mock_connect.assert_called_once()
+    
+    @patch('mysql.connector.connect')
+    def test_connect_uses_autocommit(self, mock_connect):
+        """Test that connections are opened in autocommit mode."""
+        mock_connect.return_value = Mock()
+        
+        get_connection()
+        
+        self.assertTrue(mock_connect.call_args.kwargs['autocommit'])
+    
+    @patch('mysql.connector.connect')
+    def test_idle_connection_is_pinged(self, mock_connect):
+        """Test that a connection idle past the interval is health-checked."""
+        mock_conn = Mock()
+        mock_connect.return_value = mock_conn
+        
+        with patch('db_connection.time.monotonic', side_effect=[0.0, 1.0, 1000.0]):
+            get_connection()
+            get_connection()
+            mock_conn.ping.assert_not_called()
+            get_connection()
+        
+        mock_conn.ping.assert_called_once()
+        mock_connect.assert_called_once()
+    
+    @patch('mysql.connector.connect')
+    def test_stale_connection_is_replaced(self, mock_connect):
+        """Test that a connection failing its ping is closed and replaced."""
+        stale_conn = Mock()
+        stale_conn.ping.side_effect = Exception('MySQL server has gone away')
+        fresh_conn = Mock()
+        mock_connect.side_effect = [stale_conn, fresh_conn]
+        
+        with patch('db_connection.time.monotonic', side_effect=[0.0, 1000.0]):
+            get_connection()
+            conn = get_connection()
+        
+        self.assertIs(conn, fresh_conn)
+        stale_conn.close.assert_called_once()
+        self.assertEqual(mock_connect.call_count, 2)
+    
+    @patch('mysql.connector.connect')
+    def test_reset_connection_closes_and_reconnects(self, mock_connect):
+        """Test that reset_connection forces a new connection."""
+        first_conn = Mock()
+        second_conn = Mock()
+        mock_connect.side_effect = [first_conn, second_conn]
+        
+        get_connection()
+        reset_connection()
+        conn = get_connection()
+        
+        first_conn.close.assert_called_once()
+        self.assertIs(conn, second_conn)
+    
+    def test_reset_connection_without_connection(self):
+        """Test that resetting with nothing cached is a no-op."""
+        reset_connection()
+        self.assertIsNone(db_connection._local.connection)
+
+if __name__ == '__main__':
+    unittest.main()
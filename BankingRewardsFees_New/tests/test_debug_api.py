@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Add the project root and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from banking_client import BankingClient
+import debug_api
+from debug_api import parse_mix, run_load, summarize_load
+from stub_server import start_stub_server
+
+class TestLoadGenerator(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        """Start one local stub of the three services for all tests."""
+        cls.server = start_stub_server(num_accounts=20)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+    
+    def setUp(self):
+        self.client = BankingClient(
+            self.server.url('Account_Service'),
+            self.server.url('Fee_Calculation_Service'),
+            self.server.url('Rewards_Calculation_Service'),
+            pool_size=4,
+            retries=0
+        )
+    
+    def tearDown(self):
+        self.client.close()
+        self.server.fail_next = 0
+    
+    def test_parse_mix(self):
+        """Test weighted mix parsing and validation."""
+        self.assertEqual(parse_mix('detail=10,fee=5,reward'), {'detail': 10.0, 'fee': 5.0, 'reward': 1.0})
+        
+        with self.assertRaises(ValueError):
+            parse_mix('detail=1,delete=1')
+        with self.assertRaises(ValueError):
+            parse_mix('detail=0')
+    
+    def test_summarize_load(self):
+        """Test percentiles, error rate and throughput of a sample set."""
+        samples = [(float(ms), ms != 100) for ms in range(1, 101)]
+        
+        stats = summarize_load(samples, elapsed=2.0)
+        
+        self.assertEqual(stats['requests'], 100)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['error_rate'], 0.01)
+        self.assertEqual(stats['throughput_per_s'], 50.0)
+        self.assertEqual(stats['p50_ms'], 51.0)
+        self.assertEqual(stats['p99_ms'], 100.0)
+    
+    def test_run_load_sends_the_request_mix(self):
+        """Test a fixed request budget is spread over every endpoint in the mix."""
+        mix = parse_mix('list=1,detail=4,put=1,fee=2,reward=2')
+        
+        results = run_load(self.client, mix, concurrency=4, total_requests=200, num_accounts=20)
+        
+        self.assertEqual(results['overall']['requests'], 200)
+        self.assertEqual(results['overall']['error_rate'], 0)
+        self.assertEqual(set(results['endpoints']), set(mix))
+        self.assertGreater(results['endpoints']['detail']['requests'], results['endpoints']['list']['requests'])
+        self.assertEqual(results['status_codes'], {'200': 200})
+    
+    def test_run_load_counts_errors(self):
+        """Test that failed requests are reported as errors with their status codes."""
+        self.server.fail_next = 10
+        
+        results = run_load(self.client, parse_mix('detail'), concurrency=2, total_requests=50, num_accounts=20)
+        
+        self.assertEqual(results['overall']['errors'], 10)
+        self.assertEqual(results['endpoints']['detail']['error_rate'], 0.2)
+        self.assertEqual(results['status_codes'], {'503': 10, '200': 40})
+    
+    def test_run_load_records_unexpected_exceptions(self):
+        """Test an exception that is not a requests error is counted and the workers keep going."""
+        with patch.object(self.client, 'get_account_details', side_effect=ValueError('Invalid JSON')):
+            results = run_load(self.client, parse_mix('detail=1,fee=1'), concurrency=2, total_requests=40, num_accounts=20)
+        
+        self.assertEqual(results['overall']['requests'], 40)
+        self.assertEqual(results['endpoints']['detail']['error_rate'], 1)
+        self.assertEqual(results['endpoints']['fee']['errors'], 0)
+        self.assertEqual(results['status_codes']['ValueError'], results['endpoints']['detail']['requests'])
+    
+    def test_debug_client_does_not_retry(self):
+        """Test the shared debug client surfaces every failure instead of retrying it."""
+        adapter = debug_api.client.session.get_adapter(debug_api.ACCOUNT_SERVICE_URL)
+        
+        self.assertEqual(adapter.max_retries.total, 0)
+    
+    def test_run_load_for_duration_with_ramp_up(self):
+        """Test the duration mode stops on time and ramped threads still run."""
+        results = run_load(self.client, parse_mix('fee'), concurrency=4, duration=0.5, num_accounts=20, ramp_up=0.2)
+        
+        self.assertGreater(results['overall']['requests'], 0)
+        self.assertLess(results['elapsed_seconds'], 1.5)
+        self.assertEqual(results['ramp_up_seconds'], 0.2)
+
+if __name__ == '__main__':
+    unittest.main()
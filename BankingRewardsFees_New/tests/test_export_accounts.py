@@ -0,0 +1,80 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import threading
+import urllib.request
+
+# Add the project root, lambda_functions and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from account_service import iter_accounts_ndjson
+from export_accounts import export_to_file, make_server
+from sqlite_backend import SQLiteConnection, create_database
+
+class TestExportAccounts(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create a small SQLite book shared by all tests."""
+        cls.db_path = create_database(120)
+    
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.db_path)
+    
+    def connect(self):
+        return SQLiteConnection(self.db_path)
+    
+    def assert_valid_export(self, data):
+        lines = data.decode().splitlines()
+        accounts = [json.loads(line) for line in lines]
+        self.assertEqual(sorted(a['account_id'] for a in accounts), list(range(1, 121)))
+        keys = [(a['customer_name'], a['customer_id'], a['account_id']) for a in accounts]
+        self.assertEqual(keys, sorted(keys))
+        self.assertTrue(all(isinstance(a['balance'], float) for a in accounts if a['balance']))
+    
+    def test_iter_accounts_ndjson_yields_one_chunk_per_fetch(self):
+        """Test that the export is produced in fetchmany-sized chunks."""
+        conn = self.connect()
+        self.addCleanup(conn.close)
+        
+        chunks = list(iter_accounts_ndjson(conn, chunk_size=50))
+        
+        self.assertEqual([chunk.count(b'\n') for chunk in chunks], [50, 50, 20])
+        self.assert_valid_export(b''.join(chunks))
+    
+    def test_export_to_file(self):
+        """Test the file sink writes every account."""
+        fd, path = tempfile.mkstemp(suffix='.ndjson')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        
+        written = export_to_file(self.connect, path, chunk_size=7)
+        
+        with open(path, 'rb') as f:
+            data = f.read()
+        self.assertEqual(written, len(data))
+        self.assert_valid_export(data)
+    
+    def test_http_server_streams_export(self):
+        """Test the local server streams the export with chunked encoding."""
+        server = make_server(self.connect, 0, chunk_size=25)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        port = server.server_address[1]
+        
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/accounts.ndjson') as response:
+            self.assertEqual(response.headers['Content-Type'], 'application/x-ndjson')
+            self.assertEqual(response.headers['Transfer-Encoding'], 'chunked')
+            data = response.read()
+        
+        self.assert_valid_export(data)
+
+if __name__ == '__main__':
+    unittest.main()
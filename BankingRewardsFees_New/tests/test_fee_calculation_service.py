@@ -8,6 +8,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
 
 from fee_calculation_service import lambda_handler
+from db_connection import reset_connection
 
 class TestFeeCalculationService(unittest.TestCase):
     
@@ -15,8 +16,9 @@ class TestFeeCalculationService(unittest.TestCase):
         """Set up test fixtures before each test method."""
         self.mock_context = Mock()
         self.mock_context.aws_request_id = 'test-request-id'
+        reset_connection()
     
-    @patch('fee_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_fee_premium_customer(self, mock_connect):
         """Test fee calculation for premium customer (should be $0)."""
         # Mock database connection and cursor
@@ -53,9 +55,10 @@ class TestFeeCalculationService(unittest.TestCase):
         # Verify database calls
         mock_cursor.execute.assert_called_once()
         mock_cursor.close.assert_called_once()
-        mock_conn.close.assert_called_once()
+        # Connection is kept warm for the next invocation
+        mock_conn.close.assert_not_called()
     
-    @patch('fee_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_fee_standard_high_balance(self, mock_connect):
         """Test fee calculation for standard customer with high balance (should be $5)."""
         # Mock database connection and cursor
@@ -89,7 +92,7 @@ class TestFeeCalculationService(unittest.TestCase):
         self.assertEqual(response_data['customer_tier'], 'standard')
         self.assertEqual(response_data['balance'], 7500.00)
     
-    @patch('fee_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_fee_standard_low_balance(self, mock_connect):
         """Test fee calculation for standard customer with low balance (should be $15)."""
         # Mock database connection and cursor
@@ -123,7 +126,7 @@ class TestFeeCalculationService(unittest.TestCase):
         self.assertEqual(response_data['customer_tier'], 'standard')
         self.assertEqual(response_data['balance'], 1200.00)
     
-    @patch('fee_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_fee_boundary_balance_5000(self, mock_connect):
         """Test fee calculation for exactly $5000 balance (should be $15)."""
         # Mock database connection and cursor
@@ -157,7 +160,7 @@ class TestFeeCalculationService(unittest.TestCase):
         self.assertEqual(response_data['customer_tier'], 'standard')
         self.assertEqual(response_data['balance'], 5000.00)
     
-    @patch('fee_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_fee_boundary_balance_5001(self, mock_connect):
         """Test fee calculation for $5001 balance (should be $5)."""
         # Mock database connection and cursor
@@ -191,7 +194,7 @@ class TestFeeCalculationService(unittest.TestCase):
         self.assertEqual(response_data['customer_tier'], 'standard')
         self.assertEqual(response_data['balance'], 5001.00)
     
-    @patch('fee_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_fee_zero_balance(self, mock_connect):
         """Test fee calculation for zero balance."""
         # Mock database connection and cursor
@@ -225,7 +228,7 @@ class TestFeeCalculationService(unittest.TestCase):
         self.assertEqual(response_data['customer_tier'], 'standard')
         self.assertEqual(response_data['balance'], 0.00)
     
-    @patch('fee_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_fee_account_not_found(self, mock_connect):
         """Test fee calculation for non-existent account."""
         # Mock database connection and cursor
@@ -271,7 +274,7 @@ class TestFeeCalculationService(unittest.TestCase):
         self.assertIn('error', response_data)
         self.assertEqual(response_data['error'], 'Missing account_id')
     
-    @patch('fee_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_database_connection_error(self, mock_connect):
         """Test database connection error handling."""
         # Mock database connection to raise an exception
@@ -294,7 +297,7 @@ class TestFeeCalculationService(unittest.TestCase):
         self.assertIn('error', response_data)
         self.assertIn('Database connection failed', response_data['error'])
     
-    @patch('fee_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_fee_null_balance(self, mock_connect):
         """Test fee calculation with null balance."""
         # Mock database connection and cursor
@@ -327,5 +330,104 @@ class TestFeeCalculationService(unittest.TestCase):
         self.assertEqual(response_data['calculated_fee'], 15.00)  # Null balance treated as 0
         self.assertEqual(response_data['balance'], 0.00)
 
+    @patch('mysql.connector.connect')
+    def test_calculate_fee_batch(self, mock_connect):
+        """Test batch fee calculation with one missing account."""
+        # Mock database connection and cursor
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            {'account_id': 1, 'balance': 5000.00, 'customer_tier': 'premium'},
+            {'account_id': 2, 'balance': 7500.00, 'customer_tier': 'standard'},
+            {'account_id': 3, 'balance': 1200.00, 'customer_tier': 'standard'}
+        ]
+        
+        # Create batch event (no path account_id)
+        event = {
+            'httpMethod': 'POST',
+            'pathParameters': None,
+            'queryStringParameters': None,
+            'body': json.dumps({'account_ids': [3, 1, 999, 2]})
+        }
+        
+        # Call the lambda handler
+        response = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(response['statusCode'], 200)
+        response_data = json.loads(response['body'])
+        results = response_data['results']
+        self.assertEqual([r['account_id'] for r in results], [3, 1, 999, 2])
+        self.assertEqual(results[0]['calculated_fee'], 15.00)
+        self.assertEqual(results[1]['calculated_fee'], 0.00)
+        self.assertEqual(results[2]['error'], 'Account not found')
+        self.assertEqual(results[3]['calculated_fee'], 5.00)
+        self.assertEqual(response_data['requested'], 4)
+        self.assertEqual(response_data['found'], 3)
+        self.assertEqual(response_data['missing'], [999])
+        self.assertEqual(response_data['total_fees'], 20.00)
+        
+        # One set-based query for the whole batch
+        mock_cursor.execute.assert_called_once()
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('IN (%s, %s, %s, %s)', query)
+        self.assertEqual(params, (3, 1, 999, 2))
+    
+    @patch('mysql.connector.connect')
+    def test_calculate_fee_batch_range(self, mock_connect):
+        """Test batch fee calculation over an account_id range."""
+        # Mock database connection and cursor
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            {'account_id': 10, 'balance': None, 'customer_tier': 'standard'},
+            {'account_id': 12, 'balance': 9000.00, 'customer_tier': 'standard'}
+        ]
+        
+        # Create batch event
+        event = {
+            'httpMethod': 'POST',
+            'pathParameters': None,
+            'queryStringParameters': None,
+            'body': json.dumps({'account_id_range': {'start': 10, 'end': 12}})
+        }
+        
+        # Call the lambda handler
+        response = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(response['statusCode'], 200)
+        response_data = json.loads(response['body'])
+        self.assertEqual(len(response_data['results']), 2)
+        self.assertEqual(response_data['results'][0]['calculated_fee'], 15.00)
+        self.assertEqual(response_data['results'][1]['calculated_fee'], 5.00)
+        # Range mode reports the ids without an account too
+        self.assertEqual(response_data['requested'], 3)
+        self.assertEqual(response_data['missing'], [11])
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertIn('BETWEEN %s AND %s', query)
+        self.assertEqual(params, (10, 12))
+    
+    def test_calculate_fee_batch_invalid_ids(self):
+        """Test batch fee calculation with malformed account_ids."""
+        event = {
+            'httpMethod': 'POST',
+            'pathParameters': None,
+            'queryStringParameters': None,
+            'body': json.dumps({'account_ids': ['abc']})
+        }
+        
+        # Call the lambda handler
+        response = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(response['statusCode'], 400)
+        response_data = json.loads(response['body'])
+        self.assertEqual(response_data['error'], 'account_ids must contain integers')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
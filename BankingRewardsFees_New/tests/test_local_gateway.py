@@ -0,0 +1,179 @@
+import unittest
+from unittest.mock import patch
+import os
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root, lambda_functions and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import account_service
+import db_connection
+import local_gateway
+from banking_client import BankingClient, BankingAPIError
+from local_gateway import LocalGateway, build_event
+from sqlite_backend import create_database, make_connect
+
+class TestBuildEvent(unittest.TestCase):
+    
+    def test_detail_event(self):
+        """Test a detail request maps to the proxy event shape."""
+        route, event = build_event('GET', '/default/Account_Service/7?view=summary', {'Host': 'x'}, b'')
+        
+        self.assertEqual(route, 'Account_Service')
+        self.assertEqual(event['httpMethod'], 'GET')
+        self.assertEqual(event['pathParameters'], {'account_id': '7'})
+        self.assertEqual(event['queryStringParameters'], {'view': 'summary'})
+        self.assertIsNone(event['body'])
+    
+    def test_collection_event(self):
+        """Test a request without an id has no path parameters."""
+        route, event = build_event('POST', '/Fee_Calculation_Service', {}, b'{"account_ids": [1]}')
+        
+        self.assertEqual(route, 'Fee_Calculation_Service')
+        self.assertIsNone(event['pathParameters'])
+        self.assertIsNone(event['queryStringParameters'])
+        self.assertEqual(event['body'], '{"account_ids": [1]}')
+    
+    def test_unknown_route(self):
+        """Test that unknown paths do not map to a handler."""
+        self.assertEqual(build_event('GET', '/Other_Service/1', {}, b''), (None, None))
+        self.assertEqual(build_event('GET', '/Account_Service/1/extra', {}, b''), (None, None))
+
+class TestLocalGateway(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        """Serve a small SQLite book through the gateway for all tests."""
+        cls.db_path = create_database(50)
+        cls.connect = make_connect(cls.db_path)
+        cls.connect_patch = patch('mysql.connector.connect', side_effect=cls.connect)
+        cls.mock_connect = cls.connect_patch.start()
+        cls.gateway = LocalGateway(workers=4)
+        cls.base_url = cls.gateway.start_in_thread()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.gateway.stop()
+        cls.connect_patch.stop()
+        db_connection.reset_connection()
+        os.remove(cls.db_path)
+    
+    def setUp(self):
+        account_service.ACCOUNT_CACHE.clear()
+        self.client = BankingClient(
+            f"{self.base_url}/Account_Service",
+            f"{self.base_url}/Fee_Calculation_Service",
+            f"{self.base_url}/Rewards_Calculation_Service",
+            retries=0
+        )
+    
+    def tearDown(self):
+        self.client.close()
+    
+    def test_account_routes(self):
+        """Test list, detail, summary and balance update through HTTP."""
+        accounts = self.client.get_accounts()
+        self.assertEqual(len(accounts), 50)
+        
+        self.assertEqual(self.client.get_account_details(3)['account_id'], 3)
+        self.assertEqual(set(self.client.get_account_summary(3)), {'account', 'fee', 'rewards'})
+        
+        self.client.update_account_balance(3, 12345.67)
+        self.assertEqual(self.client.get_account_details(3)['balance'], 12345.67)
+    
+    def test_calculation_routes(self):
+        """Test single and batch fee and reward calculations through HTTP."""
+        self.assertEqual(self.client.calculate_fees(4)['calculated_fee'], self.client.get_account_summary(4)['fee']['calculated_fee'])
+        self.assertEqual(self.client.calculate_rewards(4)['reward_rate'], self.client.get_account_summary(4)['rewards']['reward_rate'])
+        
+        response = self.client.request('fee', 'POST', json={'account_ids': [1, 2, 999]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['found'], 2)
+    
+    def test_handler_errors_pass_through(self):
+        """Test that handler status codes and unknown routes reach the client."""
+        with self.assertRaises(BankingAPIError) as context:
+            self.client.get_account_details(999)
+        self.assertEqual(context.exception.status_code, 404)
+        
+        response = self.client.session.get(f"{self.base_url}/Unknown_Service")
+        self.assertEqual(response.status_code, 404)
+    
+    def test_bad_requests_and_handler_failures(self):
+        """Test a non-UTF-8 body, a raising handler and an unknown status each get a response."""
+        response = self.client.session.post(f"{self.base_url}/Fee_Calculation_Service", data=b'\xff\xfe{}')
+        self.assertEqual(response.status_code, 400)
+        
+        def failing_handler(event, context):
+            raise RuntimeError('handler crashed')
+        
+        with patch.dict(local_gateway.ROUTES, {'Account_Service': failing_handler}), patch('sys.stderr'):
+            response = self.client.session.get(f"{self.base_url}/Account_Service/1")
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(response.json(), {'message': 'Internal server error'})
+        
+        unusual = lambda event, context: {'statusCode': 599, 'body': ''}
+        with patch.dict(local_gateway.ROUTES, {'Account_Service': unusual}):
+            response = self.client.session.get(f"{self.base_url}/Account_Service/1")
+        self.assertEqual((response.status_code, response.reason), (599, 'Unknown Status'))
+        
+        # The connection survives all of it
+        self.assertEqual(self.client.get_account_details(2)['account_id'], 2)
+    
+    def raw_exchange(self, data):
+        """Send raw bytes on one connection and read until the gateway closes it"""
+        host, port = self.base_url.rsplit('/', 1)[-1].split(':')
+        with socket.create_connection((host, int(port)), timeout=5) as sock:
+            sock.sendall(data)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        return b''.join(chunks)
+    
+    def test_malformed_request_line_gets_400(self):
+        """Test a request line that is not METHOD TARGET VERSION is answered and the connection closed."""
+        for request_line in (b'GET\r\n', b'GET /Account_Service/1 HTTP/1.1 extra\r\n'):
+            with self.subTest(request_line=request_line):
+                reply = self.raw_exchange(request_line + b'Host: localhost\r\n\r\n')
+                
+                self.assertTrue(reply.startswith(b'HTTP/1.1 400 Bad Request\r\n'))
+                self.assertIn(b'Connection: close\r\n', reply)
+    
+    def test_invalid_content_length_gets_400(self):
+        """Test a non-numeric Content-Length is answered and the connection closed."""
+        reply = self.raw_exchange(b'POST /Fee_Calculation_Service HTTP/1.1\r\nContent-Length: ten\r\n\r\n{}')
+        
+        self.assertTrue(reply.startswith(b'HTTP/1.1 400 Bad Request\r\n'))
+        self.assertIn(b'Connection: close\r\n', reply)
+    
+    def test_oversized_body_closes_keep_alive_connection(self):
+        """Test the unread body of a 413 is not parsed as the next request on the connection."""
+        body = b'GET /Account_Service/1 HTTP/1.1\r\n\r\n' * 4
+        request = b'POST /Fee_Calculation_Service HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % len(body)
+        
+        with patch.object(local_gateway, 'MAX_BODY_SIZE', 16):
+            reply = self.raw_exchange(request + body)
+        
+        self.assertTrue(reply.startswith(b'HTTP/1.1 413 '))
+        self.assertIn(b'Connection: close\r\n', reply)
+        self.assertEqual(reply.count(b'HTTP/1.1 '), 1)
+    
+    def test_concurrent_requests_reuse_db_connections(self):
+        """Test that concurrent requests succeed on at most one DB connection per worker."""
+        connects_before = self.mock_connect.call_count
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: self.client.calculate_rewards(i % 50 + 1), range(80)))
+        
+        self.assertEqual(len(results), 80)
+        self.assertLessEqual(self.mock_connect.call_count - connects_before, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+from unittest.mock import patch, Mock
+import io
+import json
+import os
+import sys
+
+# Add the lambda_functions and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import metrics
+from metrics import InvocationTimer, route_of
+from account_service import lambda_handler as account_handler, ACCOUNT_CACHE
+from fee_calculation_service import lambda_handler as fee_handler
+from db_connection import reset_connection
+from sqlite_backend import create_database, make_connect
+
+class TestInvocationTimer(unittest.TestCase):
+    
+    def test_marks_charge_laps_to_phases(self):
+        """Test each mark charges the time since the previous mark."""
+        with patch('metrics.time.perf_counter', side_effect=[10.0, 10.002, 10.010, 10.011, 10.015]):
+            timer = InvocationTimer('account_service', 'GET /', 'req-1')
+            timer.mark('parse')
+            timer.mark('query')
+            timer.mark('parse')
+            record = timer.record(200)
+        
+        self.assertAlmostEqual(record['parse_ms'], 3.0)
+        self.assertAlmostEqual(record['query_ms'], 8.0)
+        self.assertAlmostEqual(record['serialize_ms'], 4.0)
+        self.assertAlmostEqual(record['total_ms'], 15.0)
+    
+    def test_record_is_embedded_metric_format(self):
+        """Test the record declares every timing as a CloudWatch metric."""
+        timer = InvocationTimer('fee_calculation_service', 'POST /{account_id}', 'req-2')
+        timer.mark('query')
+        record = timer.record(404)
+        
+        directive = record['_aws']['CloudWatchMetrics'][0]
+        self.assertIsInstance(record['_aws']['Timestamp'], int)
+        self.assertEqual(directive['Namespace'], metrics.METRICS_NAMESPACE)
+        self.assertEqual(directive['Dimensions'], [['Service'], ['Service', 'Route']])
+        self.assertEqual({m['Name'] for m in directive['Metrics']}, {'query_ms', 'serialize_ms', 'total_ms'})
+        self.assertTrue(all(m['Unit'] == 'Milliseconds' for m in directive['Metrics']))
+        self.assertEqual(record['Service'], 'fee_calculation_service')
+        self.assertEqual(record['Route'], 'POST /{account_id}')
+        self.assertEqual(record['StatusCode'], 404)
+        self.assertEqual(record['RequestId'], 'req-2')
+    
+    def test_route_of(self):
+        """Test API Gateway style route names."""
+        self.assertEqual(route_of({'httpMethod': 'GET', 'pathParameters': {'account_id': '1'}}), 'GET /{account_id}')
+        self.assertEqual(route_of({'httpMethod': 'POST', 'pathParameters': None}), 'POST /')
+
+class TestHandlerMetrics(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.db_path = create_database(20)
+    
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.db_path)
+    
+    def setUp(self):
+        reset_connection()
+        ACCOUNT_CACHE.clear()
+        self.context = Mock()
+        self.context.aws_request_id = 'test-request-id'
+    
+    def tearDown(self):
+        reset_connection()
+    
+    def invoke(self, handler, event, enabled):
+        """Run a handler against the SQLite book and return (response, stdout lines)"""
+        output = io.StringIO()
+        with patch('mysql.connector.connect', make_connect(self.db_path)), \
+             patch.object(metrics, 'METRICS_ENABLED', enabled), \
+             patch('sys.stdout', output):
+            response = handler(event, self.context)
+        return response, [json.loads(line) for line in output.getvalue().splitlines()]
+    
+    def test_no_output_when_disabled(self):
+        """Test that handlers print nothing with metrics off."""
+        event = {'httpMethod': 'GET', 'pathParameters': {'account_id': '1'}, 'queryStringParameters': None, 'body': None}
+        
+        response, lines = self.invoke(account_handler, event, enabled=False)
+        
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(lines, [])
+    
+    def test_account_detail_phases(self):
+        """Test one EMF line per invocation with every phase of a detail read."""
+        event = {'httpMethod': 'GET', 'pathParameters': {'account_id': '1'}, 'queryStringParameters': None, 'body': None}
+        
+        response, lines = self.invoke(account_handler, event, enabled=True)
+        
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(len(lines), 1)
+        record = lines[0]
+        for phase in ('parse', 'cache', 'connect', 'query', 'serialize'):
+            self.assertIn(f"{phase}_ms", record)
+        self.assertEqual(record['Service'], 'account_service')
+        self.assertEqual(record['Route'], 'GET /{account_id}')
+        self.assertEqual(record['StatusCode'], 200)
+        self.assertEqual(record['RequestId'], 'test-request-id')
+        phase_total = sum(value for name, value in record.items() if name.endswith('_ms') and name != 'total_ms')
+        self.assertAlmostEqual(phase_total, record['total_ms'], delta=0.01)
+    
+    def test_error_responses_are_recorded(self):
+        """Test that early returns still emit their metrics line."""
+        event = {'httpMethod': 'POST', 'pathParameters': None, 'queryStringParameters': None, 'body': None}
+        
+        response, lines = self.invoke(fee_handler, event, enabled=True)
+        
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(lines[0]['StatusCode'], 400)
+        self.assertEqual(lines[0]['Route'], 'POST /')
+    
+    def test_fee_batch_phases(self):
+        """Test that a batch calculation reports query and compute time."""
+        event = {'httpMethod': 'POST', 'pathParameters': None, 'queryStringParameters': None,
+                 'body': json.dumps({'account_id_range': {'start': 1, 'end': 20}})}
+        
+        response, lines = self.invoke(fee_handler, event, enabled=True)
+        
+        self.assertEqual(response['statusCode'], 200)
+        self.assertIn('query_ms', lines[0])
+        self.assertIn('compute_ms', lines[0])
+
+if __name__ == '__main__':
+    unittest.main()
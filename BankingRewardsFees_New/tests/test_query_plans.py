@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import Mock, patch
+import json
+import os
+import re
+import sqlite3
+import sys
+
+# Add the lambda_functions and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import account_service
+from account_service import iter_accounts_ndjson
+from db_connection import reset_connection
+from fee_calculation_service import lambda_handler as fee_handler
+from rewards_calculation_service import lambda_handler as rewards_handler
+from sqlite_backend import INDEXES, SQLiteConnection, create_database
+
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), '..', 'Database')
+
+def plan_problems(conn, query, params=()):
+    """
+    Steps of SQLite's plan for query that read a whole table or sort: a
+    SCAN without an index, a temp B-tree (filesort) or an automatic index.
+    Full scans of an index in its order are how the list queries stream
+    rows, so those pass.
+    """
+    plan = conn.execute('EXPLAIN QUERY PLAN ' + query.replace('%s', '?'), params).fetchall()
+    problems = []
+    for row in plan:
+        detail = row[-1]
+        if (detail.startswith('SCAN') and 'INDEX' not in detail) or 'TEMP B-TREE' in detail or 'AUTOMATIC' in detail:
+            problems.append(detail)
+    return problems
+
+class RecordingConnection(SQLiteConnection):
+    """SQLiteConnection that records every statement its cursors execute"""
+    
+    def __init__(self, database, statements):
+        super().__init__(database)
+        self._statements = statements
+    
+    def cursor(self, *args, **kwargs):
+        cursor = super().cursor(*args, **kwargs)
+        execute = cursor.execute
+        
+        def record(query, params=()):
+            self._statements.append((query, tuple(params or ())))
+            execute(query, params)
+        
+        cursor.execute = record
+        return cursor
+
+class TestQueryPlans(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create a SQLite book with the Database/Tables indexes."""
+        cls.db_path = create_database(2000)
+    
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.db_path)
+    
+    def setUp(self):
+        reset_connection()
+        account_service.ACCOUNT_CACHE.clear()
+        self.addCleanup(reset_connection)
+        self.context = Mock()
+        self.context.aws_request_id = 'test-request-id'
+    
+    def event(self, method, account_id=None, query=None, body=None):
+        return {
+            'httpMethod': method,
+            'pathParameters': {'account_id': str(account_id)} if account_id else None,
+            'queryStringParameters': query,
+            'body': json.dumps(body) if body is not None else None
+        }
+    
+    def handler_statements(self):
+        """Every statement the three handlers run across their routes"""
+        statements = []
+        with patch('mysql.connector.connect', lambda **kwargs: RecordingConnection(self.db_path, statements)):
+            account_handler = account_service.lambda_handler
+            first_page = json.loads(account_handler(self.event('GET', query={'limit': '5'}), self.context)['body'])
+            null_name_cursor = account_service.encode_cursor({'customer_name': None, 'customer_id': 1, 'account_id': 1})
+            requests = [
+                (account_handler, self.event('GET')),
+                (account_handler, self.event('GET', query={'limit': '5', 'cursor': first_page['next_cursor']})),
+                (account_handler, self.event('GET', query={'limit': '5', 'cursor': null_name_cursor})),
+                (account_handler, self.event('GET', 3)),
+                (account_handler, self.event('GET', 4, query={'view': 'summary'})),
+                (account_handler, self.event('PUT', 5, body={'balance': 100.0}))
+            ]
+            for handler in (fee_handler, rewards_handler):
+                requests += [
+                    (handler, self.event('POST', 1)),
+                    (handler, self.event('POST', body={'account_ids': [1, 2, 3]})),
+                    (handler, self.event('POST', body={'account_id_range': {'start': 1, 'end': 50}}))
+                ]
+            for handler, event in requests:
+                self.assertEqual(handler(event, self.context)['statusCode'], 200)
+        
+        conn = RecordingConnection(self.db_path, statements)
+        list(iter_accounts_ndjson(conn))
+        conn.close()
+        return statements
+    
+    def test_handler_queries_use_indexes(self):
+        """Test no handler query falls back to a table scan or a sort."""
+        statements = self.handler_statements()
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        # The PUT statement calls NOW(); only its plan is needed
+        conn.create_function('NOW', 0, lambda: None)
+        
+        # First page, next page (named and NULL name), list, detail, PUT, export and two per calculation service
+        self.assertGreaterEqual(len({query for query, _ in statements}), 13)
+        for query, params in statements:
+            with self.subTest(query=' '.join(query.split())):
+                self.assertEqual(plan_problems(conn, query, params), [])
+    
+    def test_checker_flags_a_missing_index(self):
+        """Test the page query is flagged on a book without the index pack."""
+        db_path = create_database(200, indexes=False)
+        self.addCleanup(os.remove, db_path)
+        conn = sqlite3.connect(db_path)
+        self.addCleanup(conn.close)
+        
+        problems = plan_problems(conn, account_service.PAGE_QUERY.format(where=''), (11,))
+        
+        self.assertIn('USE TEMP B-TREE FOR ORDER BY', problems)
+    
+    def test_ddl_declares_the_tested_indexes(self):
+        """Test the MySQL table DDL and the migration declare the indexes the stand-in uses."""
+        indexes = re.findall(r"CREATE INDEX (\w+) ON (\w+) \(([^)]*)\)", INDEXES)
+        self.assertEqual(len(indexes), 2)
+        with open(os.path.join(DATABASE_DIR, 'Migrations', '001_handler_indexes.sql')) as f:
+            migration = f.read()
+        
+        for name, table, columns in indexes:
+            with open(os.path.join(DATABASE_DIR, 'Tables', f'{table}.sql')) as f:
+                self.assertIn(f"INDEX {name} ({columns})", f.read())
+            self.assertIn(f"ALTER TABLE {table}\n    ADD INDEX {name} ({columns})", migration)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
 
 from rewards_calculation_service import lambda_handler
+from db_connection import reset_connection
 
 class TestRewardsCalculationService(unittest.TestCase):
     
@@ -15,8 +16,9 @@ class TestRewardsCalculationService(unittest.TestCase):
         """Set up test fixtures before each test method."""
         self.mock_context = Mock()
         self.mock_context.aws_request_id = 'test-request-id'
+        reset_connection()
     
-    @patch('rewards_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_rewards_high_balance(self, mock_connect):
         """Test rewards calculation for balance > $10,000 (should be 2%)."""
         # Mock database connection and cursor
@@ -52,9 +54,10 @@ class TestRewardsCalculationService(unittest.TestCase):
         # Verify database calls
         mock_cursor.execute.assert_called_once()
         mock_cursor.close.assert_called_once()
-        mock_conn.close.assert_called_once()
+        # Connection is kept warm for the next invocation
+        mock_conn.close.assert_not_called()
     
-    @patch('rewards_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_rewards_low_balance(self, mock_connect):
         """Test rewards calculation for balance ≤ $10,000 (should be 1%)."""
         # Mock database connection and cursor
@@ -87,7 +90,7 @@ class TestRewardsCalculationService(unittest.TestCase):
         self.assertEqual(response_data['reward_rate'], 0.01)
         self.assertEqual(response_data['balance'], 5000.00)
     
-    @patch('rewards_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_rewards_boundary_balance_10000(self, mock_connect):
         """Test rewards calculation for exactly $10,000 balance (should be 1%)."""
         # Mock database connection and cursor
@@ -120,7 +123,7 @@ class TestRewardsCalculationService(unittest.TestCase):
         self.assertEqual(response_data['reward_rate'], 0.01)
         self.assertEqual(response_data['balance'], 10000.00)
     
-    @patch('rewards_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_rewards_boundary_balance_10001(self, mock_connect):
         """Test rewards calculation for $10,001 balance (should be 2%)."""
         # Mock database connection and cursor
@@ -153,7 +156,7 @@ class TestRewardsCalculationService(unittest.TestCase):
         self.assertEqual(response_data['reward_rate'], 0.02)
         self.assertEqual(response_data['balance'], 10001.00)
     
-    @patch('rewards_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_rewards_zero_balance(self, mock_connect):
         """Test rewards calculation for zero balance."""
         # Mock database connection and cursor
@@ -186,7 +189,7 @@ class TestRewardsCalculationService(unittest.TestCase):
         self.assertEqual(response_data['reward_rate'], 0.01)
         self.assertEqual(response_data['balance'], 0.00)
     
-    @patch('rewards_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_rewards_decimal_precision(self, mock_connect):
         """Test rewards calculation with decimal precision."""
         # Mock database connection and cursor
@@ -219,7 +222,7 @@ class TestRewardsCalculationService(unittest.TestCase):
         self.assertEqual(response_data['reward_rate'], 0.01)
         self.assertEqual(response_data['balance'], 1234.56)
     
-    @patch('rewards_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_rewards_large_balance(self, mock_connect):
         """Test rewards calculation for very large balance."""
         # Mock database connection and cursor
@@ -252,7 +255,7 @@ class TestRewardsCalculationService(unittest.TestCase):
         self.assertEqual(response_data['reward_rate'], 0.02)
         self.assertEqual(response_data['balance'], 100000.00)
     
-    @patch('rewards_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_rewards_account_not_found(self, mock_connect):
         """Test rewards calculation for non-existent account."""
         # Mock database connection and cursor
@@ -298,7 +301,7 @@ class TestRewardsCalculationService(unittest.TestCase):
         self.assertIn('error', response_data)
         self.assertEqual(response_data['error'], 'Missing account_id')
     
-    @patch('rewards_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_database_connection_error(self, mock_connect):
         """Test database connection error handling."""
         # Mock database connection to raise an exception
@@ -321,7 +324,7 @@ class TestRewardsCalculationService(unittest.TestCase):
         self.assertIn('error', response_data)
         self.assertIn('Database connection failed', response_data['error'])
     
-    @patch('rewards_calculation_service.mysql.connector.connect')
+    @patch('mysql.connector.connect')
     def test_calculate_rewards_null_balance(self, mock_connect):
         """Test rewards calculation with null balance."""
         # Mock database connection and cursor
@@ -353,5 +356,93 @@ class TestRewardsCalculationService(unittest.TestCase):
         self.assertEqual(response_data['calculated_reward'], 0.00)  # Null balance treated as 0
         self.assertEqual(response_data['balance'], 0.00)
 
+    @patch('batch_queries.QUERY_CHUNK_SIZE', 2)
+    @patch('mysql.connector.connect')
+    def test_calculate_rewards_batch(self, mock_connect):
+        """Test batch rewards calculation with chunked queries and totals."""
+        # Mock database connection and cursor
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.side_effect = [
+            [{'account_id': 1, 'balance': 15000.00}, {'account_id': 2, 'balance': 5000.00}],
+            [{'account_id': 3, 'balance': None}]
+        ]
+        
+        # Create batch event (no path account_id)
+        event = {
+            'httpMethod': 'POST',
+            'pathParameters': None,
+            'queryStringParameters': None,
+            'body': json.dumps({'account_ids': [1, 2, 3, 4]})
+        }
+        
+        # Call the lambda handler
+        response = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(response['statusCode'], 200)
+        response_data = json.loads(response['body'])
+        results = response_data['results']
+        self.assertEqual(results[0]['calculated_reward'], 300.00)
+        self.assertEqual(results[0]['reward_rate'], 0.02)
+        self.assertEqual(results[1]['calculated_reward'], 50.00)
+        self.assertEqual(results[2]['calculated_reward'], 0.00)
+        self.assertEqual(results[3], {'account_id': 4, 'error': 'Account not found'})
+        self.assertEqual(response_data['requested'], 4)
+        self.assertEqual(response_data['found'], 3)
+        self.assertEqual(response_data['missing'], [4])
+        self.assertEqual(response_data['total_balance'], 20000.00)
+        self.assertEqual(response_data['total_rewards'], 350.00)
+        
+        # Two chunks of at most two ids each
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+    
+    @patch('mysql.connector.connect')
+    def test_calculate_rewards_batch_range(self, mock_connect):
+        """Test batch rewards calculation over an id range reports the ids without an account."""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            {'account_id': 20, 'balance': 1000.00},
+            {'account_id': 23, 'balance': 20000.00}
+        ]
+        event = {
+            'httpMethod': 'POST',
+            'pathParameters': None,
+            'queryStringParameters': None,
+            'body': json.dumps({'account_id_range': {'start': 20, 'end': 23}})
+        }
+        
+        response = lambda_handler(event, self.mock_context)
+        
+        self.assertEqual(response['statusCode'], 200)
+        response_data = json.loads(response['body'])
+        self.assertEqual([r['account_id'] for r in response_data['results']], [20, 23])
+        self.assertEqual(response_data['requested'], 4)
+        self.assertEqual(response_data['found'], 2)
+        self.assertEqual(response_data['missing'], [21, 22])
+        self.assertEqual(response_data['total_rewards'], 410.00)
+    
+    def test_calculate_rewards_batch_range_too_large(self):
+        """Test batch rewards calculation rejects oversized ranges."""
+        event = {
+            'httpMethod': 'POST',
+            'pathParameters': None,
+            'queryStringParameters': None,
+            'body': json.dumps({'account_id_range': {'start': 1, 'end': 10000000}})
+        }
+        
+        # Call the lambda handler
+        response = lambda_handler(event, self.mock_context)
+        
+        # Assertions
+        self.assertEqual(response['statusCode'], 400)
+        response_data = json.loads(response['body'])
+        self.assertIn('At most', response_data['error'])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import patch
+import importlib.util
+import json
+import sys
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+# Add the lambda_functions directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+import serialization
+
+ROW = {
+    'account_id': 7,
+    'balance': Decimal('1234.56'),
+    'zero_balance': Decimal('0.00'),
+    'created_at': datetime(2023, 1, 1, 9, 30),
+    'statement_date': date(2023, 2, 28),
+    'customer_name': 'Zoë',
+    'missing': None
+}
+
+EXPECTED = {
+    'account_id': 7,
+    'balance': 1234.56,
+    'zero_balance': 0.0,
+    'created_at': '2023-01-01T09:30:00',
+    'statement_date': '2023-02-28',
+    'customer_name': 'Zoë',
+    'missing': None
+}
+
+def load_stdlib_backend():
+    """A separate copy of serialization imported as if orjson were not installed"""
+    spec = importlib.util.spec_from_file_location('serialization_stdlib', serialization.__file__)
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, {'orjson': None}):
+        spec.loader.exec_module(module)
+    return module
+
+class TestSerialization(unittest.TestCase):
+    
+    def backends(self):
+        yield serialization
+        yield load_stdlib_backend()
+    
+    def test_database_types_serialize_without_a_pre_pass(self):
+        """Test Decimal, datetime and date columns on both backends."""
+        for backend in self.backends():
+            with self.subTest(backend=backend.BACKEND):
+                self.assertEqual(json.loads(backend.dumps(ROW)), EXPECTED)
+                self.assertEqual(json.loads(backend.dumps_bytes([ROW, {'nested': [ROW]}])), [EXPECTED, {'nested': [EXPECTED]}])
+    
+    def test_backends_agree(self):
+        """Test the stdlib fallback produces the same document as the default backend."""
+        stdlib = load_stdlib_backend()
+        
+        self.assertEqual(stdlib.BACKEND, 'json')
+        self.assertEqual(json.loads(stdlib.dumps(ROW)), json.loads(serialization.dumps(ROW)))
+        self.assertEqual(stdlib.loads('{"balance": 12.5}'), serialization.loads('{"balance": 12.5}'))
+    
+    def test_unknown_types_raise(self):
+        """Test that unsupported values are still an error."""
+        for backend in self.backends():
+            with self.subTest(backend=backend.BACKEND):
+                with self.assertRaises(TypeError):
+                    backend.dumps({'value': object()})
+    
+    def test_json_response(self):
+        """Test the API Gateway response shape and per-response headers."""
+        response = serialization.json_response(200, ROW, headers={'X-Cache': 'HIT'})
+        
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(response['headers'], {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'X-Cache': 'HIT'
+        })
+        self.assertEqual(json.loads(response['body']), EXPECTED)
+        
+        # Responses must not share the default header dict
+        response = serialization.json_response(404, {'error': 'Account not found'})
+        response['headers']['X-Cache'] = 'MISS'
+        self.assertNotIn('X-Cache', serialization.RESPONSE_HEADERS)
+
+if __name__ == '__main__':
+    unittest.main()
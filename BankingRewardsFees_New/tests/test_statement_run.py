@@ -0,0 +1,75 @@
+import unittest
+import csv
+import os
+import sys
+import tempfile
+
+# Add the project root and benchmarks directories to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from statement_run import process_chunk, run_statement
+from sqlite_backend import SQLiteConnection, create_database
+
+class TestStatementRun(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create a small SQLite book shared by all tests."""
+        cls.db_path = create_database(250)
+    
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.db_path)
+    
+    def setUp(self):
+        self.conn = SQLiteConnection(self.db_path)
+        fd, self.output_path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+    
+    def tearDown(self):
+        self.conn.close()
+        os.remove(self.output_path)
+    
+    def read_output(self):
+        with open(self.output_path, newline='') as f:
+            return list(csv.DictReader(f))
+    
+    def test_process_chunk_applies_business_rules(self):
+        """Test fee and reward rules on a chunk of rows."""
+        rows = [
+            (1, 1, 'Alice', 'premium', 15000.00),
+            (2, 2, 'Bob', 'standard', 5000.00),
+            (3, 3, 'Carol', 'standard', 10001.00),
+            (4, 4, 'Dan', 'standard', None)
+        ]
+        
+        statements = process_chunk(rows, '2024-01')
+        
+        self.assertEqual(statements['monthly_fee'], [0.00, 15.00, 5.00, 15.00])
+        self.assertEqual(statements['reward_rate'], [0.02, 0.01, 0.02, 0.01])
+        self.assertEqual(statements['monthly_reward'], [300.00, 50.00, 200.02, 0.00])
+        self.assertEqual(statements['balance'][3], 0.00)
+    
+    def test_run_statement_in_process(self):
+        """Test a full in-process run writes every account in order."""
+        summary = run_statement(self.conn, self.output_path, '2024-01', chunk_size=40, workers=0)
+        
+        rows = self.read_output()
+        self.assertEqual(summary['rows'], 250)
+        self.assertEqual(len(rows), 250)
+        self.assertEqual([int(r['account_id']) for r in rows], list(range(1, 251)))
+        self.assertTrue(all(r['statement_period'] == '2024-01' for r in rows))
+        self.assertGreater(summary['rows_per_second'], 0)
+    
+    def test_run_statement_process_pool_matches_in_process(self):
+        """Test that the process pool produces the same statement file."""
+        run_statement(self.conn, self.output_path, '2024-01', chunk_size=40, workers=0)
+        expected = self.read_output()
+        
+        run_statement(self.conn, self.output_path, '2024-01', chunk_size=40, workers=2)
+        
+        self.assertEqual(self.read_output(), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add the lambda_functions directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lambda_functions'))
+
+from ttl_cache import TTLCache, MISS
+
+class TestTTLCache(unittest.TestCase):
+    
+    def test_get_set_counts_hits_and_misses(self):
+        """Test basic read-through counters."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        
+        self.assertIs(cache.get('a'), MISS)
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 1, 1))
+    
+    def test_entries_expire_after_ttl(self):
+        """Test that an entry older than the TTL is a miss."""
+        cache = TTLCache(maxsize=10, ttl=5)
+        
+        with patch('ttl_cache.time.monotonic', side_effect=[100.0, 104.0, 106.0]):
+            cache.set('a', 1)
+            self.assertEqual(cache.get('a'), 1)
+            self.assertIs(cache.get('a'), MISS)
+        
+        self.assertEqual(cache.stats()['expirations'], 1)
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test LRU eviction when the cache is full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        
+        self.assertIs(cache.get('b'), MISS)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+    
+    def test_invalidate_matching_keys(self):
+        """Test predicate invalidation removes only matching entries."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        cache.set(('account', 1), 'one')
+        cache.set(('account', 2), 'two')
+        cache.set(('list',), ['one', 'two'])
+        
+        cache.invalidate(lambda key: key[0] != 'account' or key[1] == 1)
+        
+        self.assertIs(cache.get(('account', 1)), MISS)
+        self.assertIs(cache.get(('list',)), MISS)
+        self.assertEqual(cache.get(('account', 2)), 'two')
+        self.assertEqual(cache.stats()['invalidations'], 2)
+    
+    def test_set_skipped_after_concurrent_invalidation(self):
+        """Test a value read before an invalidation is not stored after it."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        generation = cache.generation
+        
+        cache.invalidate(lambda key: True)
+        cache.set('a', 'stale', generation)
+        
+        self.assertIs(cache.get('a'), MISS)
+    
+    def test_zero_ttl_disables_cache(self):
+        """Test that ttl=0 never stores values."""
+        cache = TTLCache(maxsize=10, ttl=0)
+        cache.set('a', 1)
+        self.assertIs(cache.get('a'), MISS)
+
+if __name__ == '__main__':
+    unittest.main()
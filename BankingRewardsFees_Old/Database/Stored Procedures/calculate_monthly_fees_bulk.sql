@@ -0,0 +1,16 @@
+DELIMITER $$
+CREATE DEFINER=`admin`@`%` PROCEDURE `CalculateMonthlyFeesBulk`(IN first_id INT, IN last_id INT)
+BEGIN
+    -- Month-end version of CalculateMonthlyFees: the same rules for every
+    -- account in [first_id, last_id] in one statement. NULL bounds mean
+    -- the whole table. Large books can be run in id ranges to keep each
+    -- transaction's row locks and undo small.
+    UPDATE Accounts
+    SET monthly_fees = CASE
+            WHEN customer_tier = 'premium' THEN 0.00
+            WHEN balance > 5000 THEN 5.00
+            ELSE 15.00
+        END
+    WHERE account_id BETWEEN IFNULL(first_id, 0) AND IFNULL(last_id, 2147483647);
+END$$
+DELIMITER ;
\ No newline at end of file
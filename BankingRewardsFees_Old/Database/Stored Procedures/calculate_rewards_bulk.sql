@@ -0,0 +1,15 @@
+DELIMITER $$
+CREATE DEFINER=`admin`@`%` PROCEDURE `CalculateRewardsBulk`(IN first_id INT, IN last_id INT)
+BEGIN
+    -- Month-end version of CalculateRewards: the same rules for every
+    -- account in [first_id, last_id] in one statement. NULL bounds mean
+    -- the whole table. ROUND matches the DECIMAL(10,2) rounding of the
+    -- per-account procedure; a NULL balance still gives NULL rewards.
+    UPDATE Accounts
+    SET monthly_rewards = CASE
+            WHEN balance > 10000 THEN ROUND(balance * 0.02, 2)
+            ELSE ROUND(balance * 0.01, 2)
+        END
+    WHERE account_id BETWEEN IFNULL(first_id, 0) AND IFNULL(last_id, 2147483647);
+END$$
+DELIMITER ;
\ No newline at end of file
@@ -0,0 +1,9 @@
+-- Incremental sync to BankingRewardsFees_New (Old_to_New_Migration/sync.py).
+-- sync.py reads rows past a (updated_at, account_id) high-water mark; this
+-- index turns each poll into a short range scan. updated_at is set only by
+-- writes to synced columns (balance, customer_name, customer_tier), never
+-- ON UPDATE: the month-end fee and reward procedures touch every row, and
+-- would otherwise make the next poll re-copy the whole table.
+ALTER TABLE `Accounts`
+  MODIFY `updated_at` datetime DEFAULT NULL,
+  ADD INDEX `idx_accounts_updated_at` (`updated_at`, `account_id`);
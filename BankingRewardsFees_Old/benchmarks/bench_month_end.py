@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Month-end fee and reward run: one CalculateMonthlyFees and one
+CalculateRewards CALL per account (what app.py does for a single account)
+versus CalculateMonthlyFeesBulk and CalculateRewardsBulk over the same
+id range. Both runs must leave identical monthly_fees/monthly_rewards.
+
+    python benchmarks/bench_month_end.py                          # SQLite stand-in
+    python benchmarks/bench_month_end.py --backend mysql --accounts 5000
+
+--backend mysql uses the SOURCE_DB_* variables of Old_to_New_Migration and
+needs the *_bulk.sql procedures installed. It rewrites monthly_fees and
+monthly_rewards in the range, so point it at a copy of the legacy database.
+
+SQLite has no stored procedures. There the per-account CALL runs the
+procedure body (its SELECTs and UPDATE) as separate statements, and each
+CALL and commit sleeps --round-trip-ms to stand in for the network hop.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'Old_to_New_Migration'))
+
+import sqlite_standin
+from connections import get_db_config, mysql_connect
+
+# Bodies of the *_bulk.sql procedures, for the SQLite stand-in
+BULK_FEES_SQL = """
+    UPDATE Accounts
+    SET monthly_fees = CASE
+            WHEN customer_tier = 'premium' THEN 0.00
+            WHEN balance > 5000 THEN 5.00
+            ELSE 15.00
+        END
+    WHERE account_id BETWEEN %s AND %s
+"""
+BULK_REWARDS_SQL = """
+    UPDATE Accounts
+    SET monthly_rewards = CASE
+            WHEN balance > 10000 THEN ROUND(balance * 0.02, 2)
+            ELSE ROUND(balance * 0.01, 2)
+        END
+    WHERE account_id BETWEEN %s AND %s
+"""
+
+
+class StandinProcedures:
+    """Per-account procedures replayed statement by statement on SQLite"""
+
+    def __init__(self, round_trip):
+        self.round_trip = round_trip
+
+    def _hop(self):
+        if self.round_trip:
+            time.sleep(self.round_trip)
+
+    def call(self, cursor, name, args):
+        self._hop()
+        if name == 'CalculateMonthlyFees':
+            (acc_id,) = args
+            cursor.execute("SELECT customer_tier FROM Accounts WHERE account_id = %s", (acc_id,))
+            (tier,) = cursor.fetchone()
+            cursor.execute("SELECT balance FROM Accounts WHERE account_id = %s", (acc_id,))
+            (balance,) = cursor.fetchone()
+            fee = 0.00 if tier == 'premium' else 5.00 if balance is not None and balance > 5000 else 15.00
+            cursor.execute("UPDATE Accounts SET monthly_fees = %s WHERE account_id = %s", (fee, acc_id))
+        elif name == 'CalculateRewards':
+            (acc_id,) = args
+            cursor.execute("SELECT balance FROM Accounts WHERE account_id = %s", (acc_id,))
+            (balance,) = cursor.fetchone()
+            rate = 0.02 if balance is not None and balance > 10000 else 0.01
+            cursor.execute("UPDATE Accounts SET monthly_rewards = ROUND(%s * %s, 2) WHERE account_id = %s",
+                           (balance, rate, acc_id))
+        elif name == 'CalculateMonthlyFeesBulk':
+            cursor.execute(BULK_FEES_SQL, args)
+        elif name == 'CalculateRewardsBulk':
+            cursor.execute(BULK_REWARDS_SQL, args)
+        else:
+            raise ValueError(f"Unknown procedure {name}")
+
+    def commit(self, conn):
+        self._hop()
+        conn.commit()
+
+
+class MySQLProcedures:
+    """The installed stored procedures"""
+
+    def call(self, cursor, name, args):
+        cursor.callproc(name, list(args))
+
+    def commit(self, conn):
+        conn.commit()
+
+
+def account_range(conn, first_id, num_accounts):
+    """(first_id, last_id) covering num_accounts accounts from first_id, or all of them"""
+    cursor = conn.cursor()
+    try:
+        if first_id is None:
+            cursor.execute("SELECT MIN(account_id) FROM Accounts")
+            (first_id,) = cursor.fetchone()
+        if num_accounts:
+            cursor.execute("SELECT account_id FROM Accounts WHERE account_id >= %s "
+                           "ORDER BY account_id LIMIT 1 OFFSET %s", (first_id, num_accounts - 1))
+            row = cursor.fetchone()
+            if row:
+                return first_id, row[0]
+        cursor.execute("SELECT MAX(account_id) FROM Accounts")
+        return first_id, cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def reset(conn, first_id, last_id):
+    cursor = conn.cursor()
+    cursor.execute("UPDATE Accounts SET monthly_fees = NULL, monthly_rewards = NULL "
+                   "WHERE account_id BETWEEN %s AND %s", (first_id, last_id))
+    conn.commit()
+    cursor.close()
+
+
+def snapshot(conn, first_id, last_id):
+    cursor = conn.cursor()
+    cursor.execute("SELECT account_id, monthly_fees, monthly_rewards FROM Accounts "
+                   "WHERE account_id BETWEEN %s AND %s ORDER BY account_id", (first_id, last_id))
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def run_per_account(conn, procedures, first_id, last_id):
+    """One CALL and commit per account and procedure, as app.py does; returns (seconds, calls)"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT account_id FROM Accounts WHERE account_id BETWEEN %s AND %s ORDER BY account_id",
+                   (first_id, last_id))
+    account_ids = [row[0] for row in cursor.fetchall()]
+    start = time.perf_counter()
+    for account_id in account_ids:
+        for name in ('CalculateMonthlyFees', 'CalculateRewards'):
+            procedures.call(cursor, name, (account_id,))
+            procedures.commit(conn)
+    seconds = time.perf_counter() - start
+    cursor.close()
+    return seconds, 2 * len(account_ids)
+
+
+def run_bulk(conn, procedures, first_id, last_id, chunk_size=None):
+    """The bulk procedures over the range, chunk_size ids per CALL; returns (seconds, calls)"""
+    chunk_size = chunk_size or (last_id - first_id + 1)
+    cursor = conn.cursor()
+    calls = 0
+    start = time.perf_counter()
+    for chunk_start in range(first_id, last_id + 1, chunk_size):
+        chunk_end = min(chunk_start + chunk_size - 1, last_id)
+        for name in ('CalculateMonthlyFeesBulk', 'CalculateRewardsBulk'):
+            procedures.call(cursor, name, (chunk_start, chunk_end))
+            calls += 1
+        procedures.commit(conn)
+    seconds = time.perf_counter() - start
+    cursor.close()
+    return seconds, calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    parser.add_argument('--accounts', type=int, default=5000,
+                        help='accounts in the range (0 = all); also the SQLite book size')
+    parser.add_argument('--first-id', type=int, help='first account_id of the range')
+    parser.add_argument('--chunk-size', type=int, help='account_ids per bulk CALL (default: the whole range)')
+    parser.add_argument('--round-trip-ms', type=float, default=0.5,
+                        help='simulated network hop per CALL/commit for the sqlite backend')
+    args = parser.parse_args()
+
+    path = None
+    if args.backend == 'sqlite':
+        path = sqlite_standin.create_old_database(args.accounts or 5000)
+        connect = sqlite_standin.make_connect(path)
+        procedures = StandinProcedures(args.round_trip_ms / 1000)
+    else:
+        connect = mysql_connect(get_db_config('SOURCE', 'BankingRewardsFees_Old'))
+        procedures = MySQLProcedures()
+
+    conn = connect()
+    try:
+        first_id, last_id = account_range(conn, args.first_id, args.accounts)
+
+        reset(conn, first_id, last_id)
+        per_account_seconds, per_account_calls = run_per_account(conn, procedures, first_id, last_id)
+        per_account_rows = snapshot(conn, first_id, last_id)
+
+        reset(conn, first_id, last_id)
+        bulk_seconds, bulk_calls = run_bulk(conn, procedures, first_id, last_id, args.chunk_size)
+        bulk_rows = snapshot(conn, first_id, last_id)
+    finally:
+        conn.close()
+        if path:
+            os.remove(path)
+
+    results = {
+        'backend': args.backend,
+        'account_range': [first_id, last_id],
+        'accounts': len(bulk_rows),
+        'per_account': {'calls': per_account_calls, 'seconds': round(per_account_seconds, 3)},
+        'bulk': {'calls': bulk_calls, 'seconds': round(bulk_seconds, 3)},
+        'speedup': round(per_account_seconds / bulk_seconds, 1) if bulk_seconds else None,
+        'results_match': per_account_rows == bulk_rows
+    }
+    print(json.dumps(results, indent=2))
+    sys.exit(0 if results['results_match'] else 1)
+
+
+if __name__ == '__main__':
+    main()
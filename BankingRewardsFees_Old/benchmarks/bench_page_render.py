@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Database time per page render of the legacy Streamlit app: a fresh
+connection per helper (the old app.py) versus pooled connections borrowed
+for each block of database calls (db.ConnectionPool, as app.py does now).
+
+Renders cycle through what a user does: view an account, calculate fees,
+calculate rewards, and save a balance (update plus detail re-fetch).
+
+    python benchmarks/bench_page_render.py                  # SQLite stand-in
+    python benchmarks/bench_page_render.py --backend mysql  # uses DB_* env vars; writes balances
+
+The SQLite backend sleeps --connect-latency-ms per new connection to stand
+in for the MySQL/TLS handshake, and replays the stored procedures as in
+bench_month_end.py.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'Old_to_New_Migration'))
+
+import db
+import sqlite_standin
+from bench_month_end import StandinProcedures
+
+SCENARIOS = ['view', 'fees', 'rewards', 'save']
+WRITES = {db.calculate_fees, db.calculate_rewards, db.update_account_balance}
+
+
+def render_blocks(scenario, account_id):
+    """
+    The helper calls one render makes, in app.py order, grouped by the
+    pooled borrow that runs them: (helper, *args) tuples per block.
+    """
+    blocks = [[(db.get_accounts,)]]
+    if scenario == 'fees':
+        blocks.append([(db.calculate_fees, account_id)])
+    elif scenario == 'rewards':
+        blocks.append([(db.calculate_rewards, account_id)])
+    blocks.append([(db.get_account_details, account_id)])
+    if scenario == 'save':
+        # The save and its re-fetch share one borrow
+        blocks.append([(db.update_account_balance, account_id, float(account_id)),
+                       (db.get_account_details, account_id)])
+    return blocks
+
+
+def render_connection_per_helper(connect, scenario, account_id, counter):
+    for block in render_blocks(scenario, account_id):
+        for helper, *args in block:
+            conn = connect()
+            counter['connections'] += 1
+            try:
+                helper(conn, *args)
+                if helper in WRITES:
+                    conn.commit()
+            finally:
+                conn.close()
+
+
+def render_pooled(pool, scenario, account_id):
+    for block in render_blocks(scenario, account_id):
+        with pool.connection() as conn:
+            for helper, *args in block:
+                helper(conn, *args)
+
+
+def standin_connect(path, connect_latency):
+    """StandinConnection with a simulated handshake and callproc"""
+    procedures = StandinProcedures(0)
+
+    def connect():
+        time.sleep(connect_latency)
+        conn = sqlite_standin.StandinConnection(path)
+        make_cursor = conn.cursor
+
+        def cursor(*args, **kwargs):
+            cursor = make_cursor(*args, **kwargs)
+            cursor.callproc = lambda name, args: procedures.call(cursor, name, args)
+            return cursor
+
+        conn.cursor = cursor
+        return conn
+    return connect
+
+
+def timed(renders, render_one):
+    latencies = []
+    for scenario, account_id in renders:
+        start = time.perf_counter()
+        render_one(scenario, account_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+    return {
+        'renders': len(ordered),
+        'mean_ms': round(statistics.mean(ordered), 3),
+        'p50_ms': round(ordered[len(ordered) // 2], 3),
+        'p95_ms': round(ordered[int(len(ordered) * 0.95) - 1], 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['sqlite', 'mysql'], default='sqlite')
+    parser.add_argument('--renders', type=int, default=400)
+    parser.add_argument('--accounts', type=int, default=1000, help='SQLite book size')
+    parser.add_argument('--connect-latency-ms', type=float, default=20.0,
+                        help='simulated handshake cost for the sqlite backend')
+    args = parser.parse_args()
+
+    path = None
+    if args.backend == 'sqlite':
+        path = sqlite_standin.create_old_database(args.accounts)
+        connect = standin_connect(path, args.connect_latency_ms / 1000)
+    else:
+        connect = db.mysql_connect(db.get_db_config())
+
+    conn = connect()
+    account_ids = [row['account_id'] for row in db.get_accounts(conn)]
+    conn.close()
+    rng = random.Random(7)
+    renders = [(SCENARIOS[i % len(SCENARIOS)], rng.choice(account_ids)) for i in range(args.renders)]
+
+    counter = {'connections': 0}
+    pool = db.ConnectionPool(connect)
+    try:
+        before = timed(renders, lambda scenario, account_id:
+                       render_connection_per_helper(connect, scenario, account_id, counter))
+        after = timed(renders, lambda scenario, account_id: render_pooled(pool, scenario, account_id))
+    finally:
+        pool.close_all()
+        if path:
+            os.remove(path)
+
+    results = {
+        'backend': args.backend,
+        'connection_per_helper': {**summarize(before), 'connections_opened': counter['connections']},
+        'pooled': {**summarize(after), 'connections_opened': pool.connections_opened}
+    }
+    results['speedup_mean'] = round(results['connection_per_helper']['mean_ms'] / results['pooled']['mean_ms'], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+# File: BankingRewardsFees_Old/db.py
+"""
+Database access for the legacy Streamlit app.
+
+Every page render used to open and close a MySQL connection inside each
+helper, several per render. Now the page borrows connections from a
+process-wide ConnectionPool and passes them to the helpers. Each borrow is
+one short transaction around the database calls only, committed as soon
+as the block ends, so no transaction or row lock is held while Streamlit
+draws widgets. A balance save and the detail re-fetch that follows it
+share one borrow, so they run on the same connection and transaction.
+"""
+
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+# Seconds a render waits for a free connection before giving up
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '10'))
+# An idle pooled connection older than this (seconds) is pinged before reuse
+HEALTHCHECK_INTERVAL = float(os.environ.get('DB_HEALTHCHECK_INTERVAL', '30'))
+
+
+def get_db_config():
+    """Connection settings for the BankingRewardsFees_Old database"""
+    return {
+        'host': os.environ.get('DB_HOST', 'database-2.crq7shsasjo0.us-west-2.rds.amazonaws.com'),
+        'user': os.environ.get('DB_USER', 'admin'),
+        'password': os.environ.get('DB_PASSWORD', 'demo1234!'),
+        'database': os.environ.get('DB_NAME', 'BankingRewardsFees_Old')
+    }
+
+
+def mysql_connect(config):
+    """connect() callable for the pool"""
+    def connect():
+        import mysql.connector
+        return mysql.connector.connect(**config)
+    return connect
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    """
+    Up to size connections made by connect(), shared between Streamlit
+    sessions. Idle connections are reused most-recently-used first, and a
+    borrower waits up to timeout seconds when all of them are in use.
+    """
+
+    def __init__(self, connect, size=POOL_SIZE, timeout=POOL_TIMEOUT):
+        self._connect = connect
+        self._timeout = timeout
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self.connections_opened = 0
+
+    def acquire(self):
+        if not self._slots.acquire(timeout=self._timeout):
+            raise TimeoutError(f"No database connection free after {self._timeout} s")
+        try:
+            while True:
+                try:
+                    conn, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    self.connections_opened += 1
+                    return self._connect()
+                if time.monotonic() - last_used <= HEALTHCHECK_INTERVAL:
+                    return conn
+                try:
+                    conn.ping(reconnect=False)
+                    return conn
+                except Exception:
+                    _close_quietly(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn, discard=False):
+        if discard:
+            _close_quietly(conn)
+        else:
+            self._idle.put((conn, time.monotonic()))
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for one unit of work. It is rolled back (and
+        dropped if that fails) when the block raises an error, and committed
+        otherwise. Streamlit's rerun/stop signals derive from BaseException,
+        not Exception, and still commit: they are not failures.
+        """
+        conn = self.acquire()
+        discard = False
+        failed = False
+        try:
+            yield conn
+        except Exception:
+            failed = True
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            try:
+                if not failed:
+                    conn.commit()
+            except Exception:
+                discard = True
+                raise
+            finally:
+                self.release(conn, discard)
+
+    def close_all(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _close_quietly(conn)
+
+
+# ---- Queries used by the page; the caller owns the transaction ----
+
+def get_accounts(conn):
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT account_id, customer_name FROM Accounts")
+    accounts = cursor.fetchall()
+    cursor.close()
+    return accounts
+
+
+def get_account_details(conn, account_id):
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM Accounts WHERE account_id = %s", (account_id,))
+    account = cursor.fetchone()
+    cursor.close()
+    return account
+
+
+def calculate_fees(conn, account_id):
+    cursor = conn.cursor()
+    cursor.callproc("CalculateMonthlyFees", [account_id])
+    cursor.close()
+
+
+def calculate_rewards(conn, account_id):
+    cursor = conn.cursor()
+    cursor.callproc("CalculateRewards", [account_id])
+    cursor.close()
+
+
+def update_account_balance(conn, account_id, new_balance):
+    cursor = conn.cursor()
+    cursor.execute("UPDATE Accounts SET balance = %s, updated_at = NOW() WHERE account_id = %s", (new_balance, account_id))
+    cursor.close()
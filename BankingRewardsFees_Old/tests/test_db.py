@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import Mock, patch
+import os
+import sys
+import threading
+
+# Add the legacy app directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import db
+from db import ConnectionPool
+
+class ScriptControl(BaseException):
+    """Stands in for Streamlit's RerunException/StopException"""
+
+class TestConnectionPool(unittest.TestCase):
+    
+    def setUp(self):
+        self.opened = []
+        
+        def connect():
+            conn = Mock()
+            self.opened.append(conn)
+            return conn
+        
+        self.connect = connect
+    
+    def test_connection_is_returned_and_reused(self):
+        """Test a borrowed connection is committed, returned and handed out again."""
+        pool = ConnectionPool(self.connect, size=2)
+        
+        with pool.connection() as first:
+            first.cursor()
+        with pool.connection() as second:
+            pass
+        
+        self.assertIs(first, second)
+        self.assertEqual(pool.connections_opened, 1)
+        self.assertEqual(first.commit.call_count, 2)
+        first.rollback.assert_not_called()
+    
+    def test_error_rolls_back(self):
+        """Test an error inside the block rolls back instead of committing."""
+        pool = ConnectionPool(self.connect, size=1)
+        
+        with self.assertRaises(RuntimeError):
+            with pool.connection() as conn:
+                raise RuntimeError('query failed')
+        
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        # The connection went back to the pool
+        with pool.connection() as again:
+            self.assertIs(again, conn)
+    
+    def test_failed_rollback_discards_the_connection(self):
+        """Test a connection that cannot roll back is closed, not reused."""
+        pool = ConnectionPool(self.connect, size=1)
+        
+        with self.assertRaises(RuntimeError):
+            with pool.connection() as conn:
+                conn.rollback.side_effect = OSError('connection lost')
+                raise RuntimeError('query failed')
+        
+        conn.close.assert_called_once()
+        with pool.connection() as fresh:
+            self.assertIsNot(fresh, conn)
+        self.assertEqual(pool.connections_opened, 2)
+    
+    def test_script_control_commits(self):
+        """Test a Streamlit rerun/stop (a BaseException) does not roll back a write."""
+        pool = ConnectionPool(self.connect, size=1)
+        
+        with self.assertRaises(ScriptControl):
+            with pool.connection() as conn:
+                raise ScriptControl()
+        
+        conn.commit.assert_called_once()
+        conn.rollback.assert_not_called()
+    
+    def test_exhausted_pool_times_out(self):
+        """Test a borrower waits at most timeout seconds when every connection is in use."""
+        pool = ConnectionPool(self.connect, size=1, timeout=0.05)
+        
+        with pool.connection():
+            with self.assertRaises(TimeoutError):
+                pool.acquire()
+        # Returning the connection frees the slot
+        with pool.connection():
+            pass
+        self.assertEqual(pool.connections_opened, 1)
+    
+    def test_waiting_borrower_gets_released_connection(self):
+        """Test a borrower blocked on a full pool proceeds once a connection is returned."""
+        pool = ConnectionPool(self.connect, size=1, timeout=5)
+        conn = pool.acquire()
+        borrowed = []
+        waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire()))
+        waiter.start()
+        
+        pool.release(conn)
+        waiter.join(timeout=5)
+        
+        self.assertEqual(borrowed, [conn])
+    
+    def test_stale_connection_is_replaced(self):
+        """Test an idle connection that fails its ping is closed and replaced."""
+        pool = ConnectionPool(self.connect, size=1)
+        with pool.connection() as stale:
+            stale.ping.side_effect = OSError('gone away')
+        
+        with patch.object(db, 'HEALTHCHECK_INTERVAL', -1):
+            with pool.connection() as conn:
+                self.assertIsNot(conn, stale)
+        
+        stale.close.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
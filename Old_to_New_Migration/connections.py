@@ -0,0 +1,44 @@
+"""
+Connection factories for the migration tools: the legacy database is the
+source, the microservices database is the target. Settings come from
+SOURCE_DB_* and TARGET_DB_* environment variables, and --sqlite OLD NEW
+swaps both for the local SQLite stand-ins.
+"""
+
+import os
+
+DEFAULT_HOST = 'database-2.crq7shsasjo0.us-west-2.rds.amazonaws.com'
+
+
+def get_db_config(prefix, default_database):
+    """mysql.connector settings from {prefix}_DB_HOST/_USER/_PASSWORD/_NAME"""
+    return {
+        'host': os.environ.get(f'{prefix}_DB_HOST', DEFAULT_HOST),
+        'user': os.environ.get(f'{prefix}_DB_USER', 'admin'),
+        'password': os.environ.get(f'{prefix}_DB_PASSWORD', 'demo1234!'),
+        'database': os.environ.get(f'{prefix}_DB_NAME', default_database)
+    }
+
+
+def mysql_connect(config):
+    def connect():
+        # Imported on first use so --sqlite runs need no MySQL driver
+        import mysql.connector
+        return mysql.connector.connect(**config)
+    return connect
+
+
+def add_connection_arguments(parser):
+    parser.add_argument('--sqlite', nargs=2, metavar=('OLD_DB', 'NEW_DB'),
+                        help='use local SQLite stand-ins instead of MySQL')
+
+
+def connect_factories(args):
+    """(source_connect, target_connect) for the parsed command line"""
+    if args.sqlite:
+        from sqlite_standin import make_connect
+        return make_connect(args.sqlite[0]), make_connect(args.sqlite[1])
+    return (
+        mysql_connect(get_db_config('SOURCE', 'BankingRewardsFees_Old')),
+        mysql_connect(get_db_config('TARGET', 'BankingRewardsFees_New'))
+    )
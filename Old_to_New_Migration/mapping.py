@@ -0,0 +1,96 @@
+"""
+Loader for data_mapping.json, the description of how the legacy Accounts
+table splits into the new Customers and Accounts tables.
+
+The mapping lists, per target table, which legacy columns feed which target
+columns. Customers are identified by their non-timestamp columns (name and
+tier today); the legacy schema repeats them on every account, so one
+customer row stands for all accounts sharing that key. The new
+Accounts.customer_id is not in the mapping: it is the id assigned to the
+account's customer key.
+"""
+
+import json
+import os
+
+DEFAULT_MAPPING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_mapping.json')
+
+CUSTOMERS_TABLE = 'Customers'
+ACCOUNTS_TABLE = 'Accounts'
+
+# Per-customer aggregate of the timestamp columns across its legacy rows
+TIMESTAMP_AGGREGATES = {'created_at': min, 'updated_at': max}
+
+
+class TableMapping:
+    """Column pairs (source_column, target_column) for one target table"""
+
+    def __init__(self, source_table, target_table, columns):
+        self.source_table = source_table
+        self.target_table = target_table
+        self.columns = [(column['source_column'], column['target_column']) for column in columns]
+
+    @property
+    def source_columns(self):
+        return [source for source, _ in self.columns]
+
+    @property
+    def target_columns(self):
+        return [target for _, target in self.columns]
+
+
+class Mapping:
+    """The parsed mapping for the legacy Accounts -> Customers/Accounts split"""
+
+    def __init__(self, document):
+        self.source_schema = document.get('source_schema')
+        self.target_schema = document.get('target_schema')
+        self.deprecated_columns = document.get('deprecated_columns', [])
+
+        tables = {table['target_table']: TableMapping(table['source_table'], table['target_table'], table['columns'])
+                  for table in document.get('tables', [])}
+        missing = {CUSTOMERS_TABLE, ACCOUNTS_TABLE} - set(tables)
+        if missing:
+            raise ValueError(f"Mapping has no columns for {', '.join(sorted(missing))}")
+
+        self.customers = tables[CUSTOMERS_TABLE]
+        self.accounts = tables[ACCOUNTS_TABLE]
+        if self.customers.source_table != self.accounts.source_table:
+            raise ValueError('Customers and Accounts must be mapped from the same source table')
+        self.source_table = self.accounts.source_table
+
+        if ('account_id', 'account_id') not in self.accounts.columns:
+            raise ValueError('Mapping must carry account_id through to Accounts.account_id')
+
+        # Customer identity: the mapped columns that are not aggregated timestamps
+        self.customer_key = [(source, target) for source, target in self.customers.columns
+                             if target not in TIMESTAMP_AGGREGATES]
+        if not self.customer_key:
+            raise ValueError('Customers mapping needs at least one non-timestamp column to identify a customer')
+        self.customer_timestamps = [(source, target) for source, target in self.customers.columns
+                                    if target in TIMESTAMP_AGGREGATES]
+
+    @property
+    def customer_key_sources(self):
+        return [source for source, _ in self.customer_key]
+
+    @property
+    def customer_key_targets(self):
+        return [target for _, target in self.customer_key]
+
+    def customer_key_of(self, row):
+        """Customer identity of a legacy row (dict keyed by source column)"""
+        return tuple(row[source] for source in self.customer_key_sources)
+
+    def source_columns(self):
+        """Every legacy column the mapping reads, in a stable order"""
+        columns = []
+        for source in self.accounts.source_columns + self.customers.source_columns:
+            if source not in columns:
+                columns.append(source)
+        return columns
+
+
+def load_mapping(path=DEFAULT_MAPPING_PATH):
+    with open(path) as f:
+        return Mapping(json.load(f))
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Bulk migration of BankingRewardsFees_Old.Accounts into the
+BankingRewardsFees_New Customers and Accounts tables, driven by
+data_mapping.json.
+
+The legacy table is read in account_id ranges ("chunks"). Each chunk is a
+primary-key range scan and is streamed with fetchmany.
+
+1. Customers: every chunk is scanned for distinct customer keys (name,
+   tier), in parallel. The keys are merged in account_id order so customer
+   ids are assigned deterministically, continuing after any customers
+   already in the target, and new customers are bulk inserted.
+2. Accounts: chunks are loaded in parallel, one transaction per chunk:
+   delete the chunk's range in the target, then batched executemany inserts.
+   Deleting first makes a chunk safe to re-run after a crash.
+
+With --checkpoint, the finished phases and chunks are recorded in a JSON
+file. Re-running with the same file skips them, so an interrupted migration
+resumes where it stopped.
+
+    python migrate.py --workers 8 --chunk-size 20000 --checkpoint migration.json
+    python migrate.py --sqlite old.db new.db --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from connections import add_connection_arguments, connect_factories
+from mapping import DEFAULT_MAPPING_PATH, TIMESTAMP_AGGREGATES, load_mapping
+
+DEFAULT_CHUNK_SIZE = 10000   # account_ids per chunk
+DEFAULT_BATCH_SIZE = 1000    # rows per fetchmany / executemany
+DEFAULT_WORKERS = 4
+
+
+def quote(identifier):
+    """Backtick-quote a table or column name taken from the mapping file"""
+    if '`' in identifier:
+        raise ValueError(f"Invalid identifier in mapping: {identifier!r}")
+    return f"`{identifier}`"
+
+
+def column_list(columns):
+    return ', '.join(quote(column) for column in columns)
+
+
+def account_id_bounds(conn, table):
+    """(lowest, highest) account_id in table, or (None, None) when it is empty"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT MIN(account_id), MAX(account_id) FROM {quote(table)}")
+        return tuple(cursor.fetchone())
+    finally:
+        cursor.close()
+
+
+def split_range(low, high, chunk_size):
+    """[(start, end), ...] half-open ranges of chunk_size ids covering low..high"""
+    if low is None:
+        return []
+    return [(start, min(start + chunk_size, high + 1)) for start in range(low, high + 1, chunk_size)]
+
+
+def plan_chunks(conn, table, chunk_size):
+    """[(start, end), ...] half-open account_id ranges covering the table"""
+    return split_range(*account_id_bounds(conn, table), chunk_size)
+
+
+class ConnectionPerThread:
+    """Lazily opens one connection per worker thread and closes them all at the end"""
+
+    def __init__(self, connect):
+        self._connect = connect
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def get(self):
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = self._local.connection = self._connect()
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close_all(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+def run_parallel(chunks, work, workers):
+    """
+    Yield ((start, end), work(start, end)) as chunks finish on a thread pool.
+    The first failure cancels chunks that have not started and is re-raised
+    once running chunks finish.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(work, start, end): (start, end) for start, end in chunks}
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def write_json_atomic(path, data):
+    """Write then rename, so a crash never leaves a half-written file"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+
+class Checkpoint:
+    """
+    Progress file for resumable runs: whether customers are loaded and
+    which account chunks are committed. Without a path it only lives in memory.
+    """
+
+    def __init__(self, path, chunk_size):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {'chunk_size': chunk_size, 'customers_done': False, 'completed_chunks': []}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+            if self.state['chunk_size'] != chunk_size:
+                raise ValueError(
+                    f"Checkpoint {path} was written with chunk size {self.state['chunk_size']}, not {chunk_size}"
+                )
+        self.completed = set(self.state['completed_chunks'])
+
+    @property
+    def customers_done(self):
+        return self.state['customers_done']
+
+    def mark_customers_done(self):
+        with self._lock:
+            self.state['customers_done'] = True
+            self._save()
+
+    def mark_chunk_done(self, start):
+        with self._lock:
+            self.completed.add(start)
+            self.state['completed_chunks'] = sorted(self.completed)
+            self._save()
+
+    def _save(self):
+        if self.path:
+            write_json_atomic(self.path, self.state)
+
+
+def _aggregate(combine, current, value):
+    if current is None:
+        return value
+    if value is None:
+        return current
+    return combine(current, value)
+
+
+def scan_customers(conn, mapping, start, end, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Distinct customer keys in one account_id range, in first-seen order,
+    with their timestamp columns aggregated ({key: {target_column: value}}).
+    """
+    key_size = len(mapping.customer_key)
+    timestamps = mapping.customer_timestamps
+    cursor = conn.cursor()
+    customers = {}
+    try:
+        cursor.execute(
+            f"SELECT {column_list(mapping.customer_key_sources + [source for source, _ in timestamps])} "
+            f"FROM {quote(mapping.source_table)} WHERE account_id >= %s AND account_id < %s ORDER BY account_id",
+            (start, end)
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                key = row[:key_size]
+                values = customers.get(key)
+                if values is None:
+                    customers[key] = {target: row[key_size + i] for i, (_, target) in enumerate(timestamps)}
+                else:
+                    for i, (_, target) in enumerate(timestamps):
+                        values[target] = _aggregate(TIMESTAMP_AGGREGATES[target], values[target], row[key_size + i])
+    finally:
+        cursor.close()
+    return customers
+
+
+def merge_customers(merged, customers):
+    """Fold one chunk's scan_customers result into merged"""
+    for key, values in customers.items():
+        current = merged.get(key)
+        if current is None:
+            merged[key] = values
+        else:
+            for target, value in values.items():
+                current[target] = _aggregate(TIMESTAMP_AGGREGATES[target], current[target], value)
+
+
+def load_customer_ids(conn, mapping):
+    """{customer key: customer_id} for every customer already in the target"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT customer_id, {column_list(mapping.customer_key_targets)} FROM Customers")
+        return {tuple(row[1:]): row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def insert_customers(conn, mapping, customers, customer_ids, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Assign ids to the customers not yet in the target and insert them in
+    one transaction. Updates customer_ids in place; returns rows inserted.
+    """
+    timestamp_targets = [target for _, target in mapping.customer_timestamps]
+    next_id = max(customer_ids.values(), default=0) + 1
+    rows = []
+    for key, values in customers.items():
+        if key not in customer_ids:
+            customer_ids[key] = next_id
+            rows.append((next_id, *key, *(values[target] for target in timestamp_targets)))
+            next_id += 1
+
+    columns = ['customer_id'] + mapping.customer_key_targets + timestamp_targets
+    query = (f"INSERT INTO Customers ({column_list(columns)}) "
+             f"VALUES ({', '.join(['%s'] * len(columns))})")
+    cursor = conn.cursor()
+    try:
+        for i in range(0, len(rows), batch_size):
+            cursor.executemany(query, rows[i:i + batch_size])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+def load_account_chunk(source, target, mapping, customer_ids, start, end, batch_size=DEFAULT_BATCH_SIZE):
+    """Copy one account_id range into the target Accounts table in one transaction; returns rows loaded"""
+    account_columns = mapping.accounts.columns
+    key_size = len(mapping.customer_key)
+    account_id_index = key_size + mapping.accounts.source_columns.index('account_id')
+    insert = (f"INSERT INTO Accounts ({column_list([target for _, target in account_columns] + ['customer_id'])}) "
+              f"VALUES ({', '.join(['%s'] * (len(account_columns) + 1))})")
+
+    read = source.cursor()
+    write = target.cursor()
+    loaded = 0
+    try:
+        read.execute(
+            f"SELECT {column_list(mapping.customer_key_sources + [source for source, _ in account_columns])} "
+            f"FROM {quote(mapping.source_table)} WHERE account_id >= %s AND account_id < %s ORDER BY account_id",
+            (start, end)
+        )
+        # Replacing the whole range makes a chunk that committed before a crash safe to load again
+        write.execute("DELETE FROM Accounts WHERE account_id >= %s AND account_id < %s", (start, end))
+        while True:
+            rows = read.fetchmany(batch_size)
+            if not rows:
+                break
+            batch = []
+            for row in rows:
+                try:
+                    customer_id = customer_ids[row[:key_size]]
+                except KeyError:
+                    raise RuntimeError(
+                        f"Account {row[account_id_index]} has a customer missing from Customers "
+                        "(the legacy table changed after customers were loaded); re-run without --checkpoint"
+                    )
+                batch.append((*row[key_size:], customer_id))
+            write.executemany(insert, batch)
+            loaded += len(batch)
+        target.commit()
+    except Exception:
+        target.rollback()
+        raise
+    finally:
+        read.close()
+        write.close()
+    return loaded
+
+
+def migrate(source_connect, target_connect, mapping=None, chunk_size=DEFAULT_CHUNK_SIZE,
+            batch_size=DEFAULT_BATCH_SIZE, workers=DEFAULT_WORKERS, checkpoint_path=None, progress=None):
+    """
+    Run (or resume) the migration; returns a summary dict.
+    source_connect and target_connect are zero-argument connection factories;
+    progress(phase, done, total) is called as chunks finish.
+    """
+    mapping = mapping or load_mapping()
+    checkpoint = Checkpoint(checkpoint_path, chunk_size)
+    sources = ConnectionPerThread(source_connect)
+    targets = ConnectionPerThread(target_connect)
+    started = time.perf_counter()
+    summary = {'customers_inserted': 0, 'accounts_loaded': 0, 'chunks_skipped': 0}
+
+    try:
+        chunks = plan_chunks(sources.get(), mapping.source_table, chunk_size)
+        summary['chunks'] = len(chunks)
+
+        if checkpoint.customers_done:
+            customer_ids = load_customer_ids(targets.get(), mapping)
+        else:
+            scans = {}
+            for (start, _), customers in run_parallel(
+                chunks, lambda start, end: scan_customers(sources.get(), mapping, start, end, batch_size), workers
+            ):
+                scans[start] = customers
+                if progress:
+                    progress('customers', len(scans), len(chunks))
+            merged = {}
+            for start, _ in chunks:
+                merge_customers(merged, scans.pop(start))
+
+            customer_ids = load_customer_ids(targets.get(), mapping)
+            summary['customers_inserted'] = insert_customers(targets.get(), mapping, merged, customer_ids, batch_size)
+            checkpoint.mark_customers_done()
+        summary['customers_total'] = len(customer_ids)
+
+        pending = [chunk for chunk in chunks if chunk[0] not in checkpoint.completed]
+        summary['chunks_skipped'] = len(chunks) - len(pending)
+
+        def load(start, end):
+            return load_account_chunk(sources.get(), targets.get(), mapping, customer_ids, start, end, batch_size)
+
+        for done, ((start, _), loaded) in enumerate(run_parallel(pending, load, workers), 1):
+            checkpoint.mark_chunk_done(start)
+            summary['accounts_loaded'] += loaded
+            if progress:
+                progress('accounts', done, len(pending))
+    finally:
+        sources.close_all()
+        targets.close_all()
+
+    summary['seconds'] = round(time.perf_counter() - started, 2)
+    summary['accounts_per_s'] = round(summary['accounts_loaded'] / summary['seconds'], 1) if summary['seconds'] else None
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mapping', default=DEFAULT_MAPPING_PATH)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='account_ids per chunk')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='rows per executemany')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--checkpoint', help='progress file; re-run with it to resume')
+    add_connection_arguments(parser)
+    args = parser.parse_args()
+
+    source_connect, target_connect = connect_factories(args)
+
+    def progress(phase, done, total):
+        print(f"\r{phase}: {done}/{total} chunks", end='\n' if done == total else '', file=sys.stderr)
+
+    summary = migrate(
+        source_connect, target_connect, load_mapping(args.mapping),
+        chunk_size=args.chunk_size, batch_size=args.batch_size, workers=args.workers,
+        checkpoint_path=args.checkpoint, progress=progress
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+SQLite stand-ins for the BankingRewardsFees_Old and BankingRewardsFees_New
+MySQL databases, so the migration tools can be run and tested end to end on
+one box.
+
+Connections mimic the slice of mysql.connector the tools use: dictionary or
+tuple cursors, %s placeholders, executemany, and transactions that are
+opened implicitly by the first write and ended by commit()/rollback().
+The MySQL functions used by the checksum queries (CRC32, CONCAT, CONCAT_WS,
+BIT_XOR) are registered as SQLite functions, and MySQL upserts
+(ON DUPLICATE KEY UPDATE col = VALUES(col)) are rewritten to SQLite's.
+"""
+
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import zlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+OLD_SCHEMA = """
+    CREATE TABLE Accounts (
+        account_id INTEGER PRIMARY KEY,
+        customer_name VARCHAR(255),
+        customer_tier VARCHAR(50),
+        balance DECIMAL(15,2),
+        monthly_fees DECIMAL(10,2),
+        monthly_rewards DECIMAL(10,2),
+        legacy_flag CHAR(1),
+        created_at DATETIME,
+        updated_at DATETIME
+    );
+    CREATE INDEX idx_accounts_updated_at ON Accounts (updated_at, account_id);
+"""
+
+NEW_SCHEMA = """
+    CREATE TABLE Customers (
+        customer_id INTEGER PRIMARY KEY,
+        name VARCHAR(255),
+        tier VARCHAR(50),
+        created_at DATETIME,
+        updated_at DATETIME
+    );
+    CREATE TABLE Accounts (
+        account_id INTEGER PRIMARY KEY,
+        customer_id INT,
+        balance DECIMAL(10,2),
+        created_at DATETIME,
+        updated_at DATETIME,
+        FOREIGN KEY (customer_id) REFERENCES Customers(customer_id)
+    );
+"""
+
+# BankingRewardsFees_New/Database/Tables indexes; test_migrate checks the two match
+NEW_INDEXES = """
+    CREATE INDEX idx_customers_name ON Customers (name, customer_id, tier);
+    CREATE INDEX idx_accounts_customer ON Accounts (customer_id, account_id, balance);
+"""
+
+FIRST_NAMES = ['Alice', 'Bob', 'Carol', 'David', 'Erin', 'Frank', 'Grace', 'Heidi', 'Ivan', 'Judy']
+LAST_NAMES = ['Johnson', 'Smith', 'Davis', 'Miller', 'Garcia', 'Wilson', 'Moore', 'Taylor', 'Clark', 'Lewis']
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# MySQL hands back Decimal balances; store them as SQLite REAL
+sqlite3.register_adapter(Decimal, float)
+
+
+def _translate(query):
+    """MySQL placeholders and upserts to SQLite syntax"""
+    query = query.replace('%s', '?')
+    if 'ON DUPLICATE KEY UPDATE' in query:
+        query = query.replace('ON DUPLICATE KEY UPDATE', 'ON CONFLICT DO UPDATE SET')
+        query = re.sub(r"VALUES\((`?\w+`?)\)", r"excluded.\1", query)
+    return query
+
+
+def _text(value):
+    return value if isinstance(value, str) else str(value)
+
+
+def _concat(*values):
+    """MySQL CONCAT: NULL if any argument is NULL"""
+    if any(value is None for value in values):
+        return None
+    return ''.join(_text(value) for value in values)
+
+
+def _concat_ws(separator, *values):
+    """MySQL CONCAT_WS: NULL arguments are skipped"""
+    return separator.join(_text(value) for value in values if value is not None)
+
+
+def _crc32(value):
+    return None if value is None else zlib.crc32(_text(value).encode('utf-8'))
+
+
+class _BitXor:
+    """MySQL BIT_XOR aggregate (0 for no rows)"""
+
+    def __init__(self):
+        self.value = 0
+
+    def step(self, value):
+        if value is not None:
+            self.value ^= value
+
+    def finalize(self):
+        return self.value
+
+
+class StandinCursor:
+    """Cursor returning dicts (dictionary=True) or tuples, like mysql.connector"""
+
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+        self.rowcount = -1
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def _convert(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip([column[0] for column in self._cursor.description], row))
+
+    def execute(self, query, params=()):
+        self._cursor.execute(_translate(query), tuple(params or ()))
+        self.rowcount = self._cursor.rowcount
+
+    def executemany(self, query, seq_params):
+        self._cursor.executemany(_translate(query), seq_params)
+        self.rowcount = self._cursor.rowcount
+
+    def fetchone(self):
+        return self._convert(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._convert(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._convert(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+class StandinConnection:
+    """One SQLite connection; writers from other threads wait up to timeout seconds for the lock"""
+
+    def __init__(self, path, timeout=60.0):
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self._conn.create_function('NOW', 0, lambda: datetime.now().strftime(TIMESTAMP_FORMAT))
+        self._conn.create_function('CONCAT', -1, _concat, deterministic=True)
+        self._conn.create_function('CONCAT_WS', -1, _concat_ws, deterministic=True)
+        self._conn.create_function('CRC32', 1, _crc32, deterministic=True)
+        self._conn.create_aggregate('BIT_XOR', 1, _BitXor)
+
+    def cursor(self, dictionary=False, buffered=False, **kwargs):
+        return StandinCursor(self._conn, dictionary=dictionary)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def make_connect(path):
+    """Connection factory for the migration tools"""
+    return lambda: StandinConnection(path)
+
+
+def _new_path(prefix):
+    fd, path = tempfile.mkstemp(suffix='.db', prefix=prefix)
+    os.close(fd)
+    os.remove(path)
+    return path
+
+
+def _create(path, schema):
+    conn = sqlite3.connect(path)
+    # WAL lets chunk readers run while another thread commits
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(schema)
+    conn.commit()
+    return conn
+
+
+def create_new_database(path=None, indexes=True):
+    """
+    Empty BankingRewardsFees_New schema; returns the database path.
+    indexes=False leaves out NEW_INDEXES, for loads that build them after.
+    """
+    path = path or _new_path('banking_new_')
+    _create(path, NEW_SCHEMA + (NEW_INDEXES if indexes else '')).close()
+    return path
+
+
+def create_old_database(num_accounts, path=None, seed=42, accounts_per_customer=3, batch_size=10000):
+    """
+    BankingRewardsFees_Old schema seeded with num_accounts accounts.
+    Each customer (name, tier) is repeated on about accounts_per_customer
+    accounts, a few names recur with a different tier, and about 1% of
+    balances are NULL. Returns the database path.
+    """
+    path = path or _new_path('banking_old_')
+    rng = random.Random(seed)
+    conn = _create(path, OLD_SCHEMA)
+
+    num_customers = max(1, num_accounts // accounts_per_customer)
+    customers = []
+    for customer_id in range(1, num_customers + 1):
+        if customers and rng.random() < 0.02:
+            # Same name, other tier: a different customer in the new schema
+            name, tier = customers[rng.randrange(len(customers))]
+            tier = 'standard' if tier == 'premium' else 'premium'
+        else:
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {customer_id}"
+            tier = 'premium' if rng.random() < 0.2 else 'standard'
+        customers.append((name, tier))
+
+    start = datetime(2020, 1, 1)
+    batch = []
+    for account_id in range(1, num_accounts + 1):
+        name, tier = customers[rng.randrange(num_customers)]
+        created = start + timedelta(seconds=rng.randint(0, 10 ** 8))
+        updated = created + timedelta(seconds=rng.randint(0, 10 ** 7))
+        batch.append((
+            account_id, name, tier,
+            None if rng.random() < 0.01 else round(rng.uniform(0, 20000), 2),
+            rng.choice([0.0, 5.0, 15.0]), round(rng.uniform(0, 400), 2), rng.choice(['Y', 'N', None]),
+            created.strftime(TIMESTAMP_FORMAT), updated.strftime(TIMESTAMP_FORMAT)
+        ))
+        if len(batch) >= batch_size:
+            conn.executemany("INSERT INTO Accounts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+            batch = []
+    if batch:
+        conn.executemany("INSERT INTO Accounts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+
+    conn.commit()
+    conn.close()
+    return path
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Incremental sync from BankingRewardsFees_Old.Accounts to the
+BankingRewardsFees_New Customers and Accounts tables, so the legacy app and
+the microservices can run side by side during cutover.
+
+Each poll reads only legacy rows past a high-water mark on
+(updated_at, account_id), in keyset-paginated batches that use the
+idx_accounts_updated_at index. Each batch is upserted in one target
+transaction:
+
+- an account already in the target keeps its customer_id; when every
+  account of that customer now carries the same new name/tier (a rename
+  or tier change), the customer row is updated in place
+- otherwise customers new to the target are inserted under the next free
+  ids, and customers already there have their updated_at moved forward
+- accounts are upserted (INSERT ... ON DUPLICATE KEY UPDATE), and
+  customers left without accounts are deleted
+
+The mark is saved to a JSON state file after each commit. Upserts are
+idempotent, so a crash between commit and save only replays that batch.
+
+Only writes that change synced columns (balance, name, tier) set
+updated_at; the month-end fee and reward procedures do not, so a month-end
+run does not make the next poll re-copy the book.
+
+updated_at has one-second resolution, and a transaction can commit after
+rows with a later stamp were read. So each poll re-reads the last
+--overlap seconds below the mark. Rows without updated_at, and legacy
+deletes, are not seen: migrate.py loads the former, and verify.py reports
+both.
+
+    python sync.py --state sync_state.json --init     # after migrate.py: start from now
+    python sync.py --state sync_state.json            # one poll
+    python sync.py --state sync_state.json --follow --interval 10
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from connections import add_connection_arguments, connect_factories
+from mapping import DEFAULT_MAPPING_PATH, TIMESTAMP_AGGREGATES, load_mapping
+from migrate import _aggregate, column_list, load_customer_ids, quote, write_json_atomic
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_OVERLAP = 5.0     # seconds below the mark re-read on every poll
+DEFAULT_INTERVAL = 10.0   # seconds between polls with --follow
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _as_datetime(value):
+    """MySQL returns datetime, the SQLite stand-in returns text"""
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+class Watermark:
+    """(updated_at, account_id) of the last legacy row synced, kept in a JSON file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.updated_at = None
+        self.account_id = None
+        if path and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            self.updated_at = datetime.fromisoformat(state['updated_at'])
+            self.account_id = state['account_id']
+
+    @property
+    def key(self):
+        return None if self.updated_at is None else (self.updated_at, self.account_id)
+
+    def advance(self, updated_at, account_id):
+        key = (_as_datetime(updated_at), account_id)
+        if self.key is None or key > self.key:
+            self.updated_at, self.account_id = key
+            if self.path:
+                write_json_atomic(self.path, {
+                    'updated_at': self.updated_at.strftime(TIMESTAMP_FORMAT),
+                    'account_id': self.account_id
+                })
+
+
+class Syncer:
+    """Moves changed legacy rows into the target; one instance per sync process"""
+
+    def __init__(self, source, target, mapping, watermark, batch_size=DEFAULT_BATCH_SIZE, overlap=DEFAULT_OVERLAP):
+        self.source, self.target = source, target
+        self.mapping = mapping
+        self.watermark = watermark
+        self.batch_size = batch_size
+        self.overlap = overlap
+
+        self.columns = mapping.source_columns()
+        position = {column: i for i, column in enumerate(self.columns)}
+        self.key_positions = [position[source] for source in mapping.customer_key_sources]
+        self.timestamp_positions = [(position[source], target) for source, target in mapping.customer_timestamps]
+        self.account_positions = [position[source] for source in mapping.accounts.source_columns]
+        self.updated_at_position = position['updated_at']
+        self.account_id_position = position['account_id']
+
+        table = quote(mapping.source_table)
+        select = f"SELECT {column_list(self.columns)} FROM {table}"
+        order = "ORDER BY updated_at, account_id LIMIT %s"
+        self.first_batch_query = f"{select} WHERE updated_at IS NOT NULL {order}"
+        self.next_batch_query = f"{select} WHERE (updated_at, account_id) > (%s, %s) {order}"
+
+        timestamp_targets = [target for _, target in mapping.customer_timestamps]
+        customer_columns = ['customer_id'] + mapping.customer_key_targets + timestamp_targets
+        self.insert_customer = (f"INSERT INTO Customers ({column_list(customer_columns)}) "
+                                f"VALUES ({', '.join(['%s'] * len(customer_columns))})")
+        self.rename_customer = (f"UPDATE Customers SET "
+                                + ', '.join(f"{quote(column)} = %s" for column in mapping.customer_key_targets)
+                                + " WHERE customer_id = %s")
+        self.touch_customer = ("UPDATE Customers SET updated_at = %s "
+                               "WHERE customer_id = %s AND (updated_at IS NULL OR updated_at < %s)")
+        self.delete_customer = ("DELETE FROM Customers WHERE customer_id = %s "
+                                "AND NOT EXISTS (SELECT 1 FROM Accounts WHERE customer_id = %s)")
+        account_targets = mapping.accounts.target_columns + ['customer_id']
+        self.upsert_account = (
+            f"INSERT INTO Accounts ({column_list(account_targets)}) "
+            f"VALUES ({', '.join(['%s'] * len(account_targets))}) "
+            f"ON DUPLICATE KEY UPDATE "
+            + ', '.join(f"{quote(column)} = VALUES({quote(column)})" for column in account_targets if column != 'account_id')
+        )
+        self._load_customers()
+
+    def _load_customers(self):
+        """{customer key: customer_id} and its inverse, as committed in the target"""
+        self.customer_ids = load_customer_ids(self.target, self.mapping)
+        self.customer_keys = {customer_id: key for key, customer_id in self.customer_ids.items()}
+
+    def current_customers(self, account_ids):
+        """
+        ({account_id: customer_id}, {customer_id: accounts}) for the accounts
+        of account_ids already in the target and the customers they belong to
+        """
+        cursor = self.target.cursor()
+        try:
+            cursor.execute(f"SELECT account_id, customer_id FROM Accounts "
+                           f"WHERE account_id IN ({', '.join(['%s'] * len(account_ids))})", account_ids)
+            current = dict(cursor.fetchall())
+            if not current:
+                return current, {}
+            customer_ids = sorted(set(current.values()))
+            cursor.execute(f"SELECT customer_id, COUNT(*) FROM Accounts "
+                           f"WHERE customer_id IN ({', '.join(['%s'] * len(customer_ids))}) "
+                           f"GROUP BY customer_id", customer_ids)
+            return current, dict(cursor.fetchall())
+        finally:
+            cursor.close()
+
+    def _start_key(self):
+        """Where this poll starts reading: the mark, less the overlap window"""
+        if self.watermark.key is None:
+            return None
+        if not self.overlap:
+            return self.watermark.key
+        return (self.watermark.updated_at - timedelta(seconds=self.overlap), 0)
+
+    def fetch_batch(self, after):
+        cursor = self.source.cursor()
+        try:
+            if after is None:
+                cursor.execute(self.first_batch_query, (self.batch_size,))
+            else:
+                cursor.execute(self.next_batch_query,
+                               (_as_datetime(after[0]).strftime(TIMESTAMP_FORMAT), after[1], self.batch_size))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def apply_batch(self, rows):
+        """
+        Upsert one batch of legacy rows in a single target transaction;
+        returns the customers inserted, updated in place and deleted
+        """
+        if self.customer_ids is None:
+            self._load_customers()
+        account_ids = [row[self.account_id_position] for row in rows]
+        keys = [tuple(row[i] for i in self.key_positions) for row in rows]
+        current, account_counts = self.current_customers(account_ids)
+
+        # A customer whose accounts all move to one unused key is renamed
+        moves = {}
+        for account_id, key in zip(account_ids, keys):
+            customer_id = current.get(account_id)
+            if customer_id is not None and self.customer_keys[customer_id] != key:
+                moves.setdefault(customer_id, []).append(key)
+        renamed = {}
+        for customer_id, new_keys in moves.items():
+            key = new_keys[0]
+            if (len(new_keys) == account_counts[customer_id] and new_keys.count(key) == len(new_keys)
+                    and key not in self.customer_ids and key not in renamed.values()):
+                renamed[customer_id] = key
+
+        new_customers = {}
+        touched = {}
+        accounts = []
+        left = set()
+        next_id = max(self.customer_ids.values(), default=0) + 1
+        try:
+            for customer_id, key in renamed.items():
+                del self.customer_ids[self.customer_keys[customer_id]]
+                self.customer_ids[key] = customer_id
+                self.customer_keys[customer_id] = key
+            for row, account_id, key in zip(rows, account_ids, keys):
+                if key in new_customers:
+                    values = new_customers[key]
+                    customer_id = values['customer_id']
+                    for i, target in self.timestamp_positions:
+                        values[target] = _aggregate(TIMESTAMP_AGGREGATES[target], values[target], row[i])
+                elif key in self.customer_ids:
+                    customer_id = self.customer_ids[key]
+                    touched[customer_id] = _aggregate(max, touched.get(customer_id), row[self.updated_at_position])
+                else:
+                    customer_id = next_id
+                    next_id += 1
+                    new_customers[key] = {'customer_id': customer_id,
+                                          **{target: row[i] for i, target in self.timestamp_positions}}
+                    self.customer_ids[key] = customer_id
+                    self.customer_keys[customer_id] = key
+                if current.get(account_id, customer_id) != customer_id:
+                    left.add(current[account_id])
+                accounts.append(tuple(row[i] for i in self.account_positions) + (customer_id,))
+
+            deleted = []
+            cursor = self.target.cursor()
+            try:
+                if renamed:
+                    cursor.executemany(self.rename_customer, [
+                        (*key, customer_id) for customer_id, key in renamed.items()
+                    ])
+                if new_customers:
+                    cursor.executemany(self.insert_customer, [
+                        (values['customer_id'], *key, *(values[target] for _, target in self.timestamp_positions))
+                        for key, values in new_customers.items()
+                    ])
+                if touched:
+                    cursor.executemany(self.touch_customer, [
+                        (updated_at, customer_id, updated_at) for customer_id, updated_at in touched.items()
+                    ])
+                cursor.executemany(self.upsert_account, accounts)
+                for customer_id in sorted(left):
+                    cursor.execute(self.delete_customer, (customer_id, customer_id))
+                    if cursor.rowcount:
+                        deleted.append(customer_id)
+                self.target.commit()
+            finally:
+                cursor.close()
+        except Exception:
+            self.target.rollback()
+            # The maps may hold this batch's uncommitted changes; reload them next batch
+            self.customer_ids = self.customer_keys = None
+            raise
+        for customer_id in deleted:
+            del self.customer_ids[self.customer_keys.pop(customer_id)]
+        return {'inserted': len(new_customers), 'updated': len(renamed), 'deleted': len(deleted)}
+
+    def poll(self):
+        """Sync everything changed since the mark; returns a summary dict"""
+        started = time.perf_counter()
+        summary = {'rows': 0, 'batches': 0, 'customers_inserted': 0, 'customers_updated': 0, 'customers_deleted': 0}
+        after = self._start_key()
+        while True:
+            rows = self.fetch_batch(after)
+            if not rows:
+                break
+            for change, count in self.apply_batch(rows).items():
+                summary[f'customers_{change}'] += count
+            last = rows[-1]
+            after = (last[self.updated_at_position], last[self.account_id_position])
+            self.watermark.advance(*after)
+            summary['rows'] += len(rows)
+            summary['batches'] += 1
+            if len(rows) < self.batch_size:
+                break
+        summary['seconds'] = round(time.perf_counter() - started, 3)
+        summary['watermark'] = None if self.watermark.key is None else [
+            self.watermark.updated_at.strftime(TIMESTAMP_FORMAT), self.watermark.account_id
+        ]
+        return summary
+
+
+def init_watermark(source, mapping, watermark):
+    """Set the mark to the newest legacy row, e.g. right after a bulk migration"""
+    cursor = source.cursor()
+    try:
+        cursor.execute(
+            f"SELECT updated_at, account_id FROM {quote(mapping.source_table)} "
+            "WHERE updated_at IS NOT NULL ORDER BY updated_at DESC, account_id DESC LIMIT 1"
+        )
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    if row:
+        watermark.advance(*row)
+    return watermark
+
+
+def sync(source_connect, target_connect, mapping=None, state_path=None, batch_size=DEFAULT_BATCH_SIZE,
+         overlap=DEFAULT_OVERLAP, follow=False, interval=DEFAULT_INTERVAL, polls=None, report=None):
+    """
+    Run one poll, or with follow=True keep polling every interval seconds
+    (polls limits how many). report(summary) is called after each poll;
+    returns the last summary. A failed poll is reported, and the next poll
+    reconnects and resumes from the saved mark.
+    """
+    mapping = mapping or load_mapping()
+    watermark = Watermark(state_path)
+    source = target = syncer = None
+    summary = None
+    done = 0
+    try:
+        while True:
+            poll_started = time.monotonic()
+            try:
+                if syncer is None:
+                    source, target = source_connect(), target_connect()
+                    syncer = Syncer(source, target, mapping, watermark, batch_size, overlap)
+                summary = syncer.poll()
+            except Exception as e:
+                if not follow:
+                    raise
+                summary = {'error': str(e)}
+                for conn in (source, target):
+                    try:
+                        conn and conn.close()
+                    except Exception:
+                        pass
+                source = target = syncer = None
+            if report:
+                report(summary)
+            done += 1
+            if not follow or (polls is not None and done >= polls):
+                return summary
+            time.sleep(max(0.0, interval - (time.monotonic() - poll_started)))
+    finally:
+        for conn in (source, target):
+            if conn is not None:
+                conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mapping', default=DEFAULT_MAPPING_PATH)
+    parser.add_argument('--state', required=True, help='JSON file holding the high-water mark')
+    parser.add_argument('--init', action='store_true', help='set the mark to the newest legacy row and exit')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--overlap', type=float, default=DEFAULT_OVERLAP, help='seconds re-read below the mark')
+    parser.add_argument('--follow', action='store_true', help='keep polling')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help='seconds between polls')
+    add_connection_arguments(parser)
+    args = parser.parse_args()
+
+    source_connect, target_connect = connect_factories(args)
+    mapping = load_mapping(args.mapping)
+
+    if args.init:
+        source = source_connect()
+        try:
+            watermark = init_watermark(source, mapping, Watermark(args.state))
+        finally:
+            source.close()
+        print(json.dumps({'watermark': [str(watermark.updated_at), watermark.account_id]}))
+        return
+
+    sync(source_connect, target_connect, mapping, args.state, args.batch_size, args.overlap,
+         follow=args.follow, interval=args.interval, report=lambda summary: print(json.dumps(summary), flush=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+import unittest
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+# Add the migration directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from mapping import Mapping, load_mapping
+from migrate import migrate, plan_chunks
+from sqlite_standin import NEW_INDEXES, StandinConnection, create_new_database, create_old_database, make_connect
+
+TABLES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'BankingRewardsFees_New', 'Database', 'Tables')
+
+NUM_ACCOUNTS = 2500
+CHUNK_SIZE = 300
+
+class FailingCursor:
+    """Cursor that fails when inserting an account inside fail_range"""
+    
+    def __init__(self, cursor, fail_range):
+        self._cursor = cursor
+        self._fail_range = fail_range
+    
+    def executemany(self, query, seq_params):
+        start, end = self._fail_range
+        if 'INTO Accounts' in query and any(start <= row[0] < end for row in seq_params):
+            raise RuntimeError('simulated crash')
+        return self._cursor.executemany(query, seq_params)
+    
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+def failing_connect(path, fail_range):
+    def connect():
+        conn = StandinConnection(path)
+        cursor = conn.cursor
+        conn.cursor = lambda *args, **kwargs: FailingCursor(cursor(*args, **kwargs), fail_range)
+        return conn
+    return connect
+
+class TestMigrate(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create a legacy SQLite book shared by all tests."""
+        cls.old_path = create_old_database(NUM_ACCOUNTS)
+        cls.mapping = load_mapping()
+    
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.old_path)
+    
+    def new_target(self):
+        path = create_new_database()
+        self.addCleanup(os.remove, path)
+        return path
+    
+    def run_migration(self, target_path, **kwargs):
+        kwargs.setdefault('chunk_size', CHUNK_SIZE)
+        kwargs.setdefault('workers', 4)
+        return migrate(make_connect(self.old_path), make_connect(target_path), self.mapping, **kwargs)
+    
+    def dump(self, path):
+        conn = sqlite3.connect(path)
+        try:
+            return (
+                conn.execute("SELECT * FROM Customers ORDER BY customer_id").fetchall(),
+                conn.execute("SELECT * FROM Accounts ORDER BY account_id").fetchall()
+            )
+        finally:
+            conn.close()
+    
+    def test_plan_chunks_covers_every_account(self):
+        """Test chunk ranges are contiguous and cover min..max account_id."""
+        conn = StandinConnection(self.old_path)
+        self.addCleanup(conn.close)
+        
+        chunks = plan_chunks(conn, 'Accounts', CHUNK_SIZE)
+        
+        self.assertEqual(chunks[0][0], 1)
+        self.assertEqual(chunks[-1][1], NUM_ACCOUNTS + 1)
+        self.assertTrue(all(a[1] == b[0] for a, b in zip(chunks, chunks[1:])))
+    
+    def test_migration_end_to_end(self):
+        """Test every legacy account arrives once, under its deduplicated customer."""
+        target = self.new_target()
+        
+        summary = self.run_migration(target)
+        
+        old = sqlite3.connect(self.old_path)
+        self.addCleanup(old.close)
+        new = sqlite3.connect(target)
+        self.addCleanup(new.close)
+        
+        distinct = old.execute("SELECT COUNT(*) FROM (SELECT DISTINCT customer_name, customer_tier FROM Accounts)").fetchone()[0]
+        self.assertEqual(summary['accounts_loaded'], NUM_ACCOUNTS)
+        self.assertEqual(summary['customers_inserted'], distinct)
+        self.assertEqual(new.execute("SELECT COUNT(*) FROM Customers").fetchone()[0], distinct)
+        self.assertEqual(
+            new.execute("SELECT COUNT(*) FROM (SELECT DISTINCT name, tier FROM Customers)").fetchone()[0], distinct
+        )
+        
+        new.execute("ATTACH DATABASE ? AS old", (self.old_path,))
+        mismatches = new.execute("""
+            SELECT COUNT(*)
+            FROM old.Accounts o
+            LEFT JOIN Accounts a ON a.account_id = o.account_id
+            LEFT JOIN Customers c ON c.customer_id = a.customer_id
+            WHERE a.account_id IS NULL
+               OR c.name IS NOT o.customer_name OR c.tier IS NOT o.customer_tier
+               OR a.balance IS NOT o.balance
+               OR a.created_at IS NOT o.created_at OR a.updated_at IS NOT o.updated_at
+        """).fetchone()[0]
+        self.assertEqual(mismatches, 0)
+        
+        # Customer timestamps span all of the customer's legacy rows
+        aggregated = new.execute("""
+            SELECT COUNT(*)
+            FROM Customers c
+            JOIN (SELECT customer_name, customer_tier, MIN(created_at) AS first, MAX(updated_at) AS last
+                  FROM old.Accounts GROUP BY customer_name, customer_tier) o
+              ON o.customer_name = c.name AND o.customer_tier = c.tier
+            WHERE c.created_at = o.first AND c.updated_at = o.last
+        """).fetchone()[0]
+        self.assertEqual(aggregated, distinct)
+    
+    def test_customer_ids_do_not_depend_on_parallelism(self):
+        """Test ids are assigned in account_id order whatever the worker count."""
+        serial, parallel = self.new_target(), self.new_target()
+        
+        self.run_migration(serial, workers=1)
+        self.run_migration(parallel, workers=8, chunk_size=97)
+        
+        self.assertEqual(self.dump(serial), self.dump(parallel))
+    
+    def test_resume_after_failure(self):
+        """Test a run that crashes mid-way resumes from its checkpoint to the same result."""
+        expected, target = self.new_target(), self.new_target()
+        self.run_migration(expected)
+        fd, checkpoint = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        os.remove(checkpoint)
+        self.addCleanup(lambda: os.path.exists(checkpoint) and os.remove(checkpoint))
+        
+        with self.assertRaises(RuntimeError):
+            migrate(make_connect(self.old_path), failing_connect(target, (1500, 1600)), self.mapping,
+                    chunk_size=CHUNK_SIZE, workers=2, checkpoint_path=checkpoint)
+        
+        with open(checkpoint) as f:
+            state = json.load(f)
+        self.assertTrue(state['customers_done'])
+        self.assertNotIn(1501, state['completed_chunks'])
+        
+        summary = self.run_migration(target, workers=2, checkpoint_path=checkpoint)
+        
+        self.assertEqual(summary['customers_inserted'], 0)
+        self.assertEqual(summary['chunks_skipped'], len(state['completed_chunks']))
+        self.assertEqual(self.dump(target), self.dump(expected))
+    
+    def test_rerun_is_idempotent(self):
+        """Test that loading committed chunks again does not duplicate rows."""
+        target = self.new_target()
+        self.run_migration(target)
+        before = self.dump(target)
+        
+        summary = self.run_migration(target, chunk_size=500)
+        
+        self.assertEqual(summary['customers_inserted'], 0)
+        self.assertEqual(self.dump(target), before)
+    
+    def test_existing_customers_are_reused(self):
+        """Test that new customer ids continue after customers already in the target."""
+        target = self.new_target()
+        old = sqlite3.connect(self.old_path)
+        name, tier = old.execute("SELECT customer_name, customer_tier FROM Accounts WHERE account_id = 1").fetchone()
+        old.close()
+        new = sqlite3.connect(target)
+        new.execute("INSERT INTO Customers VALUES (500, ?, ?, NULL, NULL)", (name, tier))
+        new.commit()
+        new.close()
+        
+        self.run_migration(target)
+        
+        customers, accounts = self.dump(target)
+        self.assertEqual(accounts[0][1], 500)
+        self.assertEqual(customers[1][0], 501)
+    
+    def test_checkpoint_chunk_size_must_match(self):
+        """Test that resuming with another chunk size is refused."""
+        target = self.new_target()
+        fd, checkpoint = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, checkpoint)
+        with open(checkpoint, 'w') as f:
+            json.dump({'chunk_size': 100, 'customers_done': False, 'completed_chunks': []}, f)
+        
+        with self.assertRaises(ValueError):
+            self.run_migration(target, checkpoint_path=checkpoint)
+    
+    def test_mapping_requires_both_tables(self):
+        """Test that a mapping without Customers columns is rejected."""
+        with open(os.path.join(os.path.dirname(__file__), '..', 'data_mapping.json')) as f:
+            document = json.load(f)
+        document['tables'] = [table for table in document['tables'] if table['target_table'] != 'Customers']
+        
+        with self.assertRaises(ValueError):
+            Mapping(document)
+    
+    def test_standin_indexes_match_target_ddl(self):
+        """Test the stand-in builds the secondary indexes the MySQL target tables declare."""
+        indexes = re.findall(r"CREATE INDEX (\w+) ON (\w+) \(([^)]*)\)", NEW_INDEXES)
+        declared = []
+        for table in ('Customers', 'Accounts'):
+            with open(os.path.join(TABLES_DIR, f'{table}.sql')) as f:
+                declared += [(name, table, columns) for name, columns in re.findall(r"INDEX (\w+) \(([^)]*)\)", f.read())]
+        
+        self.assertEqual(sorted(indexes), sorted(declared))
+
+if __name__ == '__main__':
+    unittest.main()
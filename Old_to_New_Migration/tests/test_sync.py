@@ -0,0 +1,234 @@
+import unittest
+import glob
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+
+# Add the migration directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from mapping import load_mapping
+from migrate import migrate
+from sqlite_standin import create_new_database, create_old_database, make_connect
+from sync import Watermark, init_watermark, sync
+from verify import verify
+
+NUM_ACCOUNTS = 1500
+CHUNK_SIZE = 300
+LEGACY_DATABASE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'BankingRewardsFees_Old', 'Database')
+
+class TestSync(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create a legacy SQLite book that each test copies."""
+        cls.template_path = create_old_database(NUM_ACCOUNTS)
+        cls.mapping = load_mapping()
+    
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.template_path)
+    
+    def setUp(self):
+        self.old_path = self.temp_path('.db')
+        shutil.copy(self.template_path, self.old_path)
+        self.state_path = self.temp_path('.json')
+        os.remove(self.state_path)
+    
+    def temp_path(self, suffix):
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        return path
+    
+    def new_target(self):
+        path = create_new_database()
+        self.addCleanup(os.remove, path)
+        return path
+    
+    def run_sync(self, target_path, **kwargs):
+        return sync(make_connect(self.old_path), make_connect(target_path), self.mapping, self.state_path, **kwargs)
+    
+    def run_verify(self, target_path):
+        return verify(make_connect(self.old_path), make_connect(target_path), self.mapping, chunk_size=CHUNK_SIZE)
+    
+    def legacy(self, *statements):
+        conn = sqlite3.connect(self.old_path)
+        for statement in statements:
+            conn.execute(statement)
+        conn.commit()
+        conn.close()
+    
+    def dump(self, path):
+        conn = sqlite3.connect(path)
+        rows = (conn.execute("SELECT * FROM Customers ORDER BY customer_id").fetchall(),
+                conn.execute("SELECT * FROM Accounts ORDER BY account_id").fetchall())
+        conn.close()
+        return rows
+    
+    def query(self, path, statement, params=()):
+        conn = sqlite3.connect(path)
+        rows = conn.execute(statement, params).fetchall()
+        conn.close()
+        return rows
+    
+    def migrated_target(self):
+        """Target loaded by migrate.py with the mark set to the newest legacy row"""
+        target = self.new_target()
+        migrate(make_connect(self.old_path), make_connect(target), self.mapping, chunk_size=CHUNK_SIZE)
+        source = make_connect(self.old_path)()
+        init_watermark(source, self.mapping, Watermark(self.state_path))
+        source.close()
+        return target
+    
+    def customer_of(self, target, account_id):
+        return self.query(target, "SELECT c.customer_id, c.name, c.tier FROM Accounts a "
+                                  "JOIN Customers c ON c.customer_id = a.customer_id WHERE a.account_id = ?",
+                          (account_id,))[0]
+    
+    def orphaned_customers(self, target):
+        return self.query(target, "SELECT customer_id FROM Customers c WHERE NOT EXISTS "
+                                  "(SELECT 1 FROM Accounts a WHERE a.customer_id = c.customer_id)")
+    
+    def test_changes_after_migration_are_synced(self):
+        """Test that only rows changed since init are moved and the schemas match afterwards."""
+        target = self.migrated_target()
+        
+        self.legacy(
+            "UPDATE Accounts SET balance = 123.45, updated_at = '2030-01-01 00:00:00' WHERE account_id IN (5, 700)",
+            "UPDATE Accounts SET customer_tier = 'gold', updated_at = '2030-01-01 00:00:01' WHERE account_id = 42",
+            f"INSERT INTO Accounts VALUES ({NUM_ACCOUNTS + 1}, 'New Customer', 'premium', 10.00, "
+            "NULL, NULL, NULL, '2030-01-01 00:00:02', '2030-01-01 00:00:02')"
+        )
+        
+        summary = self.run_sync(target, overlap=0)
+        
+        self.assertEqual(summary['rows'], 4)
+        self.assertEqual(summary['customers_inserted'], 2)
+        self.assertEqual(summary['watermark'], ['2030-01-01 00:00:02', NUM_ACCOUNTS + 1])
+        report = self.run_verify(target)
+        self.assertTrue(report['match'], report['differences'])
+        self.assertEqual(report['target_rows'], NUM_ACCOUNTS + 1)
+    
+    def test_rename_and_tier_change_keep_the_customer(self):
+        """Test a customer renamed, or moved to another tier, on all its accounts keeps its customer_id."""
+        target = self.migrated_target()
+        customers_before = self.query(target, "SELECT COUNT(*) FROM Customers")
+        renamed_id, name, tier = self.customer_of(target, 10)
+        regraded_id, other_name, other_tier = self.customer_of(target, 20)
+        self.assertNotEqual(renamed_id, regraded_id)
+        
+        self.legacy(
+            f"UPDATE Accounts SET customer_name = 'Renamed Customer', updated_at = '2030-01-01 00:00:00' "
+            f"WHERE customer_name = '{name}' AND customer_tier = '{tier}'",
+            f"UPDATE Accounts SET customer_tier = 'gold', updated_at = '2030-01-01 00:00:01' "
+            f"WHERE customer_name = '{other_name}' AND customer_tier = '{other_tier}'"
+        )
+        summary = self.run_sync(target, overlap=0)
+        
+        self.assertEqual((summary['customers_inserted'], summary['customers_updated'], summary['customers_deleted']),
+                         (0, 2, 0))
+        self.assertEqual(self.customer_of(target, 10), (renamed_id, 'Renamed Customer', tier))
+        self.assertEqual(self.customer_of(target, 20), (regraded_id, other_name, 'gold'))
+        self.assertEqual(self.query(target, "SELECT COUNT(*) FROM Customers"), customers_before)
+        self.assertEqual(self.orphaned_customers(target), [])
+        self.assertTrue(self.run_verify(target)['match'])
+    
+    def test_account_moved_to_another_customer_leaves_no_orphan(self):
+        """Test an account moved onto an existing customer's name and tier, and one moved off a shared customer."""
+        target = self.new_target()
+        self.legacy(
+            "UPDATE Accounts SET customer_name = 'Solo', customer_tier = 'standard' WHERE account_id = 1",
+            "UPDATE Accounts SET customer_name = 'Shared', customer_tier = 'standard' WHERE account_id IN (2, 3)",
+            "UPDATE Accounts SET customer_name = 'Target', customer_tier = 'premium' WHERE account_id = 4"
+        )
+        self.run_sync(target)
+        solo_id = self.customer_of(target, 1)[0]
+        shared_id = self.customer_of(target, 2)[0]
+        target_id = self.customer_of(target, 4)[0]
+        
+        self.legacy(
+            "UPDATE Accounts SET customer_name = 'Target', customer_tier = 'premium', "
+            "updated_at = '2030-01-01 00:00:00' WHERE account_id IN (1, 3)"
+        )
+        summary = self.run_sync(target, overlap=0)
+        
+        self.assertEqual((summary['customers_inserted'], summary['customers_updated'], summary['customers_deleted']),
+                         (0, 0, 1))
+        self.assertEqual(self.customer_of(target, 1)[0], target_id)
+        self.assertEqual(self.customer_of(target, 3)[0], target_id)
+        self.assertEqual(self.customer_of(target, 2)[0], shared_id)
+        self.assertEqual(self.query(target, "SELECT COUNT(*) FROM Customers WHERE customer_id = ?", (solo_id,)), [(0,)])
+        self.assertEqual(self.orphaned_customers(target), [])
+        self.assertTrue(self.run_verify(target)['match'])
+    
+    def test_month_end_procedures_do_not_move_the_mark(self):
+        """Test fee/reward-only writes leave updated_at alone, so a month-end run is not re-synced."""
+        with open(os.path.join(LEGACY_DATABASE_DIR, 'Tables', 'accounts_sync_index.sql')) as f:
+            ddl = ' '.join(line for line in f if not line.startswith('--'))
+        self.assertNotIn('ON UPDATE', ddl.upper())
+        for path in glob.glob(os.path.join(LEGACY_DATABASE_DIR, 'Stored Procedures', '*.sql')):
+            with open(path) as f:
+                self.assertNotIn('updated_at', f.read(), path)
+        
+        target = self.migrated_target()
+        self.legacy("UPDATE Accounts SET monthly_fees = 15.00, monthly_rewards = ROUND(balance * 0.01, 2)")
+        
+        self.assertEqual(self.run_sync(target, overlap=0)['rows'], 0)
+    
+    def test_sync_from_empty_state_matches_migration(self):
+        """Test a full sync in small batches, with ties on updated_at split across batches."""
+        self.legacy("UPDATE Accounts SET updated_at = '2030-06-01 12:00:00' WHERE account_id % 10 = 0")
+        target = self.new_target()
+        
+        summary = self.run_sync(target, batch_size=7, overlap=0)
+        
+        self.assertEqual(summary['rows'], NUM_ACCOUNTS)
+        report = self.run_verify(target)
+        self.assertTrue(report['match'], report['differences'])
+    
+    def test_rerun_is_idempotent(self):
+        """Test that polling again, overlap included, leaves the target unchanged."""
+        target = self.new_target()
+        self.run_sync(target, batch_size=100)
+        before = self.dump(target)
+        
+        summary = self.run_sync(target, batch_size=100, overlap=10 ** 9)
+        
+        self.assertEqual(summary['rows'], NUM_ACCOUNTS)
+        self.assertEqual(summary['customers_inserted'], 0)
+        self.assertEqual(self.dump(target), before)
+    
+    def test_late_commit_inside_overlap_is_picked_up(self):
+        """Test a row stamped just below the mark is synced only when the overlap covers it."""
+        target = self.new_target()
+        self.legacy("UPDATE Accounts SET updated_at = '2030-01-01 00:00:10' WHERE account_id = 1")
+        self.run_sync(target)
+        # Committed after the poll, but stamped before the mark
+        self.legacy("UPDATE Accounts SET balance = 1.00, updated_at = '2030-01-01 00:00:07' WHERE account_id = 2")
+        
+        self.assertEqual(self.run_sync(target, overlap=0)['rows'], 0)
+        summary = self.run_sync(target, overlap=5)
+        
+        self.assertEqual(summary['rows'], 2)
+        self.assertEqual(summary['watermark'], ['2030-01-01 00:00:10', 1])
+        self.assertTrue(self.run_verify(target)['match'])
+    
+    def test_follow_polls_until_limit(self):
+        """Test that follow mode reports every poll and picks up changes between them."""
+        target = self.new_target()
+        summaries = []
+        
+        def report(summary):
+            summaries.append(summary)
+            if len(summaries) == 1:
+                self.legacy("UPDATE Accounts SET balance = 2.00, updated_at = '2030-01-01 00:00:00' WHERE account_id = 9")
+        
+        self.run_sync(target, overlap=0, follow=True, interval=0, polls=3, report=report)
+        
+        self.assertEqual([summary['rows'] for summary in summaries], [NUM_ACCOUNTS, 1, 0])
+
+if __name__ == '__main__':
+    unittest.main()
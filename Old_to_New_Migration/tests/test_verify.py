@@ -0,0 +1,144 @@
+import unittest
+import json
+import os
+import sqlite3
+import sys
+
+# Add the migration directory to the path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from mapping import DEFAULT_MAPPING_PATH, Mapping, load_mapping
+from migrate import migrate
+from sqlite_standin import StandinConnection, create_new_database, create_old_database, make_connect
+from verify import build_queries, range_checksum, verify
+
+NUM_ACCOUNTS = 3000
+CHUNK_SIZE = 500
+
+class TestVerify(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create a legacy SQLite book shared by all tests."""
+        cls.old_path = create_old_database(NUM_ACCOUNTS)
+        cls.mapping = load_mapping()
+    
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.old_path)
+    
+    def migrated_target(self):
+        path = create_new_database()
+        self.addCleanup(os.remove, path)
+        migrate(make_connect(self.old_path), make_connect(path), self.mapping, chunk_size=CHUNK_SIZE)
+        return path
+    
+    def run_verify(self, target_path, **kwargs):
+        kwargs.setdefault('chunk_size', CHUNK_SIZE)
+        return verify(make_connect(self.old_path), make_connect(target_path), self.mapping, **kwargs)
+    
+    def tamper(self, target_path, *statements):
+        conn = sqlite3.connect(target_path)
+        for statement in statements:
+            conn.execute(statement)
+        conn.commit()
+        conn.close()
+    
+    def test_checksums_match_after_migration(self):
+        """Test a clean migration verifies without fetching any rows."""
+        target = self.migrated_target()
+        
+        report = self.run_verify(target)
+        
+        self.assertTrue(report['match'])
+        self.assertEqual(report['source_rows'], NUM_ACCOUNTS)
+        self.assertEqual(report['target_rows'], NUM_ACCOUNTS)
+        self.assertEqual(report['chunks_differing'], 0)
+        self.assertEqual(report['rows_compared'], 0)
+        self.assertEqual(report['checksum_queries'], 2 * report['chunks'])
+    
+    def test_checksum_distinguishes_null(self):
+        """Test that a NULL column does not hash like the row without it."""
+        target = self.migrated_target()
+        _, _, target_queries = build_queries(self.mapping)
+        conn = StandinConnection(target)
+        self.addCleanup(conn.close)
+        before = range_checksum(conn, target_queries.checksum, 1, 2)
+        
+        self.tamper(target, "UPDATE Accounts SET balance = NULL WHERE account_id = 1")
+        
+        self.assertNotEqual(range_checksum(conn, target_queries.checksum, 1, 2), before)
+    
+    def test_differences_are_found_by_drilling_down(self):
+        """Test each kind of difference is reported and only differing ranges are read."""
+        target = self.migrated_target()
+        old = sqlite3.connect(self.old_path)
+        name, tier = old.execute("SELECT customer_name, customer_tier FROM Accounts WHERE account_id = 2000").fetchone()
+        customer_accounts = [row[0] for row in old.execute(
+            "SELECT account_id FROM Accounts WHERE customer_name = ? AND customer_tier = ?", (name, tier)
+        )]
+        old.close()
+        self.tamper(
+            target,
+            "UPDATE Accounts SET balance = balance + 0.01 WHERE account_id = 10",
+            "UPDATE Accounts SET updated_at = '2030-01-01 00:00:00' WHERE account_id = 1234",
+            "DELETE FROM Accounts WHERE account_id = 2500",
+            f"INSERT INTO Accounts VALUES ({NUM_ACCOUNTS + 7}, 1, 10.00, NULL, NULL)",
+            "UPDATE Customers SET tier = 'gold' WHERE customer_id = (SELECT customer_id FROM Accounts WHERE account_id = 2000)"
+        )
+        
+        report = self.run_verify(target, workers=4)
+        
+        self.assertFalse(report['match'])
+        issues = {difference['account_id']: difference for difference in report['differences']}
+        self.assertEqual(set(issues[10]['columns']), {'balance'})
+        self.assertEqual(set(issues[1234]['columns']), {'updated_at'})
+        self.assertEqual(issues[2500]['issue'], 'missing_in_target')
+        self.assertEqual(issues[NUM_ACCOUNTS + 7]['issue'], 'unexpected_in_target')
+        for account_id in customer_accounts:
+            self.assertEqual(issues[account_id]['columns']['tier'], {'source': tier, 'target': 'gold'})
+        self.assertEqual(report['differences_found'], 4 + len(customer_accounts))
+        self.assertEqual((report['source_rows'], report['target_rows']), (NUM_ACCOUNTS, NUM_ACCOUNTS))
+        # Row-level comparison stays near the differing accounts
+        self.assertLess(report['rows_compared'], NUM_ACCOUNTS / 5)
+    
+    def test_report_does_not_depend_on_parallelism(self):
+        """Test that workers and drill-down shape change only the cost, not the findings."""
+        target = self.migrated_target()
+        self.tamper(target, "UPDATE Accounts SET balance = 0 WHERE account_id IN (3, 333, 2999)")
+        
+        serial = self.run_verify(target, workers=1, fanout=2, leaf_size=1)
+        parallel = self.run_verify(target, workers=8)
+        
+        self.assertEqual(serial['differences'], parallel['differences'])
+        self.assertEqual([d['account_id'] for d in serial['differences']], [3, 333, 2999])
+    
+    def test_max_differences_caps_the_listing(self):
+        """Test that the listing is capped while every difference is still counted."""
+        target = self.migrated_target()
+        self.tamper(target, "UPDATE Accounts SET balance = -1 WHERE account_id <= 50")
+        
+        report = self.run_verify(target, max_differences=5)
+        
+        self.assertEqual(report['differences_found'], 50)
+        self.assertEqual([d['account_id'] for d in report['differences']], [1, 2, 3, 4, 5])
+
+    def test_rows_are_keyed_by_account_id_wherever_it_is_mapped(self):
+        """Test differences carry the right account_id when account_id is not the first mapped column."""
+        with open(DEFAULT_MAPPING_PATH) as f:
+            document = json.load(f)
+        accounts = next(table for table in document['tables'] if table['target_table'] == 'Accounts')
+        accounts['columns'].append(accounts['columns'].pop(0))
+        mapping = Mapping(document)
+        self.assertNotEqual(build_queries(mapping)[0][0], 'account_id')
+        target = self.migrated_target()
+        self.tamper(target, "UPDATE Accounts SET balance = 0 WHERE account_id IN (7, 1500)")
+        
+        report = verify(make_connect(self.old_path), make_connect(target), mapping, chunk_size=CHUNK_SIZE)
+        
+        self.assertEqual([d['account_id'] for d in report['differences']], [7, 1500])
+        self.assertEqual({d['issue'] for d in report['differences']}, {'mismatch'})
+        self.assertEqual(set(report['differences'][0]['columns']), {'balance'})
+
+if __name__ == '__main__':
+    unittest.main()
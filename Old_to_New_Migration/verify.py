@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Checksum verification of a migration from BankingRewardsFees_Old.Accounts
+to the BankingRewardsFees_New Accounts and Customers tables, following
+data_mapping.json.
+
+Each side of an account_id range is summarised inside the database as
+(row count, BIT_XOR and SUM of a CRC32 per row). The CRC32 covers the
+mapped account columns plus the customer key. The legacy side reads its own
+columns; the new side joins Accounts to Customers. Only the three numbers
+cross the network, so matching ranges are cheap to confirm.
+
+Ranges are checked in parallel. A range whose checksums differ is split
+into --fanout parts and those are checked again, down to --leaf-size ids.
+Only then are rows fetched and compared, so the row-level diff touches just
+the accounts that actually differ.
+
+    python verify.py --workers 8 --chunk-size 20000 --output verify.json
+    python verify.py --sqlite old.db new.db
+
+Exits with status 1 when any difference is found.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from connections import add_connection_arguments, connect_factories
+from mapping import ACCOUNTS_TABLE, CUSTOMERS_TABLE, DEFAULT_MAPPING_PATH, load_mapping
+from migrate import ConnectionPerThread, account_id_bounds, quote, run_parallel, split_range
+
+DEFAULT_CHUNK_SIZE = 10000   # account_ids per top-level range
+DEFAULT_FANOUT = 16          # sub-ranges per drill-down step
+DEFAULT_LEAF_SIZE = 64       # ranges this small are compared row by row
+DEFAULT_MAX_DIFFERENCES = 100
+
+
+def _row_digest(expressions):
+    # NULL flags keep NULL distinct from an empty string, which CONCAT_WS would skip
+    null_flags = ', '.join(f"({expression} IS NULL)" for expression in expressions)
+    return f"CRC32(CONCAT_WS('#', {', '.join(expressions)}, CONCAT({null_flags})))"
+
+
+class SideQueries:
+    """Checksum and row queries for one side of the comparison"""
+
+    def __init__(self, expressions, from_clause, id_column):
+        where = f"WHERE {id_column} >= %s AND {id_column} < %s"
+        self.checksum = (f"SELECT COUNT(*), BIT_XOR(h), SUM(h) "
+                         f"FROM (SELECT {_row_digest(expressions)} AS h {from_clause} {where}) t")
+        self.rows = f"SELECT {', '.join(expressions)} {from_clause} {where} ORDER BY {id_column}"
+
+
+def build_queries(mapping):
+    """(columns, source queries, target queries); columns name the compared values in order"""
+    compared = mapping.accounts.columns + mapping.customer_key
+    columns = [target for _, target in compared]
+    source = SideQueries(
+        [f"o.{quote(source)}" for source, _ in compared],
+        f"FROM {quote(mapping.source_table)} o",
+        'o.account_id'
+    )
+    target = SideQueries(
+        [f"a.{quote(target)}" for _, target in mapping.accounts.columns]
+        + [f"c.{quote(target)}" for _, target in mapping.customer_key],
+        f"FROM {ACCOUNTS_TABLE} a LEFT JOIN {CUSTOMERS_TABLE} c ON c.customer_id = a.customer_id",
+        'a.account_id'
+    )
+    return columns, source, target
+
+
+def range_checksum(conn, query, start, end):
+    """(rows, xor, sum) of the row digests in [start, end)"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, (start, end))
+        count, xor, total = cursor.fetchone()
+    finally:
+        cursor.close()
+    return int(count), int(xor or 0), int(total or 0)
+
+
+def fetch_rows(conn, query, start, end, key_position):
+    """{account_id: row} for the rows in [start, end); key_position is account_id's place in the row"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, (start, end))
+        return {row[key_position]: row for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def diff_rows(columns, source_rows, target_rows):
+    """Row-level differences between {account_id: row} maps of both sides"""
+    differences = []
+    for account_id in sorted(set(source_rows) | set(target_rows)):
+        source, target = source_rows.get(account_id), target_rows.get(account_id)
+        if target is None:
+            differences.append({'account_id': account_id, 'issue': 'missing_in_target'})
+        elif source is None:
+            differences.append({'account_id': account_id, 'issue': 'unexpected_in_target'})
+        else:
+            changed = [i for i in range(len(columns)) if source[i] != target[i]]
+            if changed:
+                differences.append({
+                    'account_id': account_id,
+                    'issue': 'mismatch',
+                    'columns': {columns[i]: {'source': source[i], 'target': target[i]} for i in changed}
+                })
+    return differences
+
+
+class RangeVerifier:
+    """Compares one top-level range, drilling into sub-ranges whose checksums differ"""
+
+    def __init__(self, source, target, columns, source_queries, target_queries, fanout, leaf_size):
+        self.source, self.target = source, target
+        self.columns = columns
+        self.key_position = columns.index('account_id')
+        self.source_queries, self.target_queries = source_queries, target_queries
+        self.fanout, self.leaf_size = fanout, leaf_size
+        self.checksum_queries = 0
+        self.rows_compared = 0
+
+    def checksums(self, start, end):
+        self.checksum_queries += 2
+        return (range_checksum(self.source, self.source_queries.checksum, start, end),
+                range_checksum(self.target, self.target_queries.checksum, start, end))
+
+    def drill_down(self, start, end):
+        if end - start <= self.leaf_size:
+            source_rows = fetch_rows(self.source, self.source_queries.rows, start, end, self.key_position)
+            target_rows = fetch_rows(self.target, self.target_queries.rows, start, end, self.key_position)
+            self.rows_compared += len(source_rows) + len(target_rows)
+            return diff_rows(self.columns, source_rows, target_rows)
+
+        differences = []
+        step = -(-(end - start) // self.fanout)
+        for sub_start, sub_end in split_range(start, end - 1, step):
+            source_sum, target_sum = self.checksums(sub_start, sub_end)
+            if source_sum != target_sum:
+                differences.extend(self.drill_down(sub_start, sub_end))
+        return differences
+
+    def verify(self, start, end):
+        source_sum, target_sum = self.checksums(start, end)
+        differences = self.drill_down(start, end) if source_sum != target_sum else []
+        return {
+            'source_rows': source_sum[0],
+            'target_rows': target_sum[0],
+            'differs': source_sum != target_sum,
+            'differences': differences,
+            'checksum_queries': self.checksum_queries,
+            'rows_compared': self.rows_compared
+        }
+
+
+def verify(source_connect, target_connect, mapping=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=4,
+           fanout=DEFAULT_FANOUT, leaf_size=DEFAULT_LEAF_SIZE, max_differences=DEFAULT_MAX_DIFFERENCES,
+           progress=None):
+    """
+    Compare both schemas; returns a report dict. 'differences' lists the
+    first max_differences by account_id, 'differences_found' counts all.
+    """
+    if fanout < 2 or leaf_size < 1:
+        raise ValueError('fanout must be at least 2 and leaf_size at least 1')
+    mapping = mapping or load_mapping()
+    columns, source_queries, target_queries = build_queries(mapping)
+    sources = ConnectionPerThread(source_connect)
+    targets = ConnectionPerThread(target_connect)
+    started = time.perf_counter()
+    report = {'source_rows': 0, 'target_rows': 0, 'chunks_differing': 0,
+              'checksum_queries': 0, 'rows_compared': 0}
+    differences = []
+
+    try:
+        # Cover both sides, so accounts that exist only in the target are found too
+        bounds = [account_id_bounds(sources.get(), mapping.source_table),
+                  account_id_bounds(targets.get(), ACCOUNTS_TABLE)]
+        lows = [low for low, _ in bounds if low is not None]
+        highs = [high for _, high in bounds if high is not None]
+        chunks = split_range(min(lows), max(highs), chunk_size) if lows else []
+        report['chunks'] = len(chunks)
+
+        def check(start, end):
+            return RangeVerifier(sources.get(), targets.get(), columns, source_queries, target_queries,
+                                 fanout, leaf_size).verify(start, end)
+
+        for done, (_, result) in enumerate(run_parallel(chunks, check, workers), 1):
+            for key in ('source_rows', 'target_rows', 'checksum_queries', 'rows_compared'):
+                report[key] += result[key]
+            report['chunks_differing'] += result['differs']
+            differences.extend(result['differences'])
+            if progress:
+                progress(done, len(chunks))
+    finally:
+        sources.close_all()
+        targets.close_all()
+
+    differences.sort(key=lambda difference: difference['account_id'])
+    report['differences_found'] = len(differences)
+    report['differences'] = differences[:max_differences]
+    report['match'] = not differences
+    report['seconds'] = round(time.perf_counter() - started, 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mapping', default=DEFAULT_MAPPING_PATH)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='account_ids per range')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--fanout', type=int, default=DEFAULT_FANOUT, help='sub-ranges per drill-down step')
+    parser.add_argument('--leaf-size', type=int, default=DEFAULT_LEAF_SIZE, help='range size compared row by row')
+    parser.add_argument('--max-differences', type=int, default=DEFAULT_MAX_DIFFERENCES)
+    parser.add_argument('--output', help='write the report JSON here')
+    add_connection_arguments(parser)
+    args = parser.parse_args()
+
+    source_connect, target_connect = connect_factories(args)
+
+    def progress(done, total):
+        print(f"\rverified {done}/{total} chunks", end='\n' if done == total else '', file=sys.stderr)
+
+    report = verify(
+        source_connect, target_connect, load_mapping(args.mapping),
+        chunk_size=args.chunk_size, workers=args.workers, fanout=args.fanout,
+        leaf_size=args.leaf_size, max_differences=args.max_differences, progress=progress
+    )
+    # Decimal and datetime values in mismatches print as strings
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+    sys.exit(0 if report['match'] else 1)
+
+
+if __name__ == '__main__':
+    main()